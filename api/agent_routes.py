@@ -12,7 +12,9 @@ from logger import logger
 from rag.agent_manager_core import AgentManager, AgentResult
 from rag.agent_service_integration import ServiceRegistry
 from core.reranker_provider import RerankerProvider, RerankerProviderFactory
-from database import get_db
+from database import get_db, get_async_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 
@@ -384,7 +386,7 @@ async def clear_session(
 
 @router.get("/sessions", response_model=dict)
 async def list_sessions(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all conversation sessions.
 
@@ -396,14 +398,17 @@ async def list_sessions(
         from models.orm import ConversationHistory
 
         # Get all unique session IDs with their latest message time and message count
-        sessions_data = db.query(
-            ConversationHistory.session_id,
-            ConversationHistory.created_at,
-            ConversationHistory.content
-        ).order_by(
-            ConversationHistory.session_id,
-            ConversationHistory.created_at.desc()
-        ).all()
+        result = await db.execute(
+            select(
+                ConversationHistory.session_id,
+                ConversationHistory.created_at,
+                ConversationHistory.content
+            ).order_by(
+                ConversationHistory.session_id,
+                ConversationHistory.created_at.desc()
+            )
+        )
+        sessions_data = result.all()
 
         # Group by session_id
         sessions_dict: Dict[str, dict] = {}
@@ -445,7 +450,7 @@ async def list_sessions(
 async def get_session_history(
     session_id: str,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get conversation history for a specific session.
 
@@ -462,11 +467,14 @@ async def get_session_history(
         from models.orm import ConversationHistory
 
         # Get messages for this session
-        messages = db.query(ConversationHistory).filter(
-            ConversationHistory.session_id == session_id
-        ).order_by(
-            ConversationHistory.created_at.asc()
-        ).limit(limit).all()
+        result = await db.execute(
+            select(ConversationHistory).where(
+                ConversationHistory.session_id == session_id
+            ).order_by(
+                ConversationHistory.created_at.asc()
+            ).limit(limit)
+        )
+        messages = result.scalars().all()
 
         history = []
         for msg in messages:
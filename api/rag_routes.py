@@ -4,8 +4,8 @@ from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-import json
 import asyncio
+import orjson
 import uuid
 from services.search_service import SearchService
 from services.knowledge_base_service import KnowledgeBaseService
@@ -63,6 +63,11 @@ RAG_SYSTEM_PROMPT = """你是一个专业的知识库问答助手。请根据以
 请给出你的回答："""
 
 
+def _sse_event(payload: dict) -> str:
+    """Format a payload as a server-sent event line."""
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
+
+
 async def generate_answer_stream_generator(request: RagRequest, db: Session):
     """Async generator for streaming answer."""
     session_id = request.session_id or f"rag_{request.kb_id}_{hash(request.query) % 100000}"
@@ -131,7 +136,7 @@ async def generate_answer_stream_generator(request: RagRequest, db: Session):
 
         # First yield sources
         if request.include_sources:
-            yield f"data: {json.dumps({'type': 'sources', 'data': sources})}\n\n"
+            yield _sse_event({'type': 'sources', 'data': sources})
             await asyncio.sleep(0.1)
 
         # Generate answer using LLM with streaming
@@ -154,24 +159,24 @@ async def generate_answer_stream_generator(request: RagRequest, db: Session):
             try:
                 async for chunk in llm_provider.generate_stream(prompt):
                     ai_response.append(chunk)
-                    yield f"data: {json.dumps({'type': 'content', 'data': chunk})}\n\n"
+                    yield _sse_event({'type': 'content', 'data': chunk})
             except Exception as e:
                 logger.warning(f"LLM streaming failed: {e}, falling back to context")
                 fallback = f"基于搜索结果，以下是与您问题相关的信息：\n\n{context}"
                 for i in range(0, len(fallback), 20):
                     ai_response.append(fallback[i:i+20])
-                    yield f"data: {json.dumps({'type': 'content', 'data': fallback[i:i+20]})}\n\n"
+                    yield _sse_event({'type': 'content', 'data': fallback[i:i+20]})
                     await asyncio.sleep(0.05)
         elif sources:
             has_sources = True
             fallback = f"基于搜索结果，以下是与您问题相关的信息：\n\n{context}"
             for i in range(0, len(fallback), 20):
                 ai_response.append(fallback[i:i+20])
-                yield f"data: {json.dumps({'type': 'content', 'data': fallback[i:i+20]})}\n\n"
+                yield _sse_event({'type': 'content', 'data': fallback[i:i+20]})
                 await asyncio.sleep(0.05)
         else:
             ai_response.append('抱歉，我在知识库中没有找到与您问题相关的信息。')
-            yield f"data: {json.dumps({'type': 'content', 'data': '抱歉，我在知识库中没有找到与您问题相关的信息。'})}\n\n"
+            yield _sse_event({'type': 'content', 'data': '抱歉，我在知识库中没有找到与您问题相关的信息。'})
 
         # Save AI response to conversation history
         full_response = "".join(ai_response)
@@ -191,17 +196,17 @@ async def generate_answer_stream_generator(request: RagRequest, db: Session):
                 logger.warning(f"Failed to save AI response: {e}")
                 db.rollback()
 
-        yield f"data: {json.dumps({'type': 'done'})}\n\n"
+        yield _sse_event({'type': 'done'})
 
     except NotFoundError as e:
         logger.warning(f"Knowledge base not found: {request.kb_id}")
-        yield f"data: {json.dumps({'type': 'error', 'data': e.message})}\n\n"
+        yield _sse_event({'type': 'error', 'data': e.message})
     except ValidationError as e:
         logger.warning(f"Validation error in RAG: {e.message}")
-        yield f"data: {json.dumps({'type': 'error', 'data': e.message})}\n\n"
+        yield _sse_event({'type': 'error', 'data': e.message})
     except Exception as e:
         logger.error(f"Error generating streaming answer: {str(e)}")
-        yield f"data: {json.dumps({'type': 'error', 'data': '生成回答时出错'})}\n\n"
+        yield _sse_event({'type': 'error', 'data': '生成回答时出错'})
 
 
 @router.post("/answer/stream")
@@ -11,6 +11,8 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./ragdocman.db"
+    db_pool_size: int = 20  # Pooled connections kept open (non-SQLite databases)
+    db_max_overflow: int = 10  # Extra connections allowed beyond the pool
     
     # LLM Configuration
     llm_provider: str = "siliconflow"
@@ -55,11 +57,29 @@ class Settings(BaseSettings):
     # Retrieval Configuration
     retrieval_top_k: int = 10
     reranking_top_k: int = 5
+    bm25_cache_dir: Optional[str] = None  # Directory persisting BM25 indexes per knowledge base; unset disables
+    index_cache_size: int = 32  # Built search indexes kept in memory, least recently used evicted first
+    
+    # Reranker Configuration
+    rerank_batch_size: int = 32  # Candidates per rerank request before fanning out
+    rerank_cache_path: Optional[str] = None  # SQLite file caching rerank scores; unset disables
+    rerank_cache_ttl: int = 604800  # Seconds a cached rerank score stays valid
+    rerank_cache_max_entries: int = 100000  # Cached rerank scores kept before evicting the oldest
+    reranker_onnx_path: Optional[str] = None  # ONNX model file for RERANKER_PROVIDER=onnx
+    
+    # Semantic Cache Configuration
+    semantic_cache_size: int = 0  # Cached search responses; 0 disables (single-worker deployments only)
+    semantic_cache_ttl: int = 300  # Seconds a cached response stays valid
+    semantic_cache_threshold: float = 0.95  # Minimum query cosine similarity for a hit
     
     def validate_config(self) -> None:
         """Validate critical configuration parameters."""
         if not self.database_url:
             raise ValueError("DATABASE_URL is required")
+        if self.db_pool_size <= 0:
+            raise ValueError("DB_POOL_SIZE must be greater than 0")
+        if self.db_max_overflow < 0:
+            raise ValueError("DB_MAX_OVERFLOW must be non-negative")
         if not self.vector_store_path:
             raise ValueError("VECTOR_STORE_PATH is required")
         if self.chunk_size <= 0:
@@ -70,6 +90,20 @@ class Settings(BaseSettings):
             raise ValueError("RETRIEVAL_TOP_K must be greater than 0")
         if self.reranking_top_k <= 0:
             raise ValueError("RERANKING_TOP_K must be greater than 0")
+        if self.index_cache_size <= 0:
+            raise ValueError("INDEX_CACHE_SIZE must be greater than 0")
+        if self.rerank_batch_size <= 0:
+            raise ValueError("RERANK_BATCH_SIZE must be greater than 0")
+        if self.rerank_cache_ttl <= 0:
+            raise ValueError("RERANK_CACHE_TTL must be greater than 0")
+        if self.rerank_cache_max_entries <= 0:
+            raise ValueError("RERANK_CACHE_MAX_ENTRIES must be greater than 0")
+        if self.semantic_cache_size < 0:
+            raise ValueError("SEMANTIC_CACHE_SIZE must be non-negative")
+        if self.semantic_cache_ttl <= 0:
+            raise ValueError("SEMANTIC_CACHE_TTL must be greater than 0")
+        if not 0 < self.semantic_cache_threshold <= 1:
+            raise ValueError("SEMANTIC_CACHE_THRESHOLD must be in (0, 1]")
 
 
 settings = Settings()
@@ -4,7 +4,7 @@ import logging
 from typing import Optional, Dict, Any
 from abc import ABC, abstractmethod
 import httpx
-import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -102,13 +102,13 @@ class SiliconFlowProvider(LLMProvider):
             if response.status_code != 200:
                 error_msg = f"API error: {response.status_code}"
                 try:
-                    error_data = response.json()
+                    error_data = orjson.loads(response.content)
                     error_msg = error_data.get("error", {}).get("message", error_msg)
                 except Exception:
                     pass
                 raise Exception(error_msg)
 
-            data = response.json()
+            data = orjson.loads(response.content)
             if "choices" not in data or len(data["choices"]) == 0:
                 raise Exception("No choices in response")
 
@@ -202,7 +202,7 @@ class SiliconFlowProvider(LLMProvider):
                 if response.status_code != 200:
                     error_msg = f"API error: {response.status_code}"
                     try:
-                        error_data = response.json()
+                        error_data = orjson.loads(response.content)
                         error_msg = error_data.get("error", {}).get("message", error_msg)
                     except Exception:
                         pass
@@ -214,12 +214,12 @@ class SiliconFlowProvider(LLMProvider):
                         if data == "[DONE]":
                             break
                         try:
-                            chunk = json.loads(data)
+                            chunk = orjson.loads(data)
                             delta = chunk.get("choices", [{}])[0].get("delta", {})
                             content = delta.get("content", "")
                             if content:
                                 yield content
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             continue
 
         except httpx.TimeoutException:
@@ -1,12 +1,48 @@
 """Reranker provider factory for managing different reranking models."""
 
+import asyncio
+import heapq
 import logging
-from typing import List, Tuple, Optional
+import re
+import threading
+import weakref
+from typing import Any, Dict, List, Tuple, Optional
 from abc import ABC, abstractmethod
 import httpx
+import numpy as np
+import orjson
+from config import settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    from transformers import AutoTokenizer
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    TRANSFORMERS_AVAILABLE = False
+
+# Document file extensions a bare filename query may end in; other dotted
+# tokens such as 3.14 or numpy.ndarray are still reranked
+_LITERAL_EXTENSIONS = (
+    "pdf", "docx", "doc", "md", "txt", "csv", "xlsx", "xls", "pptx", "ppt",
+    "json", "xml", "html", "htm",
+)
+
+# Fully quoted phrases and bare filenames are literal lookups that gain
+# nothing from cross-encoder reranking
+_LITERAL_RE = re.compile(
+    r'^\s*(?:"[^"]+"|\'[^\']+\'|[\w./\-]+\.(?:'
+    + "|".join(_LITERAL_EXTENSIONS)
+    + r'))\s*$',
+    re.IGNORECASE,
+)
+
 
 class RerankerProvider(ABC):
     """Abstract base class for reranker providers."""
@@ -29,12 +65,14 @@ class SiliconFlowRerankerProvider(RerankerProvider):
 
     BASE_URL = "https://api.siliconflow.cn/v1"
     DEFAULT_MODEL = "BAAI/bge-reranker-large"
+    MAX_CONCURRENT_REQUESTS = 8
 
     def __init__(
         self,
         api_key: str,
         model: str = DEFAULT_MODEL,
         timeout: int = 30,
+        batch_size: Optional[int] = None,
     ):
         """
         Initialize Silicon Flow reranker provider.
@@ -43,6 +81,9 @@ class SiliconFlowRerankerProvider(RerankerProvider):
             api_key: API key for Silicon Flow
             model: Model name to use
             timeout: Request timeout in seconds
+            batch_size: Maximum candidates per rerank request; larger lists are
+                split and sent concurrently, and candidates of failed requests
+                are left out of the results (defaults to settings.rerank_batch_size)
 
         Raises:
             ValueError: If API key is empty
@@ -53,7 +94,30 @@ class SiliconFlowRerankerProvider(RerankerProvider):
         self.api_key = api_key
         self.model = model
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.batch_size = batch_size or settings.rerank_batch_size
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            # Default headers are encoded when the client is built; passing
+            # bytes keeps construction from failing on non-ASCII keys, even
+            # ones holding lone surrogates
+            headers={
+                "Authorization": f"Bearer {api_key}".encode("utf-8", "surrogatepass"),
+                "Content-Type": "application/json",
+            },
+        )
+        # Semaphores bind to an event loop, so one is created per loop on first use
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the request semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+            self._semaphores[loop] = semaphore
+        return semaphore
 
     async def rerank(
         self, query: str, candidates: List[str], top_k: int = 5
@@ -67,11 +131,15 @@ class SiliconFlowRerankerProvider(RerankerProvider):
             top_k: Number of top results to return
 
         Returns:
-            List of (index, score) tuples sorted by score descending
+            List of (index, score) tuples sorted by score descending, where
+            index refers to the caller's candidates list. When a list above
+            batch_size is split and some of its requests fail, the candidates
+            of those requests have no entry; the failure is logged with the
+            number of candidates left unscored
 
         Raises:
             ValueError: If query or candidates are empty
-            Exception: If API call fails
+            Exception: If API call fails, or every split request fails
         """
         if not query or not query.strip():
             raise ValueError("Query cannot be empty")
@@ -79,50 +147,55 @@ class SiliconFlowRerankerProvider(RerankerProvider):
         if not candidates or len(candidates) == 0:
             raise ValueError("Candidates list cannot be empty")
 
-        # Filter out empty candidates
-        candidates = [c for c in candidates if c and c.strip()]
-        if not candidates:
+        # Filter out empty candidates, remembering their original positions
+        kept = [(i, c) for i, c in enumerate(candidates) if c and c.strip()]
+        if not kept:
             raise ValueError("All candidates are empty")
 
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-
-            # Use query + documents format (required by SiliconFlow rerank API)
-            payload = {
-                "model": self.model,
-                "query": query,
-                "documents": candidates,
-                "top_n": min(top_k, len(candidates))
-            }
+        # Literal lookups keep the original order without an API call
+        if _LITERAL_RE.match(query):
+            return [(kept[i][0], 1.0) for i in range(min(top_k, len(kept)))]
 
-            response = await self.client.post(
-                f"{self.BASE_URL}/rerank",
-                headers=headers,
-                json=payload,
-            )
-
-            if response.status_code != 200:
-                error_msg = f"API error: {response.status_code}"
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get("error", {}).get("message", error_msg)
-                    logger.error(f"Reranker API error: {error_msg}, response: {response.text}")
-                except Exception:
-                    logger.error(f"Reranker API error response: {response.text}")
-                raise Exception(error_msg)
-
-            data = response.json()
-            if "results" not in data:
-                raise Exception("No results in response")
-
-            # Results are already sorted by score, just take top_k
-            results = data["results"][:top_k]
-            return [
-                (r.get("index", 0), r.get("score", 0.0)) for r in results
+        try:
+            if len(kept) <= self.batch_size:
+                return await self._post_rerank(query, kept, top_k)
+
+            # Fan out large candidate lists so the provider scores batches in parallel
+            offsets = range(0, len(kept), self.batch_size)
+            batch_results = await asyncio.gather(*[
+                self._post_rerank(
+                    query, kept, top_k, offset, offset + self.batch_size
+                )
+                for offset in offsets
+            ], return_exceptions=True)
+
+            # Candidates of failed batches are left out of the results; the
+            # call only fails when no batch was scored
+            failed = [
+                (offset, result)
+                for offset, result in zip(offsets, batch_results)
+                if isinstance(result, Exception)
             ]
+            if len(failed) == len(batch_results):
+                raise failed[0][1]
+            if failed:
+                unscored = sum(
+                    len(kept[offset:offset + self.batch_size]) for offset, _ in failed
+                )
+                logger.warning(
+                    f"{len(failed)} of {len(batch_results)} rerank requests failed, "
+                    f"leaving {unscored} of {len(kept)} candidates unscored: {failed[0][1]}"
+                )
+            return heapq.nlargest(
+                top_k,
+                (
+                    result
+                    for results in batch_results
+                    if not isinstance(results, Exception)
+                    for result in results
+                ),
+                key=lambda r: r[1],
+            )
 
         except httpx.TimeoutException:
             logger.error("Reranker API request timeout")
@@ -131,6 +204,94 @@ class SiliconFlowRerankerProvider(RerankerProvider):
             logger.error(f"Error calling reranker API: {str(e)}")
             raise
 
+    def _build_payload(
+        self,
+        query: str,
+        candidates: List[Tuple[int, str]],
+        top_n: int,
+        start: int,
+        end: int,
+    ) -> bytes:
+        """
+        Serialize a rerank request body for ``candidates[start:end]``.
+
+        Documents are encoded one at a time straight into the body buffer, so
+        neither a payload dict nor a sliced copy of the candidates is built.
+        """
+        buf = bytearray(b'{"model":')
+        buf += orjson.dumps(self.model)
+        buf += b',"query":'
+        buf += orjson.dumps(query)
+        buf += b',"documents":['
+        for i in range(start, end):
+            if i > start:
+                buf += b","
+            buf += orjson.dumps(candidates[i][1])
+        buf += b'],"top_n":'
+        buf += str(top_n).encode()
+        buf += b"}"
+        return bytes(buf)
+
+    async def _post_rerank(
+        self,
+        query: str,
+        candidates: List[Tuple[int, str]],
+        top_k: int,
+        offset: int = 0,
+        end: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Send a single rerank request for a batch of candidates.
+
+        Args:
+            query: Query text
+            candidates: (original index, text) pairs of non-empty candidates
+            top_k: Number of top results to return
+            offset: Start of the batch in the candidate list
+            end: End of the batch in the candidate list (defaults to the end)
+
+        Returns:
+            List of (index, score) tuples using the original candidate indices
+
+        Raises:
+            Exception: If API call fails
+        """
+        end = len(candidates) if end is None else min(end, len(candidates))
+
+        # Use query + documents format (required by SiliconFlow rerank API)
+        content = self._build_payload(
+            query, candidates, min(top_k, end - offset), offset, end
+        )
+
+        async with self._get_semaphore():
+            response = await self.client.post(
+                f"{self.BASE_URL}/rerank",
+                content=content,
+            )
+
+        if response.status_code != 200:
+            error_msg = f"API error: {response.status_code}"
+            try:
+                error_data = orjson.loads(response.content)
+                error_msg = error_data.get("error", {}).get("message", error_msg)
+                logger.error(f"Reranker API error: {error_msg}, response: {response.text}")
+            except Exception:
+                logger.error(f"Reranker API error response: {response.text}")
+            raise Exception(error_msg)
+
+        data = orjson.loads(response.content)
+        if "results" not in data:
+            raise Exception("No results in response")
+
+        # Select top_k by score in O(N log k) instead of trusting response order
+        results = heapq.nlargest(
+            top_k, data["results"], key=lambda r: r.get("score", 0.0)
+        )
+        return [
+            (candidates[r.get("index", 0) + offset][0], r.get("score", 0.0))
+            for r in results
+        ]
+
     async def validate_connection(self) -> bool:
         """
         Validate connection to reranker service.
@@ -155,11 +316,185 @@ class SiliconFlowRerankerProvider(RerankerProvider):
         await self.client.aclose()
 
 
+class ONNXRerankerProvider(RerankerProvider):
+    """Local cross-encoder reranker running an ONNX export on ONNX Runtime."""
+
+    DEFAULT_MODEL = "BAAI/bge-reranker-large"
+    REQUIRES_API_KEY = False
+    DEFAULT_EXECUTION_PROVIDERS = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+
+    # Inference sessions are expensive to create and safe to share across
+    # threads, so one is kept per (model path, execution providers)
+    _sessions: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+    _sessions_lock = threading.Lock()
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = DEFAULT_MODEL,
+        model_path: Optional[str] = None,
+        batch_size: int = 32,
+        max_length: int = 512,
+        execution_providers: Optional[List[str]] = None,
+        session: Any = None,
+        tokenizer: Any = None,
+    ):
+        """
+        Initialize ONNX reranker provider.
+
+        Args:
+            api_key: Unused; accepted for factory compatibility
+            model: Hugging Face model name the tokenizer is loaded from
+            model_path: Path to the exported ONNX model (defaults to
+                settings.reranker_onnx_path)
+            batch_size: Query-document pairs per inference call
+            max_length: Maximum tokens per pair; longer pairs are truncated
+            execution_providers: ONNX Runtime execution providers in priority
+                order; unavailable ones are skipped (defaults to CUDA, then CPU)
+            session: Pre-built inference session to use instead of loading one
+            tokenizer: Pre-built tokenizer to use instead of loading one
+
+        Raises:
+            ValueError: If no model path is configured
+            RuntimeError: If onnxruntime or transformers is not installed
+        """
+        self.model = model
+        self.model_path = model_path or settings.reranker_onnx_path
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+        if session is None:
+            if not self.model_path:
+                raise ValueError("ONNX model path is required")
+            session = self._get_session(
+                self.model_path,
+                execution_providers or self.DEFAULT_EXECUTION_PROVIDERS,
+            )
+        if tokenizer is None:
+            if not TRANSFORMERS_AVAILABLE:
+                raise RuntimeError("transformers is not installed")
+            tokenizer = AutoTokenizer.from_pretrained(model)
+
+        self.session = session
+        self.tokenizer = tokenizer
+        self._input_names = {i.name for i in session.get_inputs()}
+
+    @classmethod
+    def _get_session(cls, model_path: str, execution_providers: List[str]) -> Any:
+        """Get the shared inference session for a model, creating it once."""
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError("onnxruntime is not installed")
+
+        available = set(ort.get_available_providers())
+        providers = tuple(p for p in execution_providers if p in available)
+        key = (model_path, providers)
+        with cls._sessions_lock:
+            if key not in cls._sessions:
+                cls._sessions[key] = ort.InferenceSession(
+                    model_path, providers=list(providers) or None
+                )
+                logger.info(f"ONNX reranker session loaded: {model_path} {providers}")
+            return cls._sessions[key]
+
+    async def rerank(
+        self, query: str, candidates: List[str], top_k: int = 5
+    ) -> List[Tuple[int, float]]:
+        """
+        Rerank candidates based on query.
+
+        Args:
+            query: Query text
+            candidates: List of candidate texts to rerank
+            top_k: Number of top results to return
+
+        Returns:
+            List of (index, score) tuples sorted by score descending, where
+            index refers to the caller's candidates list
+
+        Raises:
+            ValueError: If query or candidates are empty
+            Exception: If inference fails
+        """
+        if not query or not query.strip():
+            raise ValueError("Query cannot be empty")
+
+        if not candidates or len(candidates) == 0:
+            raise ValueError("Candidates list cannot be empty")
+
+        kept = [(i, c) for i, c in enumerate(candidates) if c and c.strip()]
+        if not kept:
+            raise ValueError("All candidates are empty")
+
+        try:
+            # Inference is blocking, so it runs off the event loop
+            scores = await asyncio.to_thread(
+                self._score, query, [text for _, text in kept]
+            )
+        except Exception as e:
+            logger.error(f"Error running ONNX reranker: {str(e)}")
+            raise
+
+        return heapq.nlargest(
+            top_k,
+            ((i, float(score)) for (i, _), score in zip(kept, scores)),
+            key=lambda r: r[1],
+        )
+
+    def _score(self, query: str, texts: List[str]) -> np.ndarray:
+        """
+        Score (query, text) pairs with the cross-encoder.
+
+        Pairs are sorted by length before batching so each padded batch holds
+        texts of similar size, and scores are returned in input order.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        scores = np.empty(len(texts), dtype=np.float32)
+
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            encoded = self.tokenizer(
+                [query] * len(batch),
+                [texts[i] for i in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            feed = {
+                name: np.asarray(value, dtype=np.int64)
+                for name, value in encoded.items()
+                if name in self._input_names
+            }
+            logits = np.asarray(self.session.run(None, feed)[0], dtype=np.float32)
+            # One relevance logit per pair, mapped to (0, 1) like hosted APIs
+            scores[batch] = 1.0 / (1.0 + np.exp(-logits.reshape(len(batch), -1)[:, 0]))
+
+        return scores
+
+    async def validate_connection(self) -> bool:
+        """
+        Validate that the model can score a pair.
+
+        Returns:
+            True if inference succeeds, False otherwise
+        """
+        try:
+            results = await self.rerank("test", ["test candidate"], top_k=1)
+            return bool(results)
+        except Exception as e:
+            logger.error(f"Error validating ONNX reranker: {str(e)}")
+            return False
+
+    async def close(self):
+        """Nothing to close; inference sessions are shared by the process."""
+
+
 class RerankerProviderFactory:
     """Factory for creating and managing reranker providers."""
 
     PROVIDERS = {
         "siliconflow": SiliconFlowRerankerProvider,
+        "onnx": ONNXRerankerProvider,
     }
 
     @staticmethod
@@ -189,10 +524,14 @@ class RerankerProviderFactory:
                 f"Supported types: {list(RerankerProviderFactory.PROVIDERS.keys())}"
             )
 
-        if not api_key or not api_key.strip():
+        provider_class = RerankerProviderFactory.PROVIDERS[provider_type]
+
+        # Local providers run without an API key
+        if getattr(provider_class, "REQUIRES_API_KEY", True) and (
+            not api_key or not api_key.strip()
+        ):
             raise ValueError("API key cannot be empty")
 
-        provider_class = RerankerProviderFactory.PROVIDERS[provider_type]
         return provider_class(api_key, **kwargs)
 
     @staticmethod
@@ -1,5 +1,12 @@
 """Database configuration and connection management."""
+from typing import AsyncIterator, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import StaticPool
 from config import settings
@@ -8,6 +15,12 @@ from logger import logger
 # Create base class for ORM models
 Base = declarative_base()
 
+# Async drivers for the sync URLs accepted in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
 # Create database engine
 if settings.database_url.startswith("sqlite"):
     # SQLite configuration with StaticPool for testing
@@ -21,6 +34,9 @@ else:
     # Other database configurations
     engine = create_engine(
         settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_pre_ping=True,
         echo=settings.debug
     )
 
@@ -31,6 +47,54 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async engine and session factory, created on first use so the async
+# driver is only required by code paths that actually use it
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL to the matching async driver URL.
+
+    Args:
+        url: Database URL, e.g. sqlite:///./ragdocman.db
+
+    Returns:
+        URL using an async driver; URLs that already name a driver are
+        returned unchanged
+    """
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the shared async engine, creating it on first use."""
+    global _async_engine, _async_session_factory
+
+    if _async_engine is None:
+        url = to_async_url(settings.database_url)
+        if url.startswith("sqlite"):
+            _async_engine = create_async_engine(
+                url,
+                poolclass=StaticPool,
+                echo=settings.debug
+            )
+        else:
+            _async_engine = create_async_engine(
+                url,
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_pre_ping=True,
+                echo=settings.debug
+            )
+        _async_session_factory = async_sessionmaker(
+            _async_engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+
+    return _async_engine
+
 
 def get_db():
     """Dependency for getting database session."""
@@ -41,6 +105,13 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for getting an async database session."""
+    get_async_engine()
+    async with _async_session_factory() as session:
+        yield session
+
+
 def init_db() -> None:
     """Initialize database tables."""
     try:
@@ -58,3 +129,20 @@ def close_db() -> None:
         logger.info("Database connection closed")
     except Exception as e:
         logger.error(f"Failed to close database connection: {str(e)}")
+
+
+async def close_async_db() -> None:
+    """Close the async engine's connection pool if it was created."""
+    global _async_engine, _async_session_factory
+
+    if _async_engine is None:
+        return
+
+    try:
+        await _async_engine.dispose()
+        logger.info("Async database connection closed")
+    except Exception as e:
+        logger.error(f"Failed to close async database connection: {str(e)}")
+    finally:
+        _async_engine = None
+        _async_session_factory = None
@@ -18,6 +18,7 @@ def check_imports():
         ("pydantic", "Pydantic"),
         ("chromadb", "ChromaDB"),
         ("numpy", "NumPy"),
+        ("orjson", "orjson"),
         ("pandas", "Pandas"),
     ]
     
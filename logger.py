@@ -1,6 +1,7 @@
 """Logging configuration."""
 import logging
 import logging.handlers
+import re
 import sys
 from pathlib import Path
 from config import settings
@@ -47,15 +48,17 @@ def setup_logging() -> logging.Logger:
 
 logger = setup_logging()
 
+# One pattern per sensitive key, compiled once and applied in this order
+_SENSITIVE_PATTERNS = tuple(
+    re.compile(rf"({key}['\"]?\s*[:=]\s*['\"]?)([^'\"\s]+)", re.IGNORECASE)
+    for key in ("api_key", "password", "token", "secret")
+)
+
 
 def mask_sensitive_info(message: str) -> str:
     """Mask sensitive information in log messages."""
-    sensitive_keys = ["api_key", "password", "token", "secret"]
-    
-    for key in sensitive_keys:
+    for pattern in _SENSITIVE_PATTERNS:
         # Simple masking: replace values after = with ***
-        import re
-        pattern = rf"({key}['\"]?\s*[:=]\s*['\"]?)([^'\"\s]+)"
-        message = re.sub(pattern, r"\1***", message, flags=re.IGNORECASE)
-    
+        message = pattern.sub(r"\1***", message)
+
     return message
@@ -5,12 +5,13 @@ import os
 # Add the current directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import orjson
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from config import settings
-from database import init_db, close_db
+from database import init_db, close_db, close_async_db
 from logger import logger
 from middleware import ErrorHandlingMiddleware, RequestLoggingMiddleware
 from api.knowledge_base_routes import router as kb_router
@@ -21,6 +22,23 @@ from api.agent_routes import router as agent_router
 from api.rag_routes import router as rag_router
 
 
+APP_DESCRIPTION = """
+## RagDocMan - 智能知识库管理与 RAG 增强系统
+
+一个基于高级 RAG（检索增强生成）技术的agent知识库管理系统。让你能达到一句话管理知识库的效果
+
+### 核心功能
+
+- **Agents管理**: 创建、更新、删除多个独立的知识库
+- **文档处理**: 支持 PDF、Word、Markdown 等多种格式的文档上传和自动处理
+- **混合检索**: 结合 BM25 关键词检索和向量相似度检索
+- **结果重排序**: 使用 Cross-Encoder 模型对检索结果进行精准排序
+- **查询改写**: 通过 HyDE 方法和查询扩展优化用户查询
+- **意图识别**: 自动识别用户操作意图并提取相关实体
+```
+        """
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan."""
@@ -34,6 +52,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down application")
     close_db()
+    await close_async_db()
     logger.info("Application shutdown complete")
 
 
@@ -51,21 +70,8 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         version=settings.app_version,
-        description="""
-## RagDocMan - 智能知识库管理与 RAG 增强系统
-
-一个基于高级 RAG（检索增强生成）技术的agent知识库管理系统。让你能达到一句话管理知识库的效果
-
-### 核心功能
-
-- **Agents管理**: 创建、更新、删除多个独立的知识库
-- **文档处理**: 支持 PDF、Word、Markdown 等多种格式的文档上传和自动处理
-- **混合检索**: 结合 BM25 关键词检索和向量相似度检索
-- **结果重排序**: 使用 Cross-Encoder 模型对检索结果进行精准排序
-- **查询改写**: 通过 HyDE 方法和查询扩展优化用户查询
-- **意图识别**: 自动识别用户操作意图并提取相关实体
-```
-        """,
+        description=APP_DESCRIPTION,
+        default_response_class=ORJSONResponse,
         debug=settings.debug,
         lifespan=lifespan,
         docs_url="/docs",
@@ -94,39 +100,37 @@ def create_app() -> FastAPI:
     app.include_router(agent_router)
     app.include_router(rag_router)
     
+    # Static endpoint bodies are serialized once per app, not per request
+    health_body = orjson.dumps({
+        "success": True,
+        "data": {
+            "status": "healthy",
+            "app_name": settings.app_name,
+            "version": settings.app_version
+        },
+        "message": None
+    })
+    root_body = orjson.dumps({
+        "success": True,
+        "data": {
+            "message": f"Welcome to {settings.app_name}",
+            "version": settings.app_version,
+            "docs": "/docs"
+        },
+        "message": None
+    })
+    
     # Health check endpoint
     @app.get("/health")
     async def health_check():
         """Health check endpoint."""
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "data": {
-                    "status": "healthy",
-                    "app_name": settings.app_name,
-                    "version": settings.app_version
-                },
-                "message": None
-            }
-        )
+        return Response(content=health_body, media_type="application/json")
     
     # Root endpoint
     @app.get("/")
     async def root():
         """Root endpoint."""
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "data": {
-                    "message": f"Welcome to {settings.app_name}",
-                    "version": settings.app_version,
-                    "docs": "/docs"
-                },
-                "message": None
-            }
-        )
+        return Response(content=root_body, media_type="application/json")
     
     logger.info("FastAPI application created successfully")
     return app
@@ -139,8 +143,11 @@ app = create_app()
 if __name__ == "__main__":
     import uvicorn
     
+    # Serve the app built above; importing "main:app" here would load this
+    # file a second time as "main" and build the app twice. Reload needs an
+    # import string, so it keeps the old path.
     uvicorn.run(
-        "main:app",
+        "main:app" if settings.debug else app,
         host=settings.host,
         port=settings.port,
         reload=settings.debug
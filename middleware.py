@@ -1,11 +1,11 @@
 """Middleware for error handling and request/response processing."""
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from exceptions import RagDocManException
 from logger import logger, mask_sensitive_info
-import traceback
 import time
+import uuid
 
 
 class ErrorHandlingMiddleware(BaseHTTPMiddleware):
@@ -13,13 +13,13 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
     
     async def dispatch(self, request: Request, call_next):
         """Process request and handle exceptions."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         try:
             response = await call_next(request)
             
             # Log request
-            process_time = time.time() - start_time
+            process_time = (time.perf_counter_ns() - start_ns) / 1_000_000_000
             logger.info(
                 f"{request.method} {request.url.path} - "
                 f"Status: {response.status_code} - "
@@ -34,7 +34,7 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                 f"Application error: {e.error_code} - {e.message}"
             )
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=e.status_code,
                 content={
                     "success": False,
@@ -49,14 +49,11 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             
         except Exception as e:
             # Handle unexpected exceptions
-            error_id = f"{int(time.time() * 1000)}"
+            error_id = uuid.uuid4().hex
             
-            logger.error(
-                f"Unexpected error (ID: {error_id}): {str(e)}\n"
-                f"{traceback.format_exc()}"
-            )
+            logger.exception("Unexpected error (ID: %s): %s", error_id, e)
             
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
                     "success": False,
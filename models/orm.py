@@ -1,8 +1,8 @@
 """ORM models for RagDocMan database."""
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, JSON, Index
-from sqlalchemy.orm import relationship, Mapped, mapped_column
+from sqlalchemy import BigInteger, Column, String, Integer, DateTime, ForeignKey, Text, JSON, Index, event, func, update
+from sqlalchemy.orm import relationship, Mapped, mapped_column, Session
 from database import Base
 
 
@@ -14,8 +14,12 @@ class KnowledgeBase(Base):
     id: Mapped[str] = mapped_column(String, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, unique=True, nullable=False, index=True)
     description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now(), onupdate=datetime.utcnow, nullable=False)
+    # Denormalized document stats, kept in step by the Document insert and
+    # delete hooks below so responses need no aggregate query
+    document_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    total_size: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
     
     # Relationships
     documents: Mapped[List["Document"]] = relationship("Document", back_populates="knowledge_base", cascade="all, delete-orphan")
@@ -34,7 +38,7 @@ class Document(Base):
     file_size: Mapped[int] = mapped_column(Integer, nullable=False)
     file_type: Mapped[str] = mapped_column(String, nullable=False)
     chunk_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
     
     # Relationships
     knowledge_base: Mapped["KnowledgeBase"] = relationship("KnowledgeBase", back_populates="documents")
@@ -48,14 +52,64 @@ class Chunk(Base):
     
     id: Mapped[str] = mapped_column(String, primary_key=True, index=True)
     doc_id: Mapped[str] = mapped_column(String, ForeignKey("documents.id"), nullable=False, index=True)
-    kb_id: Mapped[str] = mapped_column(String, ForeignKey("knowledge_bases.id"), nullable=False, index=True)
+    kb_id: Mapped[str] = mapped_column(String, ForeignKey("knowledge_bases.id"), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
     
     # Relationships
     document: Mapped["Document"] = relationship("Document", back_populates="chunks")
     knowledge_base: Mapped["KnowledgeBase"] = relationship("KnowledgeBase", back_populates="chunks")
+    
+    # Covers kb_id lookups (leading column) and per-document ordering by chunk_index
+    __table_args__ = (
+        Index('ix_chunks_kb_doc_idx', 'kb_id', 'doc_id', 'chunk_index'),
+    )
+    
+    @classmethod
+    def bulk_insert(cls, session: Session, rows: List[dict]) -> None:
+        """Insert many chunks with a single executemany INSERT.
+        
+        Rows are plain dicts of column values executed as a Core table
+        insert, bypassing the unit of work and ORM event dispatch, so no
+        Chunk objects or relationship cascades are created. created_at is
+        filled by its column default and should be left out of the rows.
+        The caller owns the transaction and must commit.
+        
+        Args:
+            session: Database session
+            rows: Column values for each chunk (id, doc_id, kb_id, content, chunk_index)
+        """
+        if rows:
+            session.execute(cls.__table__.insert(), rows)
+
+
+def _adjust_kb_stats(connection, document: Document, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) a document from its KB's counters.
+    
+    Runs as one atomic UPDATE in the flush's transaction. updated_at is
+    pinned so derived stats do not count as an edit of the knowledge base.
+    """
+    kb_table = KnowledgeBase.__table__
+    connection.execute(
+        update(kb_table)
+        .where(kb_table.c.id == document.kb_id)
+        .values(
+            document_count=kb_table.c.document_count + sign,
+            total_size=kb_table.c.total_size + sign * document.file_size,
+            updated_at=kb_table.c.updated_at,
+        )
+    )
+
+
+@event.listens_for(Document, "after_insert")
+def _document_inserted(mapper, connection, document: Document) -> None:
+    _adjust_kb_stats(connection, document, 1)
+
+
+@event.listens_for(Document, "after_delete")
+def _document_deleted(mapper, connection, document: Document) -> None:
+    _adjust_kb_stats(connection, document, -1)
 
 
 class ConversationHistory(Base):
@@ -3,8 +3,10 @@
 用于给Agent构建结构化输入输出
 """
 from datetime import datetime
-from typing import List, Optional, Any, Dict
-from pydantic import BaseModel, Field
+from typing import List, Optional, Any, Dict, Generic, TypeVar
+from pydantic import BaseModel, ConfigDict, Field
+
+T = TypeVar("T")
 
 
 # Knowledge Base Schemas
@@ -30,8 +32,7 @@ class KnowledgeBaseResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Document Schemas
@@ -45,8 +46,7 @@ class DocumentResponse(BaseModel):
     chunk_count: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Chunk Schemas
@@ -59,8 +59,7 @@ class ChunkResponse(BaseModel):
     chunk_index: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Retrieval Schemas
@@ -111,17 +110,17 @@ class PaginationMeta(BaseModel):
     pages: int
 
 
-class PaginatedResponse(BaseModel):
-    """Generic paginated response schema."""
-    items: List[Any]
+class PaginatedResponse(BaseModel, Generic[T]):
+    """Generic paginated response schema, e.g. PaginatedResponse[DocumentResponse]."""
+    items: List[T]
     meta: PaginationMeta
 
 
 # API Response Schemas
-class APIResponse(BaseModel):
-    """Standard API response schema."""
+class APIResponse(BaseModel, Generic[T]):
+    """Standard API response schema, e.g. APIResponse[KnowledgeBaseResponse]."""
     success: bool
-    data: Optional[Any] = None
+    data: Optional[T] = None
     error: Optional[Dict[str, str]] = None
     message: Optional[str] = None
     meta: Optional[Dict[str, Any]] = None
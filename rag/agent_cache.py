@@ -1,7 +1,9 @@
 """Cache management for Agent optimization."""
 
+import asyncio
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
 from datetime import datetime, timedelta
 
 
@@ -99,3 +101,68 @@ class SearchResultCache:
         """Get cached search results."""
         key = f"search_{kb_id}_{hash(query)}"
         return await self.cache_manager.get(key)
+
+
+class AsyncTTLCache:
+    """LRU cache with TTL for coroutine results, loading each key once."""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # (value, expiry_time)
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+    
+    def _lookup(self, key: Hashable) -> tuple:
+        """Return (True, value) for a live entry, else (False, None)."""
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        value, expiry = entry
+        if time.monotonic() > expiry:
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        found, value = self._lookup(key)
+        return value if found else default
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value for key, evicting the least recently used entry."""
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for key, awaiting loader() on a miss.
+        
+        Concurrent misses for the same key share one loader call. Exceptions
+        from loader propagate and are not cached.
+        """
+        found, value = self._lookup(key)
+        if found:
+            return value
+        
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            try:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                
+                value = await loader()
+                self.set(key, value)
+                return value
+            finally:
+                # Waiters already hold this lock; later callers hit the cache
+                if self._locks.get(key) is lock:
+                    del self._locks[key]
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
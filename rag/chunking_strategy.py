@@ -1,6 +1,7 @@
 """Text chunking strategies for document processing."""
 
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import logging
 import re
 
@@ -9,6 +10,19 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _get_splitter(
+    chunk_size: int, chunk_overlap: int, separators: Tuple[str, ...]
+) -> RecursiveCharacterTextSplitter:
+    """Get a shared LangChain splitter for one chunking configuration."""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=list(separators),
+        length_function=len,
+    )
+
+
 class ChunkingStrategy:
     """Implements text chunking strategies for document processing."""
 
@@ -17,6 +31,7 @@ class ChunkingStrategy:
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
         separators: List[str] = None,
+        balanced: bool = False,
     ):
         """
         Initialize chunking strategy.
@@ -25,10 +40,32 @@ class ChunkingStrategy:
             chunk_size: Size of each chunk in characters
             chunk_overlap: Number of overlapping characters between chunks
             separators: List of separators to use for splitting
+            balanced: Spread text evenly over the chunks instead of filling
+                each to chunk_size and leaving a short last chunk; only
+                applies to separator lists ending in ""
         """
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size "
+                f"({chunk_size}), should be smaller."
+            )
+
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.balanced = balanced
         self.separators = separators or ["\n\n", "\n", " ", ""]
+        # Separators the offset scan searches for, in priority order
+        self._scan_separators = tuple(sep for sep in self.separators if sep)
+
+        # The offset scan needs "" as the final separator so any window can be
+        # cut; other separator lists fall back to LangChain's splitter, which
+        # is built once and only read afterwards, so it is shared between
+        # strategies with the same configuration
+        self._splitter = None
+        if self.separators[-1] != "":
+            self._splitter = _get_splitter(
+                chunk_size, chunk_overlap, tuple(self.separators)
+            )
 
     def chunk_text(self, text: str) -> List[str]:
         """
@@ -40,6 +77,24 @@ class ChunkingStrategy:
         Returns:
             List of text chunks
 
+        Raises:
+            ValueError: If text is empty or invalid
+        """
+        return [text[start:end] for start, end in self.chunk_offsets(text)]
+
+    def chunk_offsets(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Split text into chunks, returning offsets instead of substrings.
+
+        Callers that only need some chunks, or one at a time, can slice
+        ``text[start:end]`` on demand instead of holding a copy of every chunk.
+
+        Args:
+            text: Text to chunk
+
+        Returns:
+            List of (start, end) offsets into text
+
         Raises:
             ValueError: If text is empty or invalid
         """
@@ -47,28 +102,197 @@ class ChunkingStrategy:
             raise ValueError("Text cannot be empty")
 
         try:
-            splitter = RecursiveCharacterTextSplitter(
-                chunk_size=self.chunk_size,
-                chunk_overlap=self.chunk_overlap,
-                separators=self.separators,
-                length_function=len,
-            )
-
-            chunks = splitter.split_text(text)
+            if self._splitter is not None:
+                offsets = self._locate_chunks(text, self._splitter.split_text(text))
+            else:
+                offsets = self._split_offsets(text)
 
-            if not chunks:
+            if not offsets:
                 raise ValueError("No chunks could be created from text")
 
             logger.info(
-                f"Text chunked into {len(chunks)} chunks "
+                f"Text chunked into {len(offsets)} chunks "
                 f"(size: {self.chunk_size}, overlap: {self.chunk_overlap})"
             )
 
-            return chunks
+            return offsets
         except Exception as e:
             logger.error(f"Error chunking text: {str(e)}")
             raise
 
+    def chunk_iter(self, segments: Iterable[str]) -> Iterator[str]:
+        """
+        Chunk text supplied as consecutive segments, yielding chunks as soon
+        as they are final.
+
+        Produces the same chunks as ``chunk_text("".join(segments))`` while
+        only buffering text that has not been chunked yet, so a document can
+        be chunked page by page without ever holding its full text.
+
+        Args:
+            segments: Consecutive pieces of the text, e.g. pages
+
+        Yields:
+            Text chunks
+
+        Raises:
+            ValueError: If the text is empty or invalid
+        """
+        if self._splitter is not None or self.balanced:
+            # LangChain's splitter and balancing both need the whole text
+            yield from self.chunk_text("".join(segments))
+            return
+
+        # Scan once enough text is buffered to amortize joining the pending
+        # segments; each scan leaves behind the text the next chunk starts in
+        scan_size = 16 * self.chunk_size
+        pending: List[str] = []
+        pending_len = 0
+        count = 0
+
+        for segment in segments:
+            pending.append(segment)
+            pending_len += len(segment)
+            if pending_len < scan_size:
+                continue
+            buffer = "".join(pending)
+            spans, pos = self._scan_offsets(buffer, final=False)
+            for start, end in spans:
+                yield buffer[start:end]
+            count += len(spans)
+            pending = [buffer[pos:]]
+            pending_len = len(pending[0])
+
+        buffer = "".join(pending)
+        spans, _ = self._scan_offsets(buffer, final=True)
+        for start, end in spans:
+            yield buffer[start:end]
+        count += len(spans)
+
+        if not count:
+            raise ValueError("Text cannot be empty")
+
+        logger.info(
+            f"Text chunked into {count} chunks "
+            f"(size: {self.chunk_size}, overlap: {self.chunk_overlap})"
+        )
+
+    @staticmethod
+    def _locate_chunks(text: str, chunks: List[str]) -> List[Tuple[int, int]]:
+        """Map in-order (possibly overlapping) chunk strings back to offsets."""
+        offsets = []
+        cursor = 0
+        for chunk in chunks:
+            start = text.find(chunk, cursor)
+            offsets.append((start, start + len(chunk)))
+            cursor = start + 1
+        return offsets
+
+    def _split_offsets(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Compute (start, end) offsets of each chunk in a single forward scan.
+
+        Each window of chunk_size characters is cut at the last occurrence of
+        the highest-priority separator it contains, or hard-cut when none is
+        present. The next window starts inside the overlap region just after
+        the same separator, so overlaps never begin mid-word. Leading and
+        trailing whitespace is trimmed from every chunk.
+
+        With balanced set, the text is rescanned with the narrowest window
+        that still yields no more chunks than the first scan, found by
+        binary search starting from an even split of the text. Cuts land on
+        separators, so an even split alone usually needs one more chunk.
+
+        Args:
+            text: Text to chunk
+
+        Returns:
+            List of (start, end) offsets into text
+        """
+        spans = self._scan_offsets(text, final=True)[0]
+
+        count = len(spans)
+        if self.balanced and count > 1:
+            # Each of the count windows covers an even share of the text
+            # plus the overlap it shares with its neighbour
+            even = -(-(len(text) + (count - 1) * self.chunk_overlap) // count)
+            low, high = max(even, self.chunk_overlap + 1), self.chunk_size
+            while low < high:
+                size = (low + high) // 2
+                candidate = self._scan_offsets(text, final=True, chunk_size=size)[0]
+                if len(candidate) <= count:
+                    spans, high = candidate, size
+                else:
+                    low = size + 1
+
+        return spans
+
+    def _scan_offsets(
+        self, text: str, final: bool, chunk_size: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Run the _split_offsets scan over text.
+
+        Each step only looks at the chunk_size characters after its start,
+        so when more text may follow (final=False) the scan stops before the
+        first window that reaches the end of text, and its chunks match a
+        scan over the complete text.
+
+        Args:
+            text: Text to chunk
+            final: Whether text runs to the end of the document
+            chunk_size: Window size to scan with (default: self.chunk_size)
+
+        Returns:
+            Tuple of (chunk offsets, offset the next scan must resume from)
+        """
+        size = chunk_size or self.chunk_size
+        overlap = self.chunk_overlap
+        separators = self._scan_separators
+        n = len(text)
+        spans = []
+        pos = 0
+
+        while pos < n:
+            if n - pos <= size:
+                if not final:
+                    break
+                cut, sep = n, ""
+            else:
+                target = pos + size
+                cut, sep = target, ""
+                for candidate in separators:
+                    j = text.rfind(candidate, pos + 1, target)
+                    if j != -1:
+                        cut, sep = j, candidate
+                        break
+
+            # Trim surrounding whitespace without copying the window
+            start, end = pos, cut
+            while start < end and text[start].isspace():
+                start += 1
+            while end > start and text[end - 1].isspace():
+                end -= 1
+            if end > start:
+                spans.append((start, end))
+
+            if cut >= n:
+                break
+
+            # Rewind into the overlap region, aligned to the cut separator
+            next_pos = cut
+            if overlap:
+                floor = max(pos + 1, cut - overlap)
+                if sep:
+                    j = text.find(sep, floor, cut)
+                    if j != -1:
+                        next_pos = j + len(sep)
+                else:
+                    next_pos = floor
+            pos = next_pos
+
+        return spans, pos
+
     def chunk_text_with_metadata(
         self, text: str, metadata: dict = None
     ) -> List[dict]:
@@ -80,17 +304,20 @@ class ChunkingStrategy:
             metadata: Optional metadata to attach to each chunk
 
         Returns:
-            List of dicts with 'content' and 'metadata' keys
+            List of dicts with 'content', 'start', 'end' and 'metadata' keys,
+            where start/end are the chunk's offsets in text
         """
-        chunks = self.chunk_text(text)
+        offsets = self.chunk_offsets(text)
         metadata = metadata or {}
 
         return [
             {
-                "content": chunk,
+                "content": text[start:end],
+                "start": start,
+                "end": end,
                 "metadata": {**metadata, "chunk_index": i},
             }
-            for i, chunk in enumerate(chunks)
+            for i, (start, end) in enumerate(offsets)
         ]
 
 
@@ -124,11 +351,9 @@ class MarkdownHeadingChunkingStrategy:
         self.max_chunk_size = max_chunk_size
         self.chunk_overlap = chunk_overlap
         self.min_section_size = min_section_size
-        self._recursive_splitter = RecursiveCharacterTextSplitter(
+        self._recursive_splitter = ChunkingStrategy(
             chunk_size=max_chunk_size,
             chunk_overlap=chunk_overlap,
-            separators=["\n\n", "\n", " ", ""],
-            length_function=len,
         )
 
     def _parse_headings(self, text: str) -> List[Dict[str, Any]]:
@@ -152,7 +377,9 @@ class MarkdownHeadingChunkingStrategy:
         }
 
         for line in lines:
-            match = self.HEADING_PATTERN.match(line)
+            # Only lines starting with "#" can be headings, so the rest skip
+            # the regex engine
+            match = self.HEADING_PATTERN.match(line) if line.startswith('#') else None
             if match:
                 # 保存之前的章节
                 if current_section['heading'] is not None:
@@ -225,7 +452,7 @@ class MarkdownHeadingChunkingStrategy:
         Returns:
             切分后的 chunk 列表
         """
-        chunks = self._recursive_splitter.split_text(content)
+        chunks = self._recursive_splitter.chunk_text(content)
         result = []
 
         for i, chunk in enumerate(chunks):
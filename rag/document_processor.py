@@ -1,14 +1,18 @@
 """Document processing module for handling various file formats."""
 
+import asyncio
+import codecs
+import io
+import itertools
+import mmap
 import os
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import logging
 
 from pypdf import PdfReader
 from docx import Document as DocxDocument
-import markdown
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +22,8 @@ class DocumentProcessor:
 
     SUPPORTED_FORMATS = {".pdf", ".docx", ".md", ".txt"}
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+    MMAP_THRESHOLD = 1024 * 1024  # Memory-map text files larger than 1MB
+    TEXT_BLOCK_SIZE = 256 * 1024  # Bytes per block when streaming text files
 
     @staticmethod
     def validate_file(file_path: str) -> bool:
@@ -77,27 +83,138 @@ class DocumentProcessor:
             logger.error(f"Error processing document {file_path}: {str(e)}")
             raise
 
+    @staticmethod
+    async def process_document_async(file_path: str) -> str:
+        """
+        Process a document without blocking the event loop.
+
+        PDF and Word parsing run in a worker thread, like the streaming
+        upload path; Markdown and plain text files are read inline.
+
+        Args:
+            file_path: Path to the document file
+
+        Returns:
+            Extracted text content
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If file format is not supported or file is too large
+            Exception: If document processing fails
+        """
+        DocumentProcessor.validate_file(file_path)
+
+        suffix = Path(file_path).suffix.lower()
+
+        try:
+            if suffix == ".pdf":
+                return await asyncio.to_thread(DocumentProcessor._parse_pdf, file_path)
+            elif suffix == ".docx":
+                return await asyncio.to_thread(DocumentProcessor._parse_docx, file_path)
+            elif suffix == ".md":
+                return DocumentProcessor._parse_markdown(file_path)
+            elif suffix == ".txt":
+                return DocumentProcessor._parse_text(file_path)
+            else:
+                raise ValueError(f"Unsupported file format: {suffix}")
+        except Exception as e:
+            logger.error(f"Error processing document {file_path}: {str(e)}")
+            raise
+
+    @staticmethod
+    def iter_text(file_path: str) -> Iterator[str]:
+        """
+        Extract document text as consecutive segments.
+
+        Joining the segments gives the text process_document returns, but
+        PDFs are read page by page, Word documents paragraph by paragraph and
+        text files in TEXT_BLOCK_SIZE blocks, so the full text never has to
+        be held at once. Emptiness is left to the consumer to detect.
+
+        Args:
+            file_path: Path to the document file
+
+        Yields:
+            Pieces of the extracted text
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If file format is not supported or file is too large
+        """
+        DocumentProcessor.validate_file(file_path)
+
+        suffix = Path(file_path).suffix.lower()
+        if suffix == ".pdf":
+            reader = PdfReader(file_path)
+            started = False
+            for page_num, page in enumerate(reader.pages):
+                try:
+                    text = page.extract_text()
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to extract text from page {page_num} in {file_path}: {e}"
+                    )
+                    continue
+                if text:
+                    yield "\n" + text if started else text
+                    started = True
+        elif suffix == ".docx":
+            doc = DocxDocument(file_path)
+            started = False
+            paragraphs = (para.text for para in doc.paragraphs)
+            rows = (
+                " | ".join(
+                    text
+                    for text in (cell.text for cell in row.cells)
+                    if text.strip()
+                )
+                for table in doc.tables
+                for row in table.rows
+            )
+            for text in itertools.chain(paragraphs, rows):
+                if text.strip():
+                    yield "\n" + text if started else text
+                    started = True
+        else:
+            # Newlines are translated like text-mode open, including a \r\n
+            # pair split across two blocks
+            decoder = io.IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder("utf-8")(errors="replace"),
+                translate=True,
+            )
+            with open(file_path, "rb") as f:
+                while True:
+                    block = f.read(DocumentProcessor.TEXT_BLOCK_SIZE)
+                    if not block:
+                        break
+                    yield decoder.decode(block)
+            yield decoder.decode(b"", final=True)
+
     @staticmethod
     def _parse_pdf(file_path: str) -> str:
         """Parse PDF file and extract text."""
         try:
             reader = PdfReader(file_path)
-            text_parts = []
+            # Write pages straight into one buffer so each page's text can be
+            # released as soon as it is copied
+            buf = io.StringIO()
 
             for page_num, page in enumerate(reader.pages):
                 try:
                     text = page.extract_text()
                     if text:
-                        text_parts.append(text)
+                        if buf.tell():
+                            buf.write("\n")
+                        buf.write(text)
                 except Exception as e:
                     logger.warning(
                         f"Failed to extract text from page {page_num} in {file_path}: {e}"
                     )
 
-            if not text_parts:
+            if not buf.tell():
                 raise ValueError("No text could be extracted from PDF")
 
-            return "\n".join(text_parts)
+            return buf.getvalue()
         except Exception as e:
             logger.error(f"Error parsing PDF {file_path}: {str(e)}")
             raise
@@ -107,41 +224,64 @@ class DocumentProcessor:
         """Parse Word document and extract text."""
         try:
             doc = DocxDocument(file_path)
-            text_parts = []
+            buf = io.StringIO()
 
             for para in doc.paragraphs:
-                if para.text.strip():
-                    text_parts.append(para.text)
+                text = para.text
+                if text.strip():
+                    if buf.tell():
+                        buf.write("\n")
+                    buf.write(text)
 
             for table in doc.tables:
                 for row in table.rows:
                     row_text = []
                     for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text)
+                        text = cell.text
+                        if text.strip():
+                            row_text.append(text)
                     if row_text:
-                        text_parts.append(" | ".join(row_text))
+                        if buf.tell():
+                            buf.write("\n")
+                        buf.write(" | ".join(row_text))
 
-            if not text_parts:
+            if not buf.tell():
                 raise ValueError("No text could be extracted from Word document")
 
-            return "\n".join(text_parts)
+            return buf.getvalue()
         except Exception as e:
             logger.error(f"Error parsing Word document {file_path}: {str(e)}")
             raise
 
+    @staticmethod
+    def _read_text(file_path: str) -> str:
+        """
+        Read a UTF-8 text file, replacing undecodable bytes.
+
+        Files above MMAP_THRESHOLD are memory-mapped and decoded straight from
+        the mapping, so no intermediate bytes copy of the file is held.
+        \r\n and \r line endings are translated to \n, as text-mode open does.
+        """
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= DocumentProcessor.MMAP_THRESHOLD:
+                content = f.read().decode("utf-8", errors="replace")
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    content = str(mm, "utf-8", "replace")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return content
+
     @staticmethod
     def _parse_markdown(file_path: str) -> str:
         """Parse Markdown file and extract text."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            # Raw markdown is returned as-is
+            content = DocumentProcessor._read_text(file_path)
 
             if not content.strip():
                 raise ValueError("Markdown file is empty")
 
-            # Convert markdown to HTML then extract text
-            # For now, just return the raw markdown content
             return content
         except Exception as e:
             logger.error(f"Error parsing Markdown file {file_path}: {str(e)}")
@@ -151,8 +291,7 @@ class DocumentProcessor:
     def _parse_text(file_path: str) -> str:
         """Parse plain text file."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = DocumentProcessor._read_text(file_path)
 
             if not content.strip():
                 raise ValueError("Text file is empty")
@@ -1,12 +1,38 @@
 """Intent recognition module for understanding user commands."""
 
 import logging
-import json
-from typing import Dict, Any, Optional
+import re
+import orjson
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
+from rag.agent_cache import AsyncTTLCache
+
 logger = logging.getLogger(__name__)
 
+# Unambiguous keywords per intent as (English words, Chinese terms); a match
+# for "query" alone lets recognize_intent skip the LLM round trip
+_INTENT_KEYWORDS = {
+    "delete": (r"delete|remove|drop", r"删除|移除"),
+    "update": (r"update|modify|edit|rename", r"更新|修改|编辑|重命名"),
+    "manage": (r"create|add|upload|list|show", r"创建|新建|添加|上传|列出"),
+    "query": (
+        r"search|find|what|how|why|who|when|where",
+        r"搜索|查找|查询|什么|如何|怎么|为什么|\?|？",
+    ),
+}
+_INTENT_RE = re.compile(
+    "|".join(
+        rf"(?P<{intent}>\b(?:{words})\b|{terms})"
+        for intent, (words, terms) in _INTENT_KEYWORDS.items()
+    ),
+    re.IGNORECASE,
+)
+
+# LLM classifications keyed by (provider key, normalized input), shared
+# across recognizers since they are created per request
+_INTENT_CACHE = AsyncTTLCache(maxsize=1024, ttl=300)
+
 
 @dataclass
 class IntentResult:
@@ -32,6 +58,11 @@ class IntentRecognizer:
         """
         self.llm_provider = llm_provider
 
+    def _provider_key(self) -> tuple:
+        """Identify the LLM that cached classifications belong to."""
+        provider = self.llm_provider
+        return (type(provider).__name__, getattr(provider, "model", None))
+
     async def recognize_intent(self, user_input: str) -> IntentResult:
         """
         Recognize user intent from input.
@@ -57,12 +88,23 @@ class IntentRecognizer:
                 raw_response="",
             )
 
-        try:
-            # Classify intent
-            intent = await self._classify_intent(user_input)
+        # Plain questions need no entities beyond the query text itself
+        if self._match_intent_keywords(user_input) == "query":
+            entities = {"query_text": user_input.strip()}
+            return IntentResult(
+                intent="query",
+                entities=entities,
+                confidence=self._calculate_confidence("query", entities),
+                raw_response="",
+            )
 
-            # Extract entities
-            entities = await self._extract_entities(user_input, intent)
+        try:
+            # Classify intent and extract entities in a single LLM call,
+            # reusing the answer for repeated inputs
+            intent, entities = await _INTENT_CACHE.get_or_load(
+                (self._provider_key(), user_input.strip().lower()),
+                lambda: self._classify_and_extract(user_input),
+            )
 
             # Fill slots
             filled_entities = await self._fill_slots(intent, entities)
@@ -91,85 +133,84 @@ class IntentRecognizer:
                 raw_response=str(e),
             )
 
-    async def _classify_intent(self, user_input: str) -> str:
+    @staticmethod
+    def _match_intent_keywords(user_input: str) -> Optional[str]:
         """
-        Classify user intent.
+        Match user input against the intent keyword table.
 
         Args:
             user_input: User input string
 
         Returns:
-            Intent type (query, manage, update, delete)
-
-        Raises:
-            Exception: If LLM call fails
+            The intent if keywords of exactly one category matched, else None
         """
-        prompt = f"""Classify the following user input into one of these categories:
-- query: User wants to search or retrieve information
-- manage: User wants to manage knowledge bases or documents
-- update: User wants to update or modify existing data
-- delete: User wants to delete data
-
-User input: {user_input}
-
-Respond with only the category name (query, manage, update, or delete)."""
+        matched = {m.lastgroup for m in _INTENT_RE.finditer(user_input)}
+        return matched.pop() if len(matched) == 1 else None
 
-        try:
-            response = await self.llm_provider.generate(prompt, max_tokens=10)
-            intent = response.strip().lower()
-
-            # Validate intent
-            if intent not in self.VALID_INTENTS:
-                logger.warning(f"Invalid intent: {intent}, defaulting to query")
-                return "query"
-
-            return intent
-        except Exception as e:
-            logger.error(f"Error classifying intent: {str(e)}")
-            raise
-
-    async def _extract_entities(
-        self, user_input: str, intent: str
-    ) -> Dict[str, Any]:
+    async def _classify_and_extract(
+        self, user_input: str
+    ) -> Tuple[str, Dict[str, Any]]:
         """
-        Extract entities from user input.
+        Classify user intent and extract entities with one LLM call.
 
         Args:
             user_input: User input string
-            intent: Classified intent
 
         Returns:
-            Dictionary of extracted entities
+            Tuple of (intent, entities)
 
         Raises:
             Exception: If LLM call fails
         """
-        prompt = f"""Extract relevant entities from the following user input.
-Return the result as a JSON object with the following possible keys:
-- kb_name: Name of knowledge base
-- doc_name: Name of document
-- doc_type: Type of document (pdf, docx, md, txt)
-- time_range: Time range mentioned
-- query_text: The actual query or search text
-- other_info: Any other relevant information
+        prompt = f"""Analyze the following user input.
+Return a JSON object with exactly these keys:
+- intent: one of query, manage, update, delete
+  - query: User wants to search or retrieve information
+  - manage: User wants to manage knowledge bases or documents
+  - update: User wants to update or modify existing data
+  - delete: User wants to delete data
+- entities: a JSON object with the following possible keys:
+  - kb_name: Name of knowledge base
+  - doc_name: Name of document
+  - doc_type: Type of document (pdf, docx, md, txt)
+  - time_range: Time range mentioned
+  - query_text: The actual query or search text
+  - other_info: Any other relevant information
 
 User input: {user_input}
-Intent: {intent}
 
 Return only valid JSON, no additional text."""
 
         try:
             response = await self.llm_provider.generate(prompt, max_tokens=300)
-            if response and response.strip():
-                try:
-                    entities = json.loads(response.strip())
-                    return entities
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse entities JSON: {response}")
-                    return {}
-            return {}
+            response = (response or "").strip()
+
+            try:
+                parsed = orjson.loads(response)
+            except orjson.JSONDecodeError:
+                # Models sometimes answer with just the category name
+                intent = response.lower()
+                if intent in self.VALID_INTENTS:
+                    return intent, {}
+                logger.warning(f"Failed to parse intent JSON: {response}")
+                return "query", {}
+
+            if not isinstance(parsed, dict):
+                logger.warning(f"Unexpected intent response: {response}")
+                return "query", {}
+
+            intent = str(parsed.get("intent", "")).strip().lower()
+            if intent not in self.VALID_INTENTS:
+                logger.warning(f"Invalid intent: {intent}, defaulting to query")
+                intent = "query"
+
+            entities = parsed.get("entities")
+            if not isinstance(entities, dict):
+                entities = {}
+
+            return intent, entities
         except Exception as e:
-            logger.error(f"Error extracting entities: {str(e)}")
+            logger.error(f"Error classifying intent: {str(e)}")
             raise
 
     async def _fill_slots(
@@ -1,12 +1,19 @@
 """Query rewriting module for improving search quality."""
 
+import asyncio
 import logging
 import json
 from typing import List, Optional
 from dataclasses import dataclass
 
+from rag.agent_cache import AsyncTTLCache
+
 logger = logging.getLogger(__name__)
 
+# HyDE and expansion LLM results keyed by (provider key, method, normalized
+# query), shared across rewriters since services are created per request
+_REWRITE_CACHE = AsyncTTLCache(maxsize=1024, ttl=300)
+
 
 @dataclass
 class QueryRewriteResult:
@@ -29,6 +36,11 @@ class QueryRewriter:
         """
         self.llm_provider = llm_provider
 
+    def _provider_key(self) -> tuple:
+        """Identify the LLM that cached rewrites belong to."""
+        provider = self.llm_provider
+        return (type(provider).__name__, getattr(provider, "model", None))
+
     async def rewrite_query(self, query: str) -> QueryRewriteResult:
         """
         Rewrite query using HyDE and expansion.
@@ -48,20 +60,37 @@ class QueryRewriter:
         rewritten_queries = [query]  # Include original query
         hypothetical_docs = []
 
-        # Try HyDE rewriting if LLM provider is available
+        # Run HyDE rewriting and query expansion concurrently if LLM provider
+        # is available; each falls back independently on failure. Successful
+        # results are cached per method, so a failed call is retried next time
         if self.llm_provider:
-            try:
-                hyde_docs = await self._hyde_rewrite(query)
+            key = (self._provider_key(), query.strip().lower())
+            hyde_docs, expanded_queries = await asyncio.gather(
+                _REWRITE_CACHE.get_or_load(
+                    ("hyde", *key), lambda: self._hyde_rewrite(query)
+                ),
+                _REWRITE_CACHE.get_or_load(
+                    ("expansion", *key), lambda: self._query_expansion(query)
+                ),
+                return_exceptions=True,
+            )
+
+            if isinstance(hyde_docs, Exception):
+                logger.warning(f"HyDE rewriting failed: {str(hyde_docs)}")
+            else:
                 hypothetical_docs.extend(hyde_docs)
-            except Exception as e:
-                logger.warning(f"HyDE rewriting failed: {str(e)}")
 
-            # Try query expansion
-            try:
-                expanded_queries = await self._query_expansion(query)
+            if isinstance(expanded_queries, Exception):
+                logger.warning(f"Query expansion failed: {str(expanded_queries)}")
+            else:
                 rewritten_queries.extend(expanded_queries)
-            except Exception as e:
-                logger.warning(f"Query expansion failed: {str(e)}")
+
+        # Expansions often just restate the query; drop duplicates (ignoring
+        # case and surrounding whitespace) so each query is searched once
+        unique = {}
+        for q in rewritten_queries:
+            unique.setdefault(q.strip().lower(), q)
+        rewritten_queries = list(unique.values())
 
         logger.info(
             f"Query rewritten: {len(rewritten_queries)} queries, "
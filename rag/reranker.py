@@ -1,8 +1,12 @@
 """Reranking module for improving retrieval results."""
 
+import asyncio
+import heapq
 import logging
-from typing import List, Optional
+from dataclasses import replace
+from typing import Dict, List, Optional
 from rag.retriever import RetrievalResult
+from rag.scorer_cache import ScorerCache
 
 logger = logging.getLogger(__name__)
 
@@ -10,14 +14,26 @@ logger = logging.getLogger(__name__)
 class Reranker:
     """Reranker for improving retrieval results using cross-encoder models."""
 
-    def __init__(self, reranker_provider=None):
+    # Score of candidates the provider did not score: the bottom of the
+    # [0, 1] relevance scale the providers return
+    UNSCORED_SCORE = 0.0
+
+    def __init__(self, reranker_provider=None, cache: Optional[ScorerCache] = None):
         """
         Initialize reranker.
 
         Args:
             reranker_provider: Provider for reranking
+            cache: Optional score cache; cached (query, chunk) pairs are not
+                sent to the provider again
         """
         self.reranker_provider = reranker_provider
+        self.cache = cache
+
+    def _model_key(self) -> str:
+        """Identify the provider and model that cached scores belong to."""
+        provider = self.reranker_provider
+        return f"{type(provider).__name__}:{getattr(provider, 'model', '')}"
 
     async def rerank(
         self, query: str, candidates: List[RetrievalResult], top_k: int = 5
@@ -25,13 +41,19 @@ class Reranker:
         """
         Rerank candidates based on query.
 
+        The returned results are copies carrying the reranker's scores; the
+        candidates passed in are not modified. Candidates the provider
+        returned no score for (for example because one of its batched
+        requests failed) are ranked after every scored candidate, in their
+        original order, with UNSCORED_SCORE.
+
         Args:
             query: Query string
             candidates: List of RetrievalResult objects to rerank
             top_k: Number of top results to return
 
         Returns:
-            Reranked list of RetrievalResult objects
+            Reranked list of RetrievalResult copies with their reranked scores
 
         Raises:
             ValueError: If query or candidates are empty
@@ -48,28 +70,66 @@ class Reranker:
             return candidates[:top_k]
 
         try:
-            # Extract candidate texts
-            candidate_texts = [c.content for c in candidates]
-
-            # Get reranking scores
-            ranked_indices = await self.reranker_provider.rerank(
-                query, candidate_texts, top_k=top_k
-            )
-
-            # Create reranked results
-            reranked_results = []
-            for idx, score in ranked_indices:
-                if idx < len(candidates):
-                    result = candidates[idx]
-                    # Create new result with reranked score
-                    reranked_result = RetrievalResult(
-                        chunk_id=result.chunk_id,
-                        doc_id=result.doc_id,
-                        content=result.content,
-                        score=score,
-                        doc_name=result.doc_name,
+            # Scores by candidate index; cache hits skip the provider
+            scores: Dict[int, float] = {}
+            pending = list(range(len(candidates)))
+            model = self._model_key()
+            if self.cache is not None:
+                # SQLite lookups block, so they run off the event loop
+                cached = await asyncio.to_thread(
+                    self.cache.get_many,
+                    model,
+                    query,
+                    [c.chunk_id for c in candidates],
+                )
+                pending = []
+                for i, candidate in enumerate(candidates):
+                    if candidate.chunk_id in cached:
+                        scores[i] = cached[candidate.chunk_id]
+                    else:
+                        pending.append(i)
+
+            new_scores: Dict[int, float] = {}
+            if pending:
+                # Every miss needs a score to be cacheable, not just the top_k
+                ranked_indices = await self.reranker_provider.rerank(
+                    query,
+                    [candidates[i].content for i in pending],
+                    top_k=len(pending) if self.cache is not None else top_k,
+                )
+                new_scores = {
+                    pending[idx]: score
+                    for idx, score in ranked_indices
+                    if idx < len(pending)
+                }
+
+            scores.update(new_scores)
+            if self.cache is not None and new_scores:
+                await asyncio.to_thread(
+                    self.cache.put_many,
+                    model,
+                    query,
+                    {candidates[i].chunk_id: s for i, s in new_scores.items()},
+                )
+
+            # Create reranked results as copies, so callers holding the
+            # candidates keep their retrieval scores
+            reranked_results = [
+                replace(candidates[idx], score=score)
+                for idx, score in heapq.nlargest(
+                    top_k, scores.items(), key=lambda item: item[1]
+                )
+            ]
+
+            # Unscored candidates keep their retrieval order after the scored
+            # ones, scored on the reranker's scale rather than the fused one
+            for idx, candidate in enumerate(candidates):
+                if len(reranked_results) >= top_k:
+                    break
+                if idx not in scores:
+                    reranked_results.append(
+                        replace(candidate, score=self.UNSCORED_SCORE)
                     )
-                    reranked_results.append(reranked_result)
 
             logger.info(f"Reranked {len(reranked_results)} results")
             return reranked_results
@@ -1,12 +1,33 @@
 """Retrieval components for hybrid search."""
 
+import asyncio
+import copy
+import hashlib
 import logging
+import os
+import re
+import tempfile
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
-from rank_bm25 import BM25Okapi
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+try:
+    # Provided by chroma-hnswlib, which chromadb installs
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
 
 @dataclass
 class RetrievalResult:
@@ -19,21 +40,149 @@ class RetrievalResult:
     doc_name: str = ""
 
 
+# Word tokens for BM25; punctuation is dropped so "python," matches "python"
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top_k highest scores, highest first."""
+    if top_k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if top_k < len(scores):
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class BM25Index:
+    """
+    Okapi BM25 index over term-major posting lists.
+
+    Scores match rank_bm25's BM25Okapi, but each (term, document) weight is
+    computed once at build time, so scoring a query is one vectorized
+    scatter-add per query term instead of a Python loop over documents.
+    """
+
+    def __init__(
+        self,
+        corpus: List[List[str]],
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ):
+        """
+        Build the index.
+
+        Args:
+            corpus: Tokenized documents
+            k1: Term frequency saturation
+            b: Document length normalization
+            epsilon: Floor for negative IDFs, as a fraction of the mean IDF
+        """
+        self.corpus_size = len(corpus)
+        self.vocab: Dict[str, int] = {}
+
+        term_ids, doc_ids, tfs = [], [], []
+        doc_lens = np.empty(self.corpus_size, dtype=np.float64)
+        for doc_id, tokens in enumerate(corpus):
+            doc_lens[doc_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                term_ids.append(self.vocab.setdefault(term, len(self.vocab)))
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind="stable")
+        term_ids = term_ids[order]
+        doc_freq = np.bincount(term_ids, minlength=len(self.vocab))
+
+        # CSR layout: postings of term t are doc_ids/weights[indptr[t]:indptr[t + 1]]
+        self.indptr = np.concatenate(([0], np.cumsum(doc_freq)))
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int64)[order]
+
+        idf = np.log(self.corpus_size - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+        idf[idf < 0] = epsilon * idf.mean()
+
+        # Length normalization depends only on the document, so it is
+        # computed once per document and gathered for each posting
+        k1_norm = k1 * (1 - b + b * doc_lens / doc_lens.mean())
+        tf = np.asarray(tfs, dtype=np.float64)[order]
+        self.weights = idf[term_ids] * tf * (k1 + 1) / (tf + k1_norm[self.doc_ids])
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Export the index as plain arrays, for saving with np.savez."""
+        # Tokens are \w+ runs, so a newline never occurs inside one
+        terms = "\n".join(self.vocab).encode("utf-8")
+        return {
+            "corpus_size": np.asarray(self.corpus_size),
+            "vocab": np.frombuffer(terms, dtype=np.uint8),
+            "indptr": self.indptr,
+            "doc_ids": self.doc_ids,
+            "weights": self.weights,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "BM25Index":
+        """Rebuild an index exported by to_arrays without rescoring the corpus."""
+        index = cls.__new__(cls)
+        index.corpus_size = int(arrays["corpus_size"])
+        terms = arrays["vocab"].tobytes().decode("utf-8").split("\n")
+        index.vocab = {term: i for i, term in enumerate(terms)}
+        index.indptr = arrays["indptr"]
+        index.doc_ids = arrays["doc_ids"]
+        index.weights = arrays["weights"]
+        return index
+
+    def get_scores(self, query: List[str]) -> np.ndarray:
+        """
+        Score every document against a tokenized query.
+
+        Args:
+            query: Query tokens
+
+        Returns:
+            Array of BM25 scores, one per document
+        """
+        scores = np.zeros(self.corpus_size)
+        for token in query:
+            term_id = self.vocab.get(token)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            # Documents are unique within a posting list, so += is safe
+            scores[self.doc_ids[start:end]] += self.weights[start:end]
+        return scores
+
+
 class BM25Retriever:
     """BM25 keyword-based retriever."""
 
+    QUERY_CACHE_SIZE = 1024
+    # Bump when tokenization or scoring changes so saved indexes are rebuilt
+    INDEX_FORMAT = 1
+
     def __init__(self):
         """Initialize BM25 retriever."""
         self.bm25 = None
         self.chunks = []
         self.chunk_ids = []
+        self._search = None
 
-    def build_index(self, chunks: List[Dict]) -> None:
+    def build_index(self, chunks: List[Dict], cache_path: Optional[str] = None) -> None:
         """
         Build BM25 index from chunks.
 
         Args:
             chunks: List of chunk dicts with 'id', 'content', 'doc_id', 'doc_name'
+            cache_path: Optional .npz file holding a saved index; it is loaded
+                instead of tokenizing the chunks when it was built from the
+                same chunk IDs, and rewritten otherwise
 
         Raises:
             ValueError: If chunks list is empty
@@ -41,27 +190,99 @@ class BM25Retriever:
         if not chunks or len(chunks) == 0:
             raise ValueError("Chunks list cannot be empty")
 
-        # Tokenize chunks
+        fingerprint = None
+        if cache_path:
+            fingerprint = self._fingerprint(chunks)
+            if self._load_index(cache_path, chunks, fingerprint):
+                return
+
+        # Tokenize chunks; only indexed chunks are kept so that score
+        # positions line up with self.chunks
         tokenized_chunks = []
-        self.chunks = chunks
+        self.chunks = []
         self.chunk_ids = []
 
         for chunk in chunks:
-            content = chunk.get("content", "")
-            if not content or not content.strip():
+            tokens = _tokenize(chunk.get("content", ""))
+            if not tokens:
                 continue
 
-            # Simple tokenization: split by whitespace and lowercase
-            tokens = content.lower().split()
             tokenized_chunks.append(tokens)
+            self.chunks.append(chunk)
             self.chunk_ids.append(chunk.get("id", ""))
 
         if not tokenized_chunks:
             raise ValueError("No valid chunks to index")
 
-        self.bm25 = BM25Okapi(tokenized_chunks)
+        self.bm25 = BM25Index(tokenized_chunks)
+        # A fresh cache per index, so results never outlive the index
+        self._search = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._search_index)
         logger.info(f"BM25 index built with {len(tokenized_chunks)} chunks")
 
+        if cache_path:
+            self._save_index(cache_path, fingerprint)
+
+    def _fingerprint(self, chunks: List[Dict]) -> str:
+        """
+        Identify a chunk set by its IDs, independent of their order.
+
+        Chunks are never edited in place, so the same IDs mean the same
+        content and the saved index still applies.
+        """
+        digest = hashlib.sha256(str(self.INDEX_FORMAT).encode("utf-8"))
+        for chunk_id in sorted(str(chunk.get("id", "")) for chunk in chunks):
+            digest.update(b"\0" + chunk_id.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _save_index(self, path: str, fingerprint: str) -> None:
+        """Write the index to path atomically; failures are only logged."""
+        ids = "\0".join(str(chunk_id) for chunk_id in self.chunk_ids).encode("utf-8")
+        try:
+            directory = os.path.dirname(path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez(
+                        f,
+                        fingerprint=np.asarray(fingerprint),
+                        chunk_ids=np.frombuffer(ids, dtype=np.uint8),
+                        **self.bm25.to_arrays(),
+                    )
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"Failed to save BM25 index to {path}: {e}")
+
+    def _load_index(self, path: str, chunks: List[Dict], fingerprint: str) -> bool:
+        """
+        Load a saved index built from the same chunks.
+
+        Returns:
+            True if the index was loaded, False if it is missing or stale
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as arrays:
+                if str(arrays["fingerprint"]) != fingerprint:
+                    return False
+                ids = arrays["chunk_ids"].tobytes().decode("utf-8").split("\0")
+                bm25 = BM25Index.from_arrays(arrays)
+        except Exception as e:
+            logger.warning(f"Failed to load BM25 index from {path}: {e}")
+            return False
+
+        by_id = {str(chunk.get("id", "")): chunk for chunk in chunks}
+        self.bm25 = bm25
+        self.chunks = [by_id[chunk_id] for chunk_id in ids]
+        self.chunk_ids = [chunk.get("id", "") for chunk in self.chunks]
+        self._search = lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._search_index)
+        logger.info(f"BM25 index loaded from {path} with {len(self.chunks)} chunks")
+        return True
+
     def retrieve(self, query: str, top_k: int = 10) -> List[RetrievalResult]:
         """
         Retrieve chunks using BM25.
@@ -83,20 +304,15 @@ class BM25Retriever:
             raise ValueError("Index not built. Call build_index first.")
 
         # Tokenize query
-        tokens = query.lower().split()
+        tokens = _tokenize(query)
         if not tokens:
             raise ValueError("Query has no valid tokens")
 
-        # Get scores
-        scores = self.bm25.get_scores(tokens)
-
-        # Get top-k results
-        top_indices = sorted(
-            range(len(scores)), key=lambda i: scores[i], reverse=True
-        )[:top_k]
+        # Top-k (index, score) pairs, cached by the normalized query tokens
+        hits = self._search(tuple(tokens), top_k)
 
         results = []
-        for idx in top_indices:
+        for idx, score in hits:
             if idx < len(self.chunks):
                 chunk = self.chunks[idx]
                 results.append(
@@ -104,7 +320,7 @@ class BM25Retriever:
                         chunk_id=chunk.get("id", ""),
                         doc_id=chunk.get("doc_id", ""),
                         content=chunk.get("content", ""),
-                        score=float(scores[idx]),
+                        score=score,
                         doc_name=chunk.get("doc_name", ""),
                     )
                 )
@@ -112,10 +328,41 @@ class BM25Retriever:
         logger.info(f"BM25 retrieved {len(results)} results for query: {query}")
         return results
 
+    def _search_index(
+        self, tokens: Tuple[str, ...], top_k: int
+    ) -> Tuple[Tuple[int, float], ...]:
+        """Score the index and return the top_k (index, score) pairs."""
+        scores = self.bm25.get_scores(list(tokens))
+        return tuple(
+            (int(idx), float(scores[idx])) for idx in _top_k_indices(scores, top_k)
+        )
+
 
 class VectorRetriever:
     """Vector-based retriever using embeddings."""
 
+    # With SimSIMD, rows are stored in reduced precision: int8 for indexes at
+    # least QUANTIZE_MIN_ROWS large, float16 below that where quantization
+    # error matters more. Set HALF_PRECISION to False to keep float32 rows
+    # for domains where that precision loss is not acceptable
+    HALF_PRECISION = True
+    QUANTIZE_MIN_ROWS = 1024
+    # int8 scores rank a shortlist of RESCORE_FACTOR * top_k rows, which is
+    # rescored in float32 against the unquantized query
+    RESCORE_FACTOR = 4
+    # Float32 indexes at least this large are scored in two passes: a dot
+    # product over the first PRUNE_PREFIX_DIMS dimensions bounds every row's
+    # score, and only rows that can still reach the top_k are scored fully
+    PRUNE_MIN_ROWS = 10000
+    PRUNE_PREFIX_DIMS = 64
+    PRUNE_MAX_TOP_K = 50
+    # With hnswlib, indexes above ANN_MIN_ROWS are also searched through an
+    # HNSW graph, visiting O(log N) rows per query instead of all of them
+    ANN_MIN_ROWS = 2000
+    ANN_M = 32
+    ANN_EF_CONSTRUCTION = 200
+    ANN_EF_SEARCH = 64  # Raised to top_k for larger queries
+
     def __init__(self, embedding_provider=None):
         """
         Initialize vector retriever.
@@ -125,7 +372,14 @@ class VectorRetriever:
         """
         self.embedding_provider = embedding_provider
         self.chunks = []
-        self.embeddings = []
+        # Row-normalized (N, D) embedding matrix, row i for self.chunks[i];
+        # see _build_matrix for the storage dtype
+        self._emb_matrix = None
+        # Per-row norms of the dimensions after PRUNE_PREFIX_DIMS, set only
+        # when the index is scored with _pruned_scores
+        self._tail_norms = None
+        # HNSW graph over the unit rows, set only for large indexes
+        self._ann = None
 
     async def build_index(self, chunks: List[Dict], batch_size: int = 1, max_chars_per_text: int = 1000) -> None:
         """
@@ -147,7 +401,12 @@ class VectorRetriever:
             raise ValueError("Embedding provider not set")
 
         self.chunks = chunks
-        self.embeddings = []
+        # Rows are float32 arrays rather than lists of Python floats, which
+        # take several times the memory until the matrix is built
+        embeddings: List[np.ndarray] = []
+        self._emb_matrix = None
+        self._tail_norms = None
+        self._ann = None
 
         # Prepare contents with character limit to avoid 413 errors
         contents = []
@@ -183,7 +442,7 @@ class VectorRetriever:
 
                 try:
                     batch_embeddings = await self.embedding_provider.embed_texts(batch)
-                    self.embeddings.extend(batch_embeddings)
+                    embeddings.extend(np.asarray(batch_embeddings, dtype=np.float32))
                 except Exception as batch_error:
                     # If batch fails, try individual embeddings as fallback
                     error_str = str(batch_error)
@@ -195,49 +454,52 @@ class VectorRetriever:
                                 safe_content = content[:1000] if len(content) > 1000 else content
                                 if safe_content.strip():
                                     single_embedding = await self.embedding_provider.embed_text(safe_content)
-                                    self.embeddings.append(single_embedding)
+                                    embeddings.append(np.asarray(single_embedding, dtype=np.float32))
                                 else:
                                     # Use zero vector for empty
-                                    if self.embeddings:
-                                        dim = len(self.embeddings[0])
-                                        self.embeddings.append([0.0] * dim)
+                                    if embeddings:
+                                        embeddings.append(np.zeros_like(embeddings[0]))
                             except Exception:
                                 # Ultimate fallback
-                                if self.embeddings:
-                                    dim = len(self.embeddings[0])
-                                    self.embeddings.append([0.0] * dim)
+                                if embeddings:
+                                    embeddings.append(np.zeros_like(embeddings[0]))
                     else:
                         logger.warning(f"Batch embedding failed: {batch_error}, trying individual embeddings")
                         for content in batch:
                             try:
                                 single_embedding = await self.embedding_provider.embed_text(content[:1000])
-                                self.embeddings.append(single_embedding)
+                                embeddings.append(np.asarray(single_embedding, dtype=np.float32))
                             except Exception as single_error:
                                 logger.error(f"Single embedding failed: {single_error}")
-                                if self.embeddings:
-                                    dim = len(self.embeddings[0])
-                                    self.embeddings.append([0.0] * dim)
+                                if embeddings:
+                                    embeddings.append(np.zeros_like(embeddings[0]))
 
             # Ensure we have embeddings for all chunks
-            while len(self.embeddings) < len(chunks):
-                if self.embeddings:
-                    dim = len(self.embeddings[0])
-                    self.embeddings.append([0.0] * dim)
+            while len(embeddings) < len(chunks):
+                if embeddings:
+                    embeddings.append(np.zeros_like(embeddings[0]))
                 else:
                     break
 
-            logger.info(f"Vector index built with {len(self.embeddings)} embeddings")
+            self._emb_matrix = self._build_matrix(embeddings)
+            logger.info(f"Vector index built with {len(embeddings)} embeddings")
         except Exception as e:
             logger.error(f"Error building vector index: {str(e)}")
             raise
 
-    async def retrieve(self, query: str, top_k: int = 10) -> List[RetrievalResult]:
+    async def retrieve(
+        self,
+        query: str,
+        top_k: int = 10,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[RetrievalResult]:
         """
         Retrieve chunks using vector similarity.
 
         Args:
             query: Query string
             top_k: Number of top results to return
+            query_embedding: Precomputed embedding of query, if available
 
         Returns:
             List of RetrievalResult objects
@@ -249,7 +511,7 @@ class VectorRetriever:
         if not query or not query.strip():
             raise ValueError("Query cannot be empty")
 
-        if not self.embeddings or len(self.embeddings) == 0:
+        if self._emb_matrix is None or len(self._emb_matrix) == 0:
             raise ValueError("Index not built. Call build_index first.")
 
         if self.embedding_provider is None:
@@ -257,48 +519,241 @@ class VectorRetriever:
 
         try:
             # Generate query embedding
-            query_embedding = await self.embedding_provider.embed_text(query)
+            if query_embedding is None:
+                query_embedding = await self.embedding_provider.embed_text(query)
 
-            # Calculate similarity scores
-            import numpy as np
+            scores = self._score_queries([query_embedding], top_k)[0]
+            results = self._to_results(scores, top_k)
 
-            query_vec = np.array(query_embedding)
-            scores = []
+            logger.info(f"Vector retriever retrieved {len(results)} results for query: {query}")
+            return results
 
-            for embedding in self.embeddings:
-                emb_vec = np.array(embedding)
-                # Cosine similarity
-                similarity = np.dot(query_vec, emb_vec) / (
-                    np.linalg.norm(query_vec) * np.linalg.norm(emb_vec) + 1e-8
-                )
-                scores.append(similarity)
+        except Exception as e:
+            logger.error(f"Error retrieving with vector similarity: {str(e)}")
+            raise
+
+    async def retrieve_batch(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> List[List[RetrievalResult]]:
+        """
+        Retrieve chunks for several queries at once.
 
-            # Get top-k results
-            top_indices = sorted(
-                range(len(scores)), key=lambda i: scores[i], reverse=True
-            )[:top_k]
+        All queries are embedded with one provider call and scored against
+        the index together.
 
-            results = []
-            for idx in top_indices:
-                if idx < len(self.chunks):
-                    chunk = self.chunks[idx]
-                    results.append(
-                        RetrievalResult(
-                            chunk_id=chunk.get("id", ""),
-                            doc_id=chunk.get("doc_id", ""),
-                            content=chunk.get("content", ""),
-                            score=float(scores[idx]),
-                            doc_name=chunk.get("doc_name", ""),
-                        )
-                    )
+        Args:
+            queries: Query strings
+            top_k: Number of top results to return per query
+            query_embeddings: Precomputed embeddings of queries, if available
 
-            logger.info(f"Vector retriever retrieved {len(results)} results for query: {query}")
+        Returns:
+            One list of RetrievalResult objects per query, in query order
+
+        Raises:
+            ValueError: If a query is empty or index not built
+            Exception: If embedding generation fails
+        """
+        if any(not query or not query.strip() for query in queries):
+            raise ValueError("Query cannot be empty")
+
+        if self._emb_matrix is None or len(self._emb_matrix) == 0:
+            raise ValueError("Index not built. Call build_index first.")
+
+        if self.embedding_provider is None:
+            raise ValueError("Embedding provider not set")
+
+        if not queries:
+            return []
+
+        try:
+            if query_embeddings is None:
+                query_embeddings = await self.embedding_provider.embed_texts(queries)
+
+            scores = self._score_queries(query_embeddings, top_k)
+            results = [self._to_results(row, top_k) for row in scores]
+
+            logger.info(
+                f"Vector retriever retrieved results for {len(queries)} queries"
+            )
             return results
 
         except Exception as e:
             logger.error(f"Error retrieving with vector similarity: {str(e)}")
             raise
 
+    def _score_queries(
+        self, query_embeddings: List[List[float]], top_k: int
+    ) -> np.ndarray:
+        """
+        Cosine similarity of each query against every stored vector.
+
+        Returns:
+            (Q, N) array with one row of scores per query
+        """
+        query_vecs = np.asarray(query_embeddings, dtype=np.float32)
+        query_vecs = query_vecs / (
+            np.linalg.norm(query_vecs, axis=1, keepdims=True) + 1e-8
+        )
+        if self._ann is not None and top_k > 0:
+            return self._ann_scores(query_vecs, top_k)
+        if SIMSIMD_AVAILABLE:
+            if self._emb_matrix.dtype == np.int8:
+                query_rows = self._quantize_rows(query_vecs)
+            else:
+                query_rows = query_vecs.astype(self._emb_matrix.dtype)
+            distances = simsimd.cdist(
+                query_rows, self._emb_matrix, metric="cosine"
+            )
+            scores = 1.0 - np.asarray(distances, dtype=np.float32).reshape(
+                len(query_vecs), -1
+            )
+            if self._emb_matrix.dtype == np.int8:
+                scores = np.stack([
+                    self._rescore_quantized(row, query_vec, top_k)
+                    for row, query_vec in zip(scores, query_vecs)
+                ])
+            return scores
+        if self._tail_norms is not None and 0 < top_k <= self.PRUNE_MAX_TOP_K:
+            return np.stack([self._pruned_scores(q, top_k) for q in query_vecs])
+        # One GEMM scores every query against every row
+        return query_vecs @ self._emb_matrix.T
+
+    def _to_results(self, scores: np.ndarray, top_k: int) -> List[RetrievalResult]:
+        """Build results for the top_k chunks of one query's score row."""
+        results = []
+        for idx in _top_k_indices(scores, top_k):
+            if idx < len(self.chunks):
+                chunk = self.chunks[idx]
+                results.append(
+                    RetrievalResult(
+                        chunk_id=chunk.get("id", ""),
+                        doc_id=chunk.get("doc_id", ""),
+                        content=chunk.get("content", ""),
+                        score=float(scores[idx]),
+                        doc_name=chunk.get("doc_name", ""),
+                    )
+                )
+        return results
+
+    def _build_matrix(self, embeddings) -> np.ndarray:
+        """
+        Stack embedding rows into a contiguous (N, D) matrix of unit rows.
+
+        Without SimSIMD the matrix is float32, since NumPy has no BLAS kernel
+        for float16 matmul and would scan half-precision rows far slower.
+        With it, rows are stored as float16, or as int8 for large indexes,
+        since its reduced-precision cosine kernels cut memory traffic 2-4x
+        per query; HALF_PRECISION = False keeps them float32.
+        """
+        # np.array always copies, so the rows can be normalized in place
+        matrix = np.array(embeddings, dtype=np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-8)
+        if HNSWLIB_AVAILABLE and len(matrix) > self.ANN_MIN_ROWS:
+            self._ann = self._build_ann(matrix)
+        if not SIMSIMD_AVAILABLE or not self.HALF_PRECISION:
+            if (
+                self._ann is None
+                and not SIMSIMD_AVAILABLE
+                and len(matrix) >= self.PRUNE_MIN_ROWS
+                and matrix.shape[1] > self.PRUNE_PREFIX_DIMS
+            ):
+                self._tail_norms = np.linalg.norm(
+                    matrix[:, self.PRUNE_PREFIX_DIMS:], axis=1
+                )
+            return matrix
+        if len(matrix) >= self.QUANTIZE_MIN_ROWS:
+            return self._quantize_rows(matrix)
+        return matrix.astype(np.float16)
+
+    def _pruned_scores(self, query_vec: np.ndarray, top_k: int) -> np.ndarray:
+        """
+        Score rows against a unit query, skipping rows that cannot reach top_k.
+
+        By Cauchy-Schwarz a row scores at most its prefix dot product plus
+        the product of the query's and row's tail norms. The rows with the
+        best bounds are scored exactly, and the lowest of those scores is a
+        threshold no other top_k row can fall below, so only rows whose
+        bound reaches it are scored in full.
+
+        Returns:
+            Scores for every row, -inf for rows that were skipped
+        """
+        prefix = self.PRUNE_PREFIX_DIMS
+        partial = self._emb_matrix[:, :prefix] @ query_vec[:prefix]
+        bounds = partial + self._tail_norms * np.linalg.norm(query_vec[prefix:])
+
+        seeds = _top_k_indices(bounds, top_k)
+        threshold = (self._emb_matrix[seeds] @ query_vec).min()
+
+        # Small slack keeps rows whose float32 bound rounds below their score
+        survivors = np.flatnonzero(bounds >= threshold - 1e-5)
+        scores = np.full(len(bounds), -np.inf, dtype=np.float32)
+        scores[survivors] = self._emb_matrix[survivors] @ query_vec
+        return scores
+
+    def _build_ann(self, matrix: np.ndarray):
+        """Build an inner-product HNSW index over unit rows."""
+        index = hnswlib.Index(space="ip", dim=matrix.shape[1])
+        index.init_index(
+            max_elements=len(matrix),
+            ef_construction=self.ANN_EF_CONSTRUCTION,
+            M=self.ANN_M,
+        )
+        index.add_items(matrix, np.arange(len(matrix)))
+        return index
+
+    def _ann_scores(self, query_vecs: np.ndarray, top_k: int) -> np.ndarray:
+        """
+        Score the approximate top_k rows of each query with the HNSW index.
+
+        Returns:
+            (Q, N) scores, -inf for rows the search did not return
+        """
+        k = min(top_k, self._ann.get_current_count())
+        self._ann.set_ef(max(self.ANN_EF_SEARCH, k))
+        labels, distances = self._ann.knn_query(query_vecs, k=k)
+        scores = np.full(
+            (len(query_vecs), self._ann.get_current_count()), -np.inf, dtype=np.float32
+        )
+        # hnswlib's "ip" distance is 1 - dot product
+        np.put_along_axis(scores, labels.astype(np.intp), 1.0 - distances, axis=1)
+        return scores
+
+    def _rescore_quantized(
+        self, coarse: np.ndarray, query_vec: np.ndarray, top_k: int
+    ) -> np.ndarray:
+        """
+        Rescore the best int8 matches against the full-precision query.
+
+        The coarse scores compare the quantized query with the int8 rows;
+        the shortlist is rescored as the exact cosine between the float32
+        query and each stored row, removing the query's quantization error.
+
+        Returns:
+            Scores for every row, -inf for rows outside the shortlist
+        """
+        shortlist = _top_k_indices(coarse, self.RESCORE_FACTOR * top_k)
+        rows = self._emb_matrix[shortlist].astype(np.float32)
+        scores = np.full(len(coarse), -np.inf, dtype=np.float32)
+        scores[shortlist] = (rows @ query_vec) / np.maximum(
+            np.linalg.norm(rows, axis=1), 1e-8
+        )
+        return scores
+
+    @staticmethod
+    def _quantize_rows(matrix: np.ndarray) -> np.ndarray:
+        """
+        Quantize each row to int8 with its own scale.
+
+        Cosine similarity is scale invariant, so the per-row scales need not
+        be kept to score int8 rows against an int8 query.
+        """
+        scale = np.max(np.abs(matrix), axis=1, keepdims=True) / 127.0
+        return np.round(matrix / np.maximum(scale, 1e-12)).astype(np.int8)
+
 
 class ResultFuser:
     """Fuses results from multiple retrieval methods using RRF."""
@@ -308,6 +763,7 @@ class ResultFuser:
         bm25_results: List[RetrievalResult],
         vector_results: List[RetrievalResult],
         k: int = 60,
+        top_k: Optional[int] = None,
     ) -> List[RetrievalResult]:
         """
         Fuse results using Reciprocal Rank Fusion (RRF).
@@ -316,9 +772,11 @@ class ResultFuser:
             bm25_results: Results from BM25 retrieval
             vector_results: Results from vector retrieval
             k: RRF parameter (default 60)
+            top_k: Number of fused results to keep (default: all)
 
         Returns:
-            Fused results sorted by RRF score
+            Fused results sorted by RRF score. These are the first input
+            result for each chunk, with score overwritten by the fused score
 
         Raises:
             ValueError: If both result lists are empty
@@ -326,46 +784,42 @@ class ResultFuser:
         if not bm25_results and not vector_results:
             raise ValueError("Both result lists cannot be empty")
 
-        # Create RRF scores
-        rrf_scores = {}
-
-        # Process BM25 results
-        for rank, result in enumerate(bm25_results, 1):
-            chunk_id = result.chunk_id
-            rrf_scores[chunk_id] = rrf_scores.get(chunk_id, 0) + 1 / (k + rank)
-
-        # Process vector results
-        for rank, result in enumerate(vector_results, 1):
-            chunk_id = result.chunk_id
-            rrf_scores[chunk_id] = rrf_scores.get(chunk_id, 0) + 1 / (k + rank)
+        all_results = bm25_results + vector_results
+        ranks = np.concatenate((
+            np.arange(1, len(bm25_results) + 1),
+            np.arange(1, len(vector_results) + 1),
+        ))
+
+        # Dense ids numbered by first occurrence, so ties keep input order
+        chunk_ids = np.array([r.chunk_id for r in all_results], dtype=object)
+        _, first, inverse = np.unique(
+            chunk_ids, return_index=True, return_inverse=True
+        )
+        by_first = np.argsort(first)
+        dense_ids = np.empty_like(by_first)
+        dense_ids[by_first] = np.arange(len(by_first))
+        first = first[by_first]
 
-        # Create result map for quick lookup
-        result_map = {}
-        for result in bm25_results + vector_results:
-            if result.chunk_id not in result_map:
-                result_map[result.chunk_id] = result
+        # Create RRF scores
+        rrf_scores = np.zeros(len(first))
+        np.add.at(rrf_scores, dense_ids[inverse.ravel()], 1.0 / (k + ranks))
 
-        # Sort by RRF score
-        sorted_chunks = sorted(rrf_scores.items(), key=lambda x: x[1], reverse=True)
+        # Rank by RRF score, selecting only the top_k when it is given
+        top_indices = _top_k_indices(
+            rrf_scores, len(first) if top_k is None else top_k
+        )
 
         # Create fused results with normalized scores
         fused_results = []
-        if len(sorted_chunks) > 0:
-            max_rrf_score = sorted_chunks[0][1]  # Highest RRF score
-            for chunk_id, rrf_score in sorted_chunks:
-                if chunk_id in result_map:
-                    result = result_map[chunk_id]
-                    # Normalize score to 0-1 range (percentage-like)
-                    # Using min-max normalization with a reasonable max
-                    normalized_score = min(rrf_score / max_rrf_score, 1.0) if max_rrf_score > 0 else 0.0
-                    fused_result = RetrievalResult(
-                        chunk_id=result.chunk_id,
-                        doc_id=result.doc_id,
-                        content=result.content,
-                        score=normalized_score,
-                        doc_name=result.doc_name,
-                    )
-                    fused_results.append(fused_result)
+        if len(top_indices) > 0:
+            max_rrf_score = rrf_scores[top_indices[0]]  # Highest RRF score
+            for idx in top_indices:
+                result = all_results[first[idx]]
+                # Normalize score to 0-1 range (percentage-like)
+                # Using min-max normalization with a reasonable max
+                normalized_score = min(rrf_scores[idx] / max_rrf_score, 1.0) if max_rrf_score > 0 else 0.0
+                result.score = float(normalized_score)
+                fused_results.append(result)
 
         logger.info(f"Fused {len(fused_results)} results using RRF")
         return fused_results
@@ -385,14 +839,45 @@ class HybridRetriever:
         self.vector_retriever = VectorRetriever(embedding_provider)
         self.embedding_provider = embedding_provider
 
-    async def build_index(self, chunks: List[Dict], batch_size: int = 1, max_chars_per_text: int = 1000) -> None:
+    def with_embedding_provider(self, embedding_provider) -> "HybridRetriever":
+        """
+        Get a retriever sharing the built indices that embeds queries with another provider.
+
+        This retriever is left unchanged, so a cached retriever can serve
+        concurrent requests that each bring their own provider.
+
+        Args:
+            embedding_provider: Provider for generating embeddings
+
+        Returns:
+            A shallow copy using embedding_provider
+        """
+        retriever = copy.copy(self)
+        retriever.vector_retriever = copy.copy(self.vector_retriever)
+        retriever.embedding_provider = embedding_provider
+        retriever.vector_retriever.embedding_provider = embedding_provider
+        return retriever
+
+    async def build_index(
+        self,
+        chunks: List[Dict],
+        batch_size: int = 1,
+        max_chars_per_text: int = 1000,
+        bm25_cache_path: Optional[str] = None,
+        build_vectors: Optional[bool] = None,
+    ) -> None:
         """
         Build indices for both BM25 and vector retrieval.
 
         Args:
-            chunks: List of chunk dicts
+            chunks: List of chunk dicts, or any read-only mappings with the
+                same keys such as SQLAlchemy result row mappings
             batch_size: Number of chunks to process in each batch for embeddings (default: 1)
             max_chars_per_text: Maximum characters per text to avoid API limits (default: 1000)
+            bm25_cache_path: Optional file to load the BM25 index from or save it to
+            build_vectors: Whether to embed the chunks for vector retrieval;
+                defaults to whether an embedding provider is set. Keyword-only
+                callers pass False to build the BM25 index alone
 
         Raises:
             ValueError: If chunks list is empty
@@ -400,15 +885,22 @@ class HybridRetriever:
         if not chunks or len(chunks) == 0:
             raise ValueError("Chunks list cannot be empty")
 
+        if build_vectors is None:
+            build_vectors = self.embedding_provider is not None
+
         # Build BM25 index
-        self.bm25_retriever.build_index(chunks)
+        self.bm25_retriever.build_index(chunks, cache_path=bm25_cache_path)
 
-        # Build vector index if embedding provider is available
-        if self.embedding_provider:
+        # Build vector index if requested and an embedding provider is available
+        if build_vectors and self.embedding_provider:
             await self.vector_retriever.build_index(chunks, batch_size=batch_size, max_chars_per_text=max_chars_per_text)
 
     async def retrieve(
-        self, query: str, top_k: int = 10, use_vector: bool = True
+        self,
+        query: str,
+        top_k: int = 10,
+        use_vector: bool = True,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[RetrievalResult]:
         """
         Retrieve using hybrid search.
@@ -417,9 +909,11 @@ class HybridRetriever:
             query: Query string
             top_k: Number of top results to return
             use_vector: Whether to use vector retrieval
+            query_embedding: Precomputed embedding of query, if available
 
         Returns:
-            List of fused RetrievalResult objects
+            List of fused RetrievalResult objects; a query BM25 cannot score
+            (no valid tokens) gets vector results only
 
         Raises:
             ValueError: If query is empty
@@ -427,22 +921,109 @@ class HybridRetriever:
         if not query or not query.strip():
             raise ValueError("Query cannot be empty")
 
-        # Get BM25 results
-        bm25_results = self.bm25_retriever.retrieve(query, top_k=top_k)
-
-        # Get vector results if enabled
         vector_results = []
         if use_vector and self.embedding_provider:
-            try:
-                vector_results = await self.vector_retriever.retrieve(
-                    query, top_k=top_k
-                )
-            except Exception as e:
-                logger.warning(f"Vector retrieval failed, using BM25 only: {str(e)}")
+            # Score BM25 in a worker thread while the query embedding is fetched
+            bm25_results, vector_results = await asyncio.gather(
+                asyncio.to_thread(self._retrieve_bm25, query, top_k),
+                self._retrieve_vector(query, top_k, query_embedding),
+            )
+        else:
+            bm25_results = self._retrieve_bm25(query, top_k)
 
         # Fuse results
         if vector_results:
-            fused_results = ResultFuser.fuse_results(bm25_results, vector_results)
-            return fused_results[:top_k]
+            return ResultFuser.fuse_results(
+                bm25_results, vector_results, top_k=top_k
+            )
         else:
             return bm25_results[:top_k]
+
+    async def retrieve_batch(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        use_vector: bool = True,
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> List[List[RetrievalResult]]:
+        """
+        Retrieve using hybrid search for several queries at once.
+
+        The queries are embedded in one provider call and scored together,
+        while BM25 scores them in a worker thread. A query BM25 cannot
+        score (no valid tokens) gets no BM25 results instead of failing
+        the batch.
+
+        Args:
+            queries: Query strings
+            top_k: Number of top results to return per query
+            use_vector: Whether to use vector retrieval
+            query_embeddings: Precomputed embeddings of queries, if available
+
+        Returns:
+            One list of fused RetrievalResult objects per query, in query order
+
+        Raises:
+            ValueError: If a query is empty
+        """
+        if any(not query or not query.strip() for query in queries):
+            raise ValueError("Query cannot be empty")
+
+        if use_vector and self.embedding_provider:
+            bm25_batches, vector_batches = await asyncio.gather(
+                asyncio.to_thread(self._retrieve_bm25_batch, queries, top_k),
+                self._retrieve_vector_batch(queries, top_k, query_embeddings),
+            )
+        else:
+            bm25_batches = self._retrieve_bm25_batch(queries, top_k)
+            vector_batches = [[] for _ in queries]
+
+        return [
+            ResultFuser.fuse_results(bm25_results, vector_results, top_k=top_k)
+            if vector_results
+            else bm25_results[:top_k]
+            for bm25_results, vector_results in zip(bm25_batches, vector_batches)
+        ]
+
+    def _retrieve_bm25(self, query: str, top_k: int) -> List[RetrievalResult]:
+        """Run BM25 retrieval, returning no results for queries it cannot score."""
+        try:
+            return self.bm25_retriever.retrieve(query, top_k=top_k)
+        except ValueError as e:
+            if self.bm25_retriever.bm25 is None:
+                raise
+            logger.warning(f"BM25 retrieval failed for query '{query}': {e}")
+            return []
+
+    def _retrieve_bm25_batch(
+        self, queries: List[str], top_k: int
+    ) -> List[List[RetrievalResult]]:
+        """Run BM25 retrieval per query, giving no results where it fails."""
+        return [self._retrieve_bm25(query, top_k) for query in queries]
+
+    async def _retrieve_vector_batch(
+        self,
+        queries: List[str],
+        top_k: int,
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> List[List[RetrievalResult]]:
+        """Run batched vector retrieval, returning no results if it fails."""
+        try:
+            return await self.vector_retriever.retrieve_batch(
+                queries, top_k=top_k, query_embeddings=query_embeddings
+            )
+        except Exception as e:
+            logger.warning(f"Vector retrieval failed, using BM25 only: {str(e)}")
+            return [[] for _ in queries]
+
+    async def _retrieve_vector(
+        self, query: str, top_k: int, query_embedding: Optional[List[float]] = None
+    ) -> List[RetrievalResult]:
+        """Run vector retrieval, returning no results if it fails."""
+        try:
+            return await self.vector_retriever.retrieve(
+                query, top_k=top_k, query_embedding=query_embedding
+            )
+        except Exception as e:
+            logger.warning(f"Vector retrieval failed, using BM25 only: {str(e)}")
+            return []
@@ -0,0 +1,178 @@
+"""Persistent cache of reranker scores."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+# Chunk IDs bound per statement, below SQLite's host parameter limit
+_BATCH_SIZE = 500
+
+
+class ScorerCache:
+    """Caches (model, query, chunk_id) -> score entries in a SQLite database.
+
+    Queries are stored as SHA-256 digests, so the cache never holds user
+    query text. Entries expire after ``ttl`` seconds, and the oldest entries
+    are evicted once the cache holds more than ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Initialize scorer cache.
+
+        Args:
+            path: SQLite database file; ":memory:" keeps the cache in process
+            ttl: Seconds an entry stays valid; None keeps entries until evicted
+            max_entries: Maximum number of cached entries; None is unbounded
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rerank_scores ("
+                "model TEXT NOT NULL, "
+                "query_sha256 TEXT NOT NULL, "
+                "chunk_id TEXT NOT NULL, "
+                "score REAL NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "PRIMARY KEY (model, query_sha256, chunk_id))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_rerank_scores_chunk_id "
+                "ON rerank_scores (chunk_id)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_rerank_scores_created_at "
+                "ON rerank_scores (created_at)"
+            )
+
+    @staticmethod
+    def _query_hash(query: str) -> str:
+        """Hash a query string for use as a cache key."""
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    def get_many(
+        self, model: str, query: str, chunk_ids: Iterable[str]
+    ) -> Dict[str, float]:
+        """
+        Look up cached scores for a query.
+
+        Args:
+            model: Reranker model the scores were produced by
+            query: Query string
+            chunk_ids: Chunk IDs to look up
+
+        Returns:
+            Mapping of chunk_id to score for the chunk IDs that were cached
+            and have not expired
+        """
+        chunk_ids = list(dict.fromkeys(chunk_ids))
+        if not chunk_ids:
+            return {}
+
+        cutoff = time.time() - self.ttl if self.ttl is not None else float("-inf")
+        query_hash = self._query_hash(query)
+        scores: Dict[str, float] = {}
+        with self._lock:
+            for start in range(0, len(chunk_ids), _BATCH_SIZE):
+                batch = chunk_ids[start:start + _BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                scores.update(self._conn.execute(
+                    "SELECT chunk_id, score FROM rerank_scores "
+                    "WHERE model = ? AND query_sha256 = ? AND created_at >= ? "
+                    f"AND chunk_id IN ({placeholders})",
+                    [model, query_hash, cutoff, *batch],
+                ).fetchall())
+        return scores
+
+    def put_many(self, model: str, query: str, scores: Dict[str, float]) -> None:
+        """
+        Store scores for a query, replacing existing entries.
+
+        Expired entries are pruned and the cache is trimmed to max_entries
+        in the same transaction.
+
+        Args:
+            model: Reranker model the scores were produced by
+            query: Query string
+            scores: Mapping of chunk_id to score
+        """
+        if not scores:
+            return
+
+        query_hash = self._query_hash(query)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rerank_scores "
+                "(model, query_sha256, chunk_id, score, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (model, query_hash, chunk_id, score, now)
+                    for chunk_id, score in scores.items()
+                ],
+            )
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Delete expired entries and evict the oldest above max_entries."""
+        if self.ttl is not None:
+            self._conn.execute(
+                "DELETE FROM rerank_scores WHERE created_at < ?", (now - self.ttl,)
+            )
+        if self.max_entries is not None:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM rerank_scores"
+            ).fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM rerank_scores WHERE rowid IN ("
+                    "SELECT rowid FROM rerank_scores ORDER BY created_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def delete_chunks(self, chunk_ids: Iterable[str]) -> None:
+        """
+        Remove every cached score of the given chunks.
+
+        Args:
+            chunk_ids: IDs of deleted chunks
+        """
+        chunk_ids = list(chunk_ids)
+        with self._lock, self._conn:
+            for start in range(0, len(chunk_ids), _BATCH_SIZE):
+                batch = chunk_ids[start:start + _BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                self._conn.execute(
+                    f"DELETE FROM rerank_scores WHERE chunk_id IN ({placeholders})",
+                    batch,
+                )
+
+    def clear(self) -> None:
+        """Remove all cached scores."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM rerank_scores")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=None)
+def get_scorer_cache(
+    path: str, ttl: Optional[float] = None, max_entries: Optional[int] = None
+) -> ScorerCache:
+    """Get the shared scorer cache for a database path."""
+    return ScorerCache(path, ttl=ttl, max_entries=max_entries)
@@ -0,0 +1,145 @@
+"""Semantic cache of search responses keyed by query embeddings."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticCache:
+    """LRU cache returning stored values for near-duplicate query embeddings.
+
+    Entries live in partitions (for example one per knowledge base and
+    top_k), and a lookup only matches entries of its own partition. Query
+    vectors are L2-normalized, so the inner product of two of them is their
+    cosine similarity; a lookup scores all of a partition's entries with one
+    matrix-vector product and hits when the best one reaches the threshold.
+    """
+
+    def __init__(
+        self, max_size: int = 1024, ttl: float = 300, threshold: float = 0.95
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            max_size: Maximum entries across all partitions before the least
+                recently used one is evicted
+            ttl: Seconds an entry stays valid
+            threshold: Minimum cosine similarity for a lookup to hit
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        # (partition, entry id) -> (unit vector, value, expiry), in LRU order
+        self._entries: "OrderedDict[Tuple[Hashable, int], Tuple[np.ndarray, Any, float]]" = OrderedDict()
+        # partition -> (entry keys, stacked vectors), rebuilt after changes
+        self._matrices: Dict[Hashable, Tuple[List[Tuple[Hashable, int]], np.ndarray]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        """Return the embedding as a float32 unit vector."""
+        vec = np.asarray(embedding, dtype=np.float32)
+        return vec / (np.linalg.norm(vec) + 1e-8)
+
+    def get(self, partition: Hashable, embedding) -> Optional[Any]:
+        """
+        Look up the value stored for the most similar cached query.
+
+        Args:
+            partition: Partition to search
+            embedding: Query embedding
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        vec = self._normalize(embedding)
+        with self._lock:
+            self._expire()
+            matrix = self._matrix(partition)
+            if matrix is None:
+                return None
+            keys, vectors = matrix
+            if vectors.shape[1] != len(vec):
+                return None
+            scores = vectors @ vec
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            key = keys[best]
+            self._entries.move_to_end(key)
+            return self._entries[key][1]
+
+    def put(self, partition: Hashable, embedding, value: Any) -> None:
+        """
+        Store a value for a query embedding.
+
+        Args:
+            partition: Partition to store the entry in
+            embedding: Query embedding
+            value: Value to return for similar queries
+        """
+        if self.max_size <= 0:
+            return
+
+        vec = self._normalize(embedding)
+        with self._lock:
+            key = (partition, self._next_id)
+            self._next_id += 1
+            self._entries[key] = (vec, value, time.monotonic() + self.ttl)
+            self._matrices.pop(partition, None)
+            while len(self._entries) > self.max_size:
+                (evicted, _), _ = self._entries.popitem(last=False)
+                self._matrices.pop(evicted, None)
+
+    def invalidate(self, match) -> int:
+        """
+        Remove every entry whose partition satisfies a predicate.
+
+        Args:
+            match: Callable taking a partition and returning True to drop it
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            stale = [key for key in self._entries if match(key[0])]
+            for key in stale:
+                del self._entries[key]
+                self._matrices.pop(key[0], None)
+            return len(stale)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self) -> None:
+        """Drop expired entries. Caller must hold the lock."""
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry[2] <= now]
+        for key in expired:
+            del self._entries[key]
+            self._matrices.pop(key[0], None)
+
+    def _matrix(
+        self, partition: Hashable
+    ) -> Optional[Tuple[List[Tuple[Hashable, int]], np.ndarray]]:
+        """Get a partition's entry keys and stacked vectors. Caller must hold the lock."""
+        if partition not in self._matrices:
+            keys = [key for key in self._entries if key[0] == partition]
+            if not keys:
+                return None
+            vectors = [self._entries[key][0] for key in keys]
+            if len({len(v) for v in vectors}) != 1:
+                return None
+            self._matrices[partition] = (keys, np.stack(vectors))
+        return self._matrices[partition]
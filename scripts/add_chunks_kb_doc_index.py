@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""One-off migration adding the composite (kb_id, doc_id, chunk_index) index.
+
+Creates chunks.ix_chunks_kb_doc_idx on databases created before it existed
+and drops the standalone ix_chunks_kb_id index it replaces.
+Safe to re-run: both statements are no-ops once the migration has run.
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import engine  # noqa: E402
+
+
+def add_composite_index(connection) -> None:
+    """Create the composite index if the table predates it."""
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_chunks_kb_doc_idx "
+        "ON chunks (kb_id, doc_id, chunk_index)"
+    ))
+    print("✓ Ensured index ix_chunks_kb_doc_idx")
+
+
+def drop_kb_id_index(connection) -> None:
+    """Drop the kb_id index, now covered by the composite index."""
+    connection.execute(text("DROP INDEX IF EXISTS ix_chunks_kb_id"))
+    print("✓ Dropped redundant index ix_chunks_kb_id")
+
+
+def main() -> int:
+    """Run the migration in one transaction."""
+    with engine.begin() as connection:
+        add_composite_index(connection)
+        drop_kb_id_index(connection)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
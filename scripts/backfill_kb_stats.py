@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""One-off migration adding denormalized document stats to knowledge bases.
+
+Adds the knowledge_bases.document_count and total_size columns to databases
+created before they existed, then fills them from the documents table.
+Safe to re-run: existing columns are kept and the stats are recomputed.
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import engine  # noqa: E402
+
+
+def add_missing_columns(connection) -> None:
+    """Add the stats columns if the table predates them."""
+    columns = {c["name"] for c in inspect(connection).get_columns("knowledge_bases")}
+    if "document_count" not in columns:
+        connection.execute(text(
+            "ALTER TABLE knowledge_bases "
+            "ADD COLUMN document_count INTEGER NOT NULL DEFAULT 0"
+        ))
+        print("✓ Added knowledge_bases.document_count")
+    if "total_size" not in columns:
+        connection.execute(text(
+            "ALTER TABLE knowledge_bases "
+            "ADD COLUMN total_size BIGINT NOT NULL DEFAULT 0"
+        ))
+        print("✓ Added knowledge_bases.total_size")
+
+
+def backfill_stats(connection) -> int:
+    """Recompute every knowledge base's stats; returns the rows updated."""
+    result = connection.execute(text(
+        "UPDATE knowledge_bases SET "
+        "document_count = (SELECT COUNT(*) FROM documents "
+        "WHERE documents.kb_id = knowledge_bases.id), "
+        "total_size = (SELECT COALESCE(SUM(file_size), 0) FROM documents "
+        "WHERE documents.kb_id = knowledge_bases.id)"
+    ))
+    return result.rowcount
+
+
+def main() -> int:
+    """Run the migration in one transaction."""
+    with engine.begin() as connection:
+        add_missing_columns(connection)
+        updated = backfill_stats(connection)
+    print(f"✓ Backfilled document stats for {updated} knowledge bases")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
 """Document management service."""
 
+import asyncio
+import itertools
 import logging
 import os
 import uuid
@@ -8,11 +10,13 @@ from typing import List, Optional
 from pathlib import Path
 
 from sqlalchemy.orm import Session
+from config import settings
 from models.orm import Document, Chunk, KnowledgeBase
 from models.schemas import DocumentResponse, PaginatedResponse
 from rag.document_processor import DocumentProcessor
 from rag.chunking_strategy import ChunkingStrategy, MarkdownHeadingChunkingStrategy
 from core.vector_store import VectorStore
+from services.search_service import invalidate_index, invalidate_rerank_scores
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,9 @@ logger = logging.getLogger(__name__)
 class DocumentService:
     """Service for managing documents."""
 
+    MAX_CONCURRENT_EMBEDDING_REQUESTS = 4
+    CHUNK_WRITE_BATCH = 256  # Chunks stored per round while streaming a file
+
     def __init__(
         self,
         db: Session,
@@ -91,70 +98,43 @@ class DocumentService:
             self.db.add(document)
             self.db.commit()
 
-            # Process document
-            content = self.processor.process_document(file_path)
+            if self.embedding_provider:
+                await asyncio.to_thread(self._ensure_collection, kb)
 
-            # 根据文件类型选择切分策略
             file_suffix = Path(file_name).suffix.lower()
+            chunk_count = 0
             if file_suffix == '.md':
-                # Markdown 文件使用标题切分策略
+                # Markdown 文件使用标题切分策略，需要完整文本来解析标题层级
+                content = await self.processor.process_document_async(file_path)
                 chunks_with_metadata = self.md_chunker.chunk_text(content)
-                # 提取 chunk 内容和元数据
-                chunks = []
-                chunk_metadata_list = []
-                for item in chunks_with_metadata:
-                    chunks.append(item['content'])
-                    chunk_metadata_list.append(item.get('metadata', {}))
+                chunks = [item['content'] for item in chunks_with_metadata]
+                await self._store_chunks(kb_id, doc_id, file_name, chunks, 0)
+                chunk_count = len(chunks)
             else:
-                # 其他文件使用默认切分策略
-                chunks = self.chunker.chunk_text(content)
-                chunk_metadata_list = [{}] * len(chunks)
-
-            # Generate embeddings and store chunks
-            chunk_ids = []
-            for chunk_index, chunk_content in enumerate(chunks):
-                chunk_id = str(uuid.uuid4())
-                chunk_ids.append(chunk_id)
-
-                # Create chunk record
-                chunk = Chunk(
-                    id=chunk_id,
-                    doc_id=doc_id,
-                    kb_id=kb_id,
-                    content=chunk_content,
-                    chunk_index=chunk_index,
+                # 其他文件边读取边切分，按批写入，不保留全文和全部 chunk
+                chunk_iter = self.chunker.chunk_iter(
+                    self.processor.iter_text(file_path)
                 )
-                self.db.add(chunk)
-
-                # Generate embedding if provider is available
-                if self.embedding_provider:
-                    try:
-                        embedding = await self.embedding_provider.embed_text(
-                            chunk_content
-                        )
-                        # Store in vector store
-                        await self.vector_store.add_vector(
-                            kb_id=kb_id,
-                            chunk_id=chunk_id,
-                            content=chunk_content,
-                            embedding=embedding,
-                            metadata={
-                                "doc_id": doc_id,
-                                "doc_name": file_name,
-                                "chunk_index": chunk_index,
-                            },
-                        )
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to generate embedding for chunk {chunk_id}: {e}"
-                        )
+                while True:
+                    # Parsing and chunking are blocking, so each batch is
+                    # pulled from the generator in a worker thread
+                    chunks = await asyncio.to_thread(
+                        list, itertools.islice(chunk_iter, self.CHUNK_WRITE_BATCH)
+                    )
+                    if not chunks:
+                        break
+                    await self._store_chunks(
+                        kb_id, doc_id, file_name, chunks, chunk_count
+                    )
+                    chunk_count += len(chunks)
 
             # Update chunk count
-            document.chunk_count = len(chunks)
+            document.chunk_count = chunk_count
             self.db.commit()
+            invalidate_index(kb_id)
 
             logger.info(
-                f"Document {doc_id} uploaded and processed with {len(chunks)} chunks"
+                f"Document {doc_id} uploaded and processed with {chunk_count} chunks"
             )
 
             return DocumentResponse(
@@ -163,7 +143,7 @@ class DocumentService:
                 name=file_name,
                 file_size=file_size,
                 file_type=document.file_type,
-                chunk_count=len(chunks),
+                chunk_count=chunk_count,
                 created_at=document.created_at,
             )
 
@@ -172,9 +152,145 @@ class DocumentService:
             logger.error(f"Error uploading document: {str(e)}")
             raise
 
+    async def _store_chunks(
+        self,
+        kb_id: str,
+        doc_id: str,
+        file_name: str,
+        chunks: List[str],
+        first_index: int,
+    ) -> None:
+        """
+        Insert chunk records and store their vectors.
+
+        Args:
+            kb_id: Knowledge base ID
+            doc_id: Document ID
+            file_name: Original file name
+            chunks: Chunk contents
+            first_index: chunk_index of the first chunk in the document
+        """
+        # Store all chunk records with one executemany INSERT
+        chunk_ids = [str(uuid.uuid4()) for _ in chunks]
+        Chunk.bulk_insert(
+            self.db,
+            [
+                {
+                    "id": chunk_id,
+                    "doc_id": doc_id,
+                    "kb_id": kb_id,
+                    "content": chunk_content,
+                    "chunk_index": chunk_index,
+                }
+                for chunk_index, (chunk_id, chunk_content) in enumerate(
+                    zip(chunk_ids, chunks), first_index
+                )
+            ],
+        )
+
+        # Generate embeddings in batches and store the vectors in one call
+        if self.embedding_provider:
+            embeddings = await self._embed_chunks(chunks, chunk_ids)
+            embedded = [
+                (chunk_index, chunk_id, chunk_content, embedding)
+                for chunk_index, (chunk_id, chunk_content, embedding) in enumerate(
+                    zip(chunk_ids, chunks, embeddings), first_index
+                )
+                if embedding is not None
+            ]
+            if embedded:
+                await self._store_vectors(
+                    kb_id,
+                    ids=[chunk_id for _, chunk_id, _, _ in embedded],
+                    documents=[content for _, _, content, _ in embedded],
+                    embeddings=[embedding for _, _, _, embedding in embedded],
+                    metadatas=[
+                        {
+                            "doc_id": doc_id,
+                            "doc_name": file_name,
+                            "chunk_index": chunk_index,
+                        }
+                        for chunk_index, _, _, _ in embedded
+                    ],
+                )
+
+    async def _embed_chunks(
+        self, chunks: List[str], chunk_ids: List[str]
+    ) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for chunks in batches.
+
+        Chunks are grouped by length so each batch is padded to a similar
+        size, and up to MAX_CONCURRENT_EMBEDDING_REQUESTS batches are in
+        flight at once. A batch that fails is retried chunk by chunk.
+
+        Args:
+            chunks: Chunk contents
+            chunk_ids: IDs of the chunks, in the same order
+
+        Returns:
+            Embeddings in chunk order; None where generation failed
+        """
+        batch_size = max(1, settings.embedding_batch_size)
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+        batches = [
+            order[start:start + batch_size]
+            for start in range(0, len(order), batch_size)
+        ]
+        embeddings: List[Optional[List[float]]] = [None] * len(chunks)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_EMBEDDING_REQUESTS)
+
+        async def embed_batch(batch: List[int]) -> None:
+            async with semaphore:
+                try:
+                    vectors = await self.embedding_provider.embed_texts(
+                        [chunks[i] for i in batch]
+                    )
+                    if len(vectors) != len(batch):
+                        raise ValueError(
+                            f"Expected {len(batch)} embeddings, got {len(vectors)}"
+                        )
+                    for i, vector in zip(batch, vectors):
+                        embeddings[i] = vector
+                    return
+                except Exception as e:
+                    logger.warning(
+                        f"Batch embedding failed, embedding chunks one by one: {e}"
+                    )
+
+                for i in batch:
+                    try:
+                        embeddings[i] = await self.embedding_provider.embed_text(
+                            chunks[i]
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"Failed to generate embedding for chunk {chunk_ids[i]}: {e}"
+                        )
+
+        await asyncio.gather(*(embed_batch(batch) for batch in batches))
+        return embeddings
+
+    def _ensure_collection(self, kb: KnowledgeBase) -> None:
+        """Create the knowledge base's vector collection if it does not exist yet."""
+        try:
+            if self.vector_store.get_collection(kb.id) is None:
+                self.vector_store.create_collection(kb.id, kb.name)
+        except Exception as e:
+            logger.warning(f"Failed to create vector collection for KB {kb.id}: {e}")
+
+    async def _store_vectors(self, kb_id: str, **kwargs) -> None:
+        """Store a batch of chunk vectors, logging instead of raising on failure."""
+        try:
+            await asyncio.to_thread(self.vector_store.add_documents, kb_id, **kwargs)
+        except Exception as e:
+            logger.warning(
+                f"Failed to store {len(kwargs['ids'])} vectors for KB {kb_id}: {e}"
+            )
+
     async def get_documents(
         self, kb_id: str, skip: int = 0, limit: int = 20
-    ) -> PaginatedResponse:
+    ) -> PaginatedResponse[DocumentResponse]:
         """
         Get documents in a knowledge base.
 
@@ -225,7 +341,7 @@ class DocumentService:
                 for doc in documents
             ]
 
-            return PaginatedResponse(
+            return PaginatedResponse[DocumentResponse](
                 items=doc_responses,
                 meta={
                     "total": total,
@@ -261,24 +377,35 @@ class DocumentService:
             if not document:
                 raise ValueError(f"Document not found: {doc_id}")
 
-            # Get all chunks for this document
-            chunks = self.db.query(Chunk).filter(Chunk.doc_id == doc_id).all()
+            # Get the IDs of all chunks for this document
+            chunk_ids = [
+                chunk_id
+                for (chunk_id,) in self.db.query(Chunk.id).filter(
+                    Chunk.doc_id == doc_id
+                )
+            ]
 
-            # Delete from vector store
-            for chunk in chunks:
+            # Delete from vector store in one call
+            if chunk_ids:
                 try:
-                    await self.vector_store.delete_vector(
-                        kb_id=kb_id, chunk_id=chunk.id
+                    await asyncio.to_thread(
+                        self.vector_store.delete_documents, kb_id, chunk_ids
                     )
                 except Exception as e:
-                    logger.warning(f"Failed to delete vector for chunk {chunk.id}: {e}")
+                    logger.warning(
+                        f"Failed to delete vectors for document {doc_id}: {e}"
+                    )
 
             # Delete chunks from database
-            self.db.query(Chunk).filter(Chunk.doc_id == doc_id).delete()
+            self.db.query(Chunk).filter(Chunk.doc_id == doc_id).delete(
+                synchronize_session=False
+            )
 
             # Delete document from database
             self.db.delete(document)
             self.db.commit()
+            invalidate_index(kb_id)
+            await asyncio.to_thread(invalidate_rerank_scores, chunk_ids)
 
             # Delete file if it exists
             if document.file_path and os.path.exists(document.file_path):
@@ -1,12 +1,16 @@
 """Knowledge Base management service."""
+import asyncio
 import uuid
+from datetime import datetime
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from models.orm import KnowledgeBase, Document
+from sqlalchemy.exc import IntegrityError
+from models.orm import KnowledgeBase, Chunk
 from models.schemas import KnowledgeBaseCreate, KnowledgeBaseUpdate, KnowledgeBaseResponse
 from exceptions import ResourceNotFoundError, ConflictError
 from logger import logger
+from services.search_service import invalidate_index, invalidate_rerank_scores
 
 
 class KnowledgeBaseService:
@@ -29,27 +33,34 @@ class KnowledgeBaseService:
         Raises:
             ConflictError: If knowledge base name already exists
         """
-        # Check if knowledge base name already exists
-        existing_kb = db.query(KnowledgeBase).filter_by(name=kb_create.name).first()
-        if existing_kb:
-            logger.warning(f"Knowledge base with name '{kb_create.name}' already exists")
-            raise ConflictError(f"Knowledge base with name '{kb_create.name}' already exists")
-        
-        # Create new knowledge base
+        # Create new knowledge base; every column is set here, so the
+        # response is built locally instead of reloading the row
         kb_id = f"kb_{uuid.uuid4().hex[:12]}"
+        now = datetime.utcnow()
         kb = KnowledgeBase(
             id=kb_id,
             name=kb_create.name,
-            description=kb_create.description
+            description=kb_create.description,
+            created_at=now,
+            updated_at=now,
+            document_count=0,
+            total_size=0
         )
+        response = KnowledgeBaseService._to_response(kb)
         
+        # The unique index on name rejects duplicates, so no existence check
+        # is queried first and concurrent creates cannot both succeed
         db.add(kb)
-        db.commit()
-        db.refresh(kb)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            logger.warning(f"Knowledge base with name '{kb_create.name}' already exists")
+            raise ConflictError(f"Knowledge base with name '{kb_create.name}' already exists")
         
         logger.info(f"Knowledge base created: {kb_id} - {kb_create.name}")
         
-        return KnowledgeBaseService._to_response(db, kb)
+        return response
     
     @staticmethod
     async def get_knowledge_bases(
@@ -67,13 +78,21 @@ class KnowledgeBaseService:
         Returns:
             Tuple of (list of KnowledgeBaseResponse, total count)
         """
-        # Get total count
-        total = db.query(func.count(KnowledgeBase.id)).scalar()
-        
-        # Get paginated results
-        kbs = db.query(KnowledgeBase).offset(skip).limit(limit).all()
+        # Page rows and the total count in one query, via a window count
+        # evaluated before OFFSET/LIMIT
+        rows = (
+            db.query(KnowledgeBase, func.count().over().label("total"))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        if rows:
+            total = rows[0].total
+        else:
+            # A page past the end has no row to carry the count
+            total = db.query(func.count(KnowledgeBase.id)).scalar()
         
-        responses = [KnowledgeBaseService._to_response(db, kb) for kb in kbs]
+        responses = [KnowledgeBaseService._to_response(kb) for kb, _ in rows]
         
         logger.info(f"Retrieved {len(responses)} knowledge bases (total: {total})")
         
@@ -101,7 +120,7 @@ class KnowledgeBaseService:
             logger.warning(f"Knowledge base not found: {kb_id}")
             raise ResourceNotFoundError(f"Knowledge base not found: {kb_id}")
         
-        return KnowledgeBaseService._to_response(db, kb)
+        return KnowledgeBaseService._to_response(kb)
     
     @staticmethod
     async def update_knowledge_base(
@@ -128,24 +147,30 @@ class KnowledgeBaseService:
             logger.warning(f"Knowledge base not found: {kb_id}")
             raise ResourceNotFoundError(f"Knowledge base not found: {kb_id}")
         
-        # Check if new name already exists (if name is being updated)
+        # Rename if a new name is given; a taken name fails the commit below
         if kb_update.name and kb_update.name != kb.name:
-            existing_kb = db.query(KnowledgeBase).filter_by(name=kb_update.name).first()
-            if existing_kb:
-                logger.warning(f"Knowledge base with name '{kb_update.name}' already exists")
-                raise ConflictError(f"Knowledge base with name '{kb_update.name}' already exists")
             kb.name = kb_update.name
         
         # Update description if provided
         if kb_update.description is not None:
             kb.description = kb_update.description
         
-        db.commit()
-        db.refresh(kb)
+        # Set updated_at here rather than by its server-side onupdate, so
+        # the response is built locally instead of reloading the row
+        if db.is_modified(kb):
+            kb.updated_at = datetime.utcnow()
+        response = KnowledgeBaseService._to_response(kb)
+        
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            logger.warning(f"Knowledge base with name '{kb_update.name}' already exists")
+            raise ConflictError(f"Knowledge base with name '{kb_update.name}' already exists")
         
         logger.info(f"Knowledge base updated: {kb_id}")
         
-        return KnowledgeBaseService._to_response(db, kb)
+        return response
     
     @staticmethod
     async def delete_knowledge_base(
@@ -166,35 +191,38 @@ class KnowledgeBaseService:
             logger.warning(f"Knowledge base not found: {kb_id}")
             raise ResourceNotFoundError(f"Knowledge base not found: {kb_id}")
         
+        chunk_ids = [
+            chunk_id
+            for (chunk_id,) in db.query(Chunk.id).filter(Chunk.kb_id == kb_id)
+        ]
+        
         # Delete knowledge base (cascade will delete documents and chunks)
         db.delete(kb)
         db.commit()
+        invalidate_index(kb_id)
+        await asyncio.to_thread(invalidate_rerank_scores, chunk_ids)
         
         logger.info(f"Knowledge base deleted: {kb_id}")
     
     @staticmethod
-    def _to_response(db: Session, kb: KnowledgeBase) -> KnowledgeBaseResponse:
+    def _to_response(kb: KnowledgeBase) -> KnowledgeBaseResponse:
         """Convert KnowledgeBase ORM to response schema.
         
+        Reads only attributes already loaded on the row and issues no queries.
+        
         Args:
-            db: Database session
             kb: KnowledgeBase ORM object
             
         Returns:
             KnowledgeBaseResponse
         """
-        # Calculate document count
-        doc_count = db.query(func.count(Document.id)).filter_by(kb_id=kb.id).scalar()
-        
-        # Calculate total size
-        total_size = db.query(func.sum(Document.file_size)).filter_by(kb_id=kb.id).scalar() or 0
-        
+        # Document stats are denormalized onto the knowledge base row
         return KnowledgeBaseResponse(
             id=kb.id,
             name=kb.name,
             description=kb.description,
-            document_count=doc_count,
-            total_size=total_size,
+            document_count=kb.document_count,
+            total_size=kb.total_size,
             created_at=kb.created_at,
             updated_at=kb.updated_at
         )
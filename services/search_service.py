@@ -1,17 +1,72 @@
 """Search service for RAG operations."""
 
+import asyncio
 import logging
-from typing import List, Optional
-from dataclasses import dataclass
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from dataclasses import dataclass, replace
+from operator import attrgetter
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from models.orm import KnowledgeBase, Chunk
+from config import settings
+from models.orm import KnowledgeBase, Chunk, Document
+from rag.agent_cache import AsyncTTLCache
 from rag.retriever import HybridRetriever, RetrievalResult
 from rag.reranker import Reranker
+from rag.scorer_cache import get_scorer_cache
+from rag.semantic_cache import SemanticCache
 from rag.query_rewriter import QueryRewriter
 
 logger = logging.getLogger(__name__)
 
+# Built retrievers keyed by (kb_id, embedding provider key), stored with the
+# index version they were built from and evicted least recently used first;
+# see SearchService._get_retriever
+_INDEX_CACHE: "OrderedDict[tuple, Tuple[tuple, HybridRetriever]]" = OrderedDict()
+# Locks held while an _INDEX_CACHE entry is being built, so concurrent cold
+# searches of one knowledge base share a single build
+_INDEX_LOCKS: Dict[tuple, asyncio.Lock] = {}
+
+# Search responses for near-duplicate queries, partitioned by
+# (kb_id, top_k, embedding provider key); off unless SEMANTIC_CACHE_SIZE is set,
+# since invalidation only reaches this process
+_SEMANTIC_CACHE = SemanticCache(
+    max_size=settings.semantic_cache_size,
+    ttl=settings.semantic_cache_ttl,
+    threshold=settings.semantic_cache_threshold,
+)
+
+# Query embeddings keyed by (embedding provider key, normalized query), shared
+# across services since providers are created per request
+_QUERY_EMBEDDING_CACHE = AsyncTTLCache(maxsize=1024, ttl=3600)
+
+
+def invalidate_index(kb_id: str) -> None:
+    """Drop a knowledge base's cached retriever and search responses after its chunks change."""
+    for key in [key for key in _INDEX_CACHE if key[0] == kb_id]:
+        del _INDEX_CACHE[key]
+    _SEMANTIC_CACHE.invalidate(lambda partition: partition[0] == kb_id)
+
+
+def _get_rerank_cache():
+    """Get the shared rerank score cache, or None when it is disabled."""
+    if not settings.rerank_cache_path:
+        return None
+    return get_scorer_cache(
+        settings.rerank_cache_path,
+        ttl=settings.rerank_cache_ttl,
+        max_entries=settings.rerank_cache_max_entries,
+    )
+
+
+def invalidate_rerank_scores(chunk_ids: List[str]) -> None:
+    """Drop cached rerank scores of deleted chunks."""
+    cache = _get_rerank_cache()
+    if cache is not None and chunk_ids:
+        cache.delete_chunks(chunk_ids)
+
 
 @dataclass
 class SearchResponse:
@@ -51,15 +106,189 @@ class SearchService:
         self.embedding_batch_size = embedding_batch_size
 
         self.hybrid_retriever = HybridRetriever(embedding_provider)
-        self.reranker = Reranker(reranker_provider)
+        self.reranker = Reranker(
+            reranker_provider,
+            cache=_get_rerank_cache(),
+        )
         self.query_rewriter = QueryRewriter(llm_provider)
 
+    def _provider_key(self) -> tuple:
+        """Identify the embedding space of this service's provider."""
+        provider = self.embedding_provider
+        return (
+            type(provider).__name__ if provider else None,
+            getattr(provider, "model", None),
+        )
+
+    async def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed query strings, reusing embeddings of recently seen queries.
+
+        Queries are matched exactly after stripping whitespace, since the
+        embedding is computed from that text and may depend on its case;
+        the ones not cached are embedded together in one provider call.
+
+        Args:
+            queries: Query strings
+
+        Returns:
+            One embedding per query
+
+        Raises:
+            Exception: If embedding generation fails
+        """
+        keys = [(*self._provider_key(), q.strip()) for q in queries]
+        embeddings = [_QUERY_EMBEDDING_CACHE.get(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            texts = [queries[i].strip() for i in missing]
+            if len(texts) == 1:
+                fresh = [await self.embedding_provider.embed_text(texts[0])]
+            else:
+                fresh = await self.embedding_provider.embed_texts(texts)
+            for i, embedding in zip(missing, fresh):
+                _QUERY_EMBEDDING_CACHE.set(keys[i], embedding)
+                embeddings[i] = embedding
+        return embeddings
+
+    async def _try_embed_query(self, query: str) -> Optional[List[float]]:
+        """Embed a query, returning None without a provider or on failure."""
+        if not self.embedding_provider:
+            return None
+        try:
+            [query_embedding] = await self._embed_queries([query])
+            return query_embedding
+        except Exception as e:
+            logger.warning(f"Failed to embed query: {e}")
+            return None
+
+    def _load_chunk_dicts(self, kb_id: str) -> List[Mapping[str, Any]]:
+        """
+        Load a knowledge base's chunks in retrieval format.
+
+        Document names come from the same query through a join, and only the
+        needed columns are selected, so no Chunk or Document objects are
+        built and no per-chunk lazy load is issued. The result rows are
+        returned as their read-only mapping views, so no dict is built per
+        chunk either.
+
+        Args:
+            kb_id: Knowledge base ID
+
+        Returns:
+            List of chunk mappings with 'id', 'content', 'doc_id', 'doc_name'
+        """
+        statement = (
+            select(
+                Chunk.id,
+                Chunk.content,
+                Chunk.doc_id,
+                func.coalesce(Document.name, "").label("doc_name"),
+            )
+            .outerjoin(Document, Chunk.doc_id == Document.id)
+            .where(Chunk.kb_id == kb_id)
+        )
+        return self.db.execute(statement).mappings().all()
+
+    async def _get_retriever(self, kb_id: str) -> Optional[HybridRetriever]:
+        """
+        Get a retriever indexed over a knowledge base's chunks.
+
+        The chunk count and newest chunk timestamp are read with one
+        aggregate query and compared against the cached index; the index is
+        only rebuilt when they differ, when the cache was invalidated or
+        evicted, or when none was built with this kind of embedding provider.
+        At most INDEX_CACHE_SIZE indexes are kept, and concurrent searches
+        needing the same index wait for one build. With BM25_CACHE_DIR set, a
+        rebuild loads the BM25 index saved for the same chunks, even from an
+        earlier process, instead of re-tokenizing them.
+
+        Args:
+            kb_id: Knowledge base ID
+
+        Returns:
+            The retriever, or None if the knowledge base has no chunks
+        """
+        chunk_count, last_created = (
+            self.db.query(func.count(Chunk.id), func.max(Chunk.created_at))
+            .filter(Chunk.kb_id == kb_id)
+            .one()
+        )
+        if not chunk_count:
+            invalidate_index(kb_id)
+            return None
+
+        key = (kb_id, *self._provider_key())
+        version = (chunk_count, last_created)
+        retriever = self._get_cached_retriever(key, version)
+        if retriever is None:
+            lock = _INDEX_LOCKS.setdefault(key, asyncio.Lock())
+            async with lock:
+                try:
+                    # A concurrent search may have built it while we waited
+                    retriever = self._get_cached_retriever(key, version)
+                    if retriever is None:
+                        retriever = await self._build_retriever(kb_id)
+                        if retriever is None:
+                            return None
+                        _INDEX_CACHE[key] = (version, retriever)
+                        _INDEX_CACHE.move_to_end(key)
+                        while len(_INDEX_CACHE) > settings.index_cache_size:
+                            _INDEX_CACHE.popitem(last=False)
+                finally:
+                    # Waiters already hold this lock; later searches hit the cache
+                    if _INDEX_LOCKS.get(key) is lock:
+                        del _INDEX_LOCKS[key]
+
+        self.hybrid_retriever = retriever
+        return retriever
+
+    def _get_cached_retriever(
+        self, key: tuple, version: tuple
+    ) -> Optional[HybridRetriever]:
+        """Get the cached retriever for key if it was built from version."""
+        cached = _INDEX_CACHE.get(key)
+        if not cached or cached[0] != version:
+            return None
+        _INDEX_CACHE.move_to_end(key)
+        # Providers are created per request, so queries are embedded with
+        # this service's one; the cached retriever is shared
+        return cached[1].with_embedding_provider(self.embedding_provider)
+
+    async def _build_retriever(self, kb_id: str) -> Optional[HybridRetriever]:
+        """Build a retriever over a knowledge base's chunks, or None if it has none."""
+        chunk_dicts = self._load_chunk_dicts(kb_id)
+        if not chunk_dicts:
+            return None
+
+        retriever = HybridRetriever(self.embedding_provider)
+        # Build index (with reduced batch size and text length to avoid 413 errors)
+        await retriever.build_index(
+            chunk_dicts,
+            batch_size=self.embedding_batch_size,
+            max_chars_per_text=500,  # Reduce to avoid API limits
+            bm25_cache_path=(
+                os.path.join(settings.bm25_cache_dir, f"{kb_id}.npz")
+                if settings.bm25_cache_dir
+                else None
+            ),
+            build_vectors=self.embedding_provider is not None,
+        )
+        return retriever
+
     async def search(
         self, kb_id: str, query: str, top_k: int = 5
     ) -> SearchResponse:
         """
         Execute basic search.
 
+        With an embedding provider, the query is embedded once up front,
+        while the knowledge base's index is fetched. When the semantic cache
+        is enabled (SEMANTIC_CACHE_SIZE > 0), the embedding is looked up in
+        it before the index is fetched, so a near-duplicate of a recent
+        query returns its response without building the index, retrieval or
+        reranking.
+
         Args:
             kb_id: Knowledge base ID
             query: Query string
@@ -81,33 +310,34 @@ class SearchService:
             raise ValueError(f"Knowledge base not found: {kb_id}")
 
         try:
-            # Get chunks for this knowledge base
-            chunks = self.db.query(Chunk).filter(Chunk.kb_id == kb_id).all()
-            if not chunks:
+            partition = None
+            if self.embedding_provider and settings.semantic_cache_size > 0:
+                # A cache hit needs only the query embedding, not the index
+                query_embedding = await self._try_embed_query(query)
+                if query_embedding is not None:
+                    partition = (kb_id, top_k, *self._provider_key())
+                    cached = _SEMANTIC_CACHE.get(partition, query_embedding)
+                    if cached is not None:
+                        logger.info(f"Semantic cache hit for query: {query}")
+                        return replace(
+                            cached, query=query, results=list(cached.results)
+                        )
+                retriever = await self._get_retriever(kb_id)
+            else:
+                # Embed the query while the index for this knowledge base is fetched
+                query_embedding, retriever = await asyncio.gather(
+                    self._try_embed_query(query), self._get_retriever(kb_id)
+                )
+            if retriever is None:
                 logger.warning(f"No chunks found in knowledge base {kb_id}")
                 return SearchResponse(query=query, results=[], total_count=0)
 
-            # Convert chunks to retrieval format
-            chunk_dicts = [
-                {
-                    "id": chunk.id,
-                    "content": chunk.content,
-                    "doc_id": chunk.doc_id,
-                    "doc_name": chunk.document.name if chunk.document else "",
-                }
-                for chunk in chunks
-            ]
-
-            # Build index (with reduced batch size and text length to avoid 413 errors)
-            await self.hybrid_retriever.build_index(
-                chunk_dicts,
-                batch_size=self.embedding_batch_size,
-                max_chars_per_text=500  # Reduce to avoid API limits
-            )
-
             # Retrieve results
-            results = await self.hybrid_retriever.retrieve(
-                query, top_k=top_k * 2, use_vector=bool(self.embedding_provider)
+            results = await retriever.retrieve(
+                query,
+                top_k=top_k * 2,
+                use_vector=bool(self.embedding_provider),
+                query_embedding=query_embedding,
             )
 
             # Rerank results
@@ -117,11 +347,14 @@ class SearchService:
 
             logger.info(f"Search completed: {len(reranked_results)} results")
 
-            return SearchResponse(
+            response = SearchResponse(
                 query=query,
                 results=reranked_results,
                 total_count=len(reranked_results),
             )
+            if partition is not None:
+                _SEMANTIC_CACHE.put(partition, query_embedding, response)
+            return response
 
         except Exception as e:
             logger.error(f"Error searching: {str(e)}")
@@ -154,12 +387,12 @@ class SearchService:
             raise ValueError(f"Knowledge base not found: {kb_id}")
 
         try:
-            # Rewrite query
-            rewrite_result = await self.query_rewriter.rewrite_with_fallback(query)
-
-            # Get chunks for this knowledge base
-            chunks = self.db.query(Chunk).filter(Chunk.kb_id == kb_id).all()
-            if not chunks:
+            # Rewrite the query while the index for this knowledge base is fetched
+            rewrite_result, retriever = await asyncio.gather(
+                self.query_rewriter.rewrite_with_fallback(query),
+                self._get_retriever(kb_id),
+            )
+            if retriever is None:
                 logger.warning(f"No chunks found in knowledge base {kb_id}")
                 return SearchResponse(
                     query=query,
@@ -168,44 +401,34 @@ class SearchService:
                     rewritten_query=query,
                 )
 
-            # Convert chunks to retrieval format
-            chunk_dicts = [
-                {
-                    "id": chunk.id,
-                    "content": chunk.content,
-                    "doc_id": chunk.doc_id,
-                    "doc_name": chunk.document.name if chunk.document else "",
-                }
-                for chunk in chunks
-            ]
-
-            # Build index (with reduced batch size and text length to avoid 413 errors)
-            await self.hybrid_retriever.build_index(
-                chunk_dicts,
-                batch_size=self.embedding_batch_size,
-                max_chars_per_text=500  # Reduce to avoid API limits
-            )
-
-            # Search with all rewritten queries
-            all_results = []
-            for rewritten_query in rewrite_result.rewritten_queries:
+            # Search with all rewritten queries, embedding them in one call
+            queries = [q for q in rewrite_result.rewritten_queries if q and q.strip()]
+            query_embeddings = None
+            if self.embedding_provider and queries:
                 try:
-                    results = await self.hybrid_retriever.retrieve(
-                        rewritten_query,
-                        top_k=top_k * 2,
-                        use_vector=bool(self.embedding_provider),
-                    )
-                    all_results.extend(results)
+                    query_embeddings = await self._embed_queries(queries)
                 except Exception as e:
-                    logger.warning(f"Error retrieving with query '{rewritten_query}': {e}")
-
-            # Deduplicate results by chunk_id
-            seen = set()
-            unique_results = []
-            for result in all_results:
-                if result.chunk_id not in seen:
-                    seen.add(result.chunk_id)
-                    unique_results.append(result)
+                    logger.warning(f"Failed to embed rewritten queries: {e}")
+            all_results = []
+            try:
+                for results in await retriever.retrieve_batch(
+                    queries,
+                    top_k=top_k * 2,
+                    use_vector=bool(self.embedding_provider),
+                    query_embeddings=query_embeddings,
+                ):
+                    all_results.extend(results)
+            except Exception as e:
+                logger.warning(f"Error retrieving with rewritten queries {queries}: {e}")
+
+            # Deduplicate results by chunk_id, keeping each chunk's best
+            # scoring result; in ascending order the best is assigned last
+            best = {
+                r.chunk_id: r for r in sorted(all_results, key=attrgetter("score"))
+            }
+            unique_results = sorted(
+                best.values(), key=attrgetter("score"), reverse=True
+            )
 
             # Rerank results
             reranked_results = await self.reranker.rerank_with_fallback(
@@ -4,9 +4,28 @@ import os
 import sys
 from pathlib import Path
 
+from hypothesis import HealthCheck, settings
+from hypothesis.database import DirectoryBasedExampleDatabase
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Property tests replay examples saved by earlier runs before drawing new
+# ones; HYPOTHESIS_DB points the database at a directory CI can cache
+settings.register_profile(
+    "ci",
+    database=DirectoryBasedExampleDatabase(
+        os.environ.get("HYPOTHESIS_DB", ".hypothesis/examples")
+    ),
+    max_examples=100,
+    deadline=None,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+# Local runs keep Hypothesis' defaults; CI, or HYPOTHESIS_PROFILE, opts in
+_profile = os.environ.get("HYPOTHESIS_PROFILE") or ("ci" if os.environ.get("CI") else None)
+if _profile:
+    settings.load_profile(_profile)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_env():
@@ -32,6 +51,23 @@ def setup_test_env():
         test_db.unlink()
 
 
+@pytest.fixture(scope="session")
+def db_engine():
+    """Shared database engine for the whole test session."""
+    # The database tests and the application import the top-level module;
+    # RagDocMan.database would be a second module with its own engine
+    from database import engine
+
+    yield engine
+
+
+@pytest.fixture
+def db_conn(db_engine):
+    """Connection from the shared engine, closed after the test."""
+    with db_engine.connect() as connection:
+        yield connection
+
+
 @pytest.fixture
 def temp_env_file(tmp_path):
     """Create a temporary .env file."""
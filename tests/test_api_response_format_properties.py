@@ -15,9 +15,9 @@ from main import create_app
 from typing import Dict, Any
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def client():
-    """Create test client."""
+    """Create one test client shared by every test in this module."""
     app = create_app()
     return TestClient(app=app)
 
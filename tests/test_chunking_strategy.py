@@ -4,12 +4,17 @@ import pytest
 from RagDocMan.rag.chunking_strategy import ChunkingStrategy
 
 
+@pytest.fixture(scope="module")
+def strategy():
+    """Shared strategy with chunk_size=100 and chunk_overlap=20."""
+    return ChunkingStrategy(chunk_size=100, chunk_overlap=20)
+
+
 class TestChunkingStrategyBasic:
     """Test basic chunking functionality."""
 
-    def test_chunk_text_basic(self):
+    def test_chunk_text_basic(self, strategy):
         """Test basic text chunking."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "This is a test. " * 20  # Create text longer than chunk size
 
         chunks = strategy.chunk_text(text)
@@ -39,9 +44,8 @@ class TestChunkingStrategyBasic:
         for chunk in chunks:
             assert len(chunk) <= chunk_size + 50  # Allow some tolerance for word boundaries
 
-    def test_chunk_overlap_preserved(self):
+    def test_chunk_overlap_preserved(self, strategy):
         """Test that chunk overlap is preserved."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "This is a test sentence. " * 20
 
         chunks = strategy.chunk_text(text)
@@ -62,18 +66,16 @@ class TestChunkingStrategyBasic:
         assert len(chunks) == 1
         assert chunks[0] == text
 
-    def test_chunk_text_with_newlines(self):
+    def test_chunk_text_with_newlines(self, strategy):
         """Test chunking text with newlines."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "Line 1\n" * 50
 
         chunks = strategy.chunk_text(text)
         assert len(chunks) > 0
         assert all(isinstance(chunk, str) for chunk in chunks)
 
-    def test_chunk_text_with_special_characters(self):
+    def test_chunk_text_with_special_characters(self, strategy):
         """Test chunking text with special characters."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "Special chars: !@#$%^&*() " * 20
 
         chunks = strategy.chunk_text(text)
@@ -82,9 +84,8 @@ class TestChunkingStrategyBasic:
         full_text = "".join(chunks)
         assert "!@#$%^&*()" in full_text
 
-    def test_chunk_text_with_unicode(self):
+    def test_chunk_text_with_unicode(self, strategy):
         """Test chunking text with unicode characters."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "Hello 世界 🌍 " * 20
 
         chunks = strategy.chunk_text(text)
@@ -97,9 +98,8 @@ class TestChunkingStrategyBasic:
 class TestChunkingStrategyMetadata:
     """Test chunking with metadata."""
 
-    def test_chunk_text_with_metadata(self):
+    def test_chunk_text_with_metadata(self, strategy):
         """Test chunking text with metadata."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "This is a test. " * 20
         metadata = {"source": "test.txt", "author": "test"}
 
@@ -109,18 +109,16 @@ class TestChunkingStrategyMetadata:
         assert all("content" in chunk for chunk in chunks_with_meta)
         assert all("metadata" in chunk for chunk in chunks_with_meta)
 
-    def test_chunk_metadata_includes_index(self):
+    def test_chunk_metadata_includes_index(self, strategy):
         """Test that chunk metadata includes chunk index."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "This is a test. " * 20
 
         chunks_with_meta = strategy.chunk_text_with_metadata(text)
         for i, chunk in enumerate(chunks_with_meta):
             assert chunk["metadata"]["chunk_index"] == i
 
-    def test_chunk_metadata_preserves_custom_metadata(self):
+    def test_chunk_metadata_preserves_custom_metadata(self, strategy):
         """Test that custom metadata is preserved."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "This is a test. " * 20
         metadata = {"source": "test.txt", "author": "test"}
 
@@ -129,9 +127,8 @@ class TestChunkingStrategyMetadata:
             assert chunk["metadata"]["source"] == "test.txt"
             assert chunk["metadata"]["author"] == "test"
 
-    def test_chunk_metadata_without_custom_metadata(self):
+    def test_chunk_metadata_without_custom_metadata(self, strategy):
         """Test chunking with metadata but no custom metadata."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "This is a test. " * 20
 
         chunks_with_meta = strategy.chunk_text_with_metadata(text)
@@ -176,13 +173,81 @@ class TestChunkingStrategyConfiguration:
         chunks = strategy.chunk_text(text)
         assert len(chunks) > 0
 
+    def test_overlap_larger_than_chunk_size_raises_error(self):
+        """Test overlap larger than chunk size is rejected."""
+        with pytest.raises(ValueError, match="larger chunk overlap"):
+            ChunkingStrategy(chunk_size=50, chunk_overlap=60)
+
+    def test_separators_without_empty_fallback(self):
+        """Test separator lists without "" still chunk text."""
+        strategy = ChunkingStrategy(
+            chunk_size=50, chunk_overlap=0, separators=["\n\n", "\n"]
+        )
+        text = "Line of text\n" * 20
+
+        chunks = strategy.chunk_text(text)
+        assert len(chunks) > 1
+        assert all("Line of text" in chunk for chunk in chunks)
+
+    def test_splitter_shared_between_strategies(self):
+        """Test strategies with the same configuration share one splitter."""
+        first = ChunkingStrategy(
+            chunk_size=50, chunk_overlap=0, separators=["\n\n", "\n"]
+        )
+        second = ChunkingStrategy(
+            chunk_size=50, chunk_overlap=0, separators=["\n\n", "\n"]
+        )
+        other = ChunkingStrategy(
+            chunk_size=60, chunk_overlap=0, separators=["\n\n", "\n"]
+        )
+
+        assert first._splitter is second._splitter
+        assert other._splitter is not first._splitter
+
+
+class TestChunkingStrategyBalanced:
+    """Test balanced chunking."""
+
+    def test_balanced_avoids_short_last_chunk(self):
+        """Test balancing spreads the text evenly over the same chunk count."""
+        text = "word " * 41
+
+        plain = ChunkingStrategy(chunk_size=100, chunk_overlap=0).chunk_text(text)
+        balanced = ChunkingStrategy(
+            chunk_size=100, chunk_overlap=0, balanced=True
+        ).chunk_text(text)
+
+        assert [len(chunk) for chunk in plain] == [99, 94, 9]
+        assert [len(chunk) for chunk in balanced] == [69, 69, 64]
+        assert " ".join(balanced).split() == text.split()
+
+    def test_balanced_keeps_overlap_and_size_limit(self):
+        """Test balanced chunks stay within chunk_size and still overlap."""
+        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20, balanced=True)
+        text = "alpha beta gamma delta " * 20
+
+        chunks = strategy.chunk_text(text)
+        assert len(chunks) <= len(
+            ChunkingStrategy(chunk_size=100, chunk_overlap=20).chunk_text(text)
+        )
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        for prev, curr in zip(chunks, chunks[1:]):
+            assert curr.split()[0] in prev.split()
+
+    def test_balanced_chunk_iter_matches_chunk_text(self):
+        """Test streaming a balanced strategy gives the same chunks."""
+        strategy = ChunkingStrategy(chunk_size=20, chunk_overlap=5, balanced=True)
+        text = "alpha beta\n\ngamma delta epsilon " * 30
+        segments = [text[i:i + 37] for i in range(0, len(text), 37)]
+
+        assert list(strategy.chunk_iter(segments)) == strategy.chunk_text(text)
+
 
 class TestChunkingStrategyEdgeCases:
     """Test edge cases for chunking strategy."""
 
-    def test_chunk_single_word(self):
+    def test_chunk_single_word(self, strategy):
         """Test chunking single word."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "word"
 
         chunks = strategy.chunk_text(text)
@@ -197,9 +262,40 @@ class TestChunkingStrategyEdgeCases:
         chunks = strategy.chunk_text(text)
         assert len(chunks) > 0
 
-    def test_chunk_repeated_text(self):
+    def test_chunks_never_exceed_chunk_size(self):
+        """Test every chunk fits in chunk_size, including hard cuts."""
+        strategy = ChunkingStrategy(chunk_size=50, chunk_overlap=10)
+        text = "a" * 120 + " " + "word " * 40 + "\n\n" + "b" * 75
+
+        chunks = strategy.chunk_text(text)
+        assert all(0 < len(chunk) <= 50 for chunk in chunks)
+
+    def test_overlap_starts_on_word_boundary(self, strategy):
+        """Test overlapping chunks start on a separator boundary."""
+        text = "alpha beta gamma delta " * 20
+
+        chunks = strategy.chunk_text(text)
+        words = {"alpha", "beta", "gamma", "delta"}
+        for chunk in chunks:
+            assert chunk.split()[0] in words
+            assert chunk.split()[-1] in words
+
+    def test_chunk_iter_matches_chunk_text(self):
+        """Test chunking segments matches chunking the joined text."""
+        strategy = ChunkingStrategy(chunk_size=20, chunk_overlap=5)
+        text = "alpha beta\n\ngamma delta epsilon " * 30
+        segments = [text[i:i + 37] for i in range(0, len(text), 37)]
+
+        assert list(strategy.chunk_iter(segments)) == strategy.chunk_text(text)
+
+    def test_chunk_iter_empty_raises_error(self):
+        """Test chunking only blank segments raises an error."""
+        strategy = ChunkingStrategy(chunk_size=20, chunk_overlap=5)
+        with pytest.raises(ValueError, match="Text cannot be empty"):
+            list(strategy.chunk_iter(["  ", "\n"]))
+
+    def test_chunk_repeated_text(self, strategy):
         """Test chunking repeated text."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = "test " * 100
 
         chunks = strategy.chunk_text(text)
@@ -207,9 +303,8 @@ class TestChunkingStrategyEdgeCases:
         # Verify all chunks are non-empty
         assert all(len(chunk) > 0 for chunk in chunks)
 
-    def test_chunk_mixed_content(self):
+    def test_chunk_mixed_content(self, strategy):
         """Test chunking mixed content."""
-        strategy = ChunkingStrategy(chunk_size=100, chunk_overlap=20)
         text = """
         # Title
         
@@ -224,3 +319,37 @@ class TestChunkingStrategyEdgeCases:
         chunks = strategy.chunk_text(text)
         assert len(chunks) > 0
         assert all(isinstance(chunk, str) for chunk in chunks)
+
+
+class TestChunkingStrategyOffsets:
+    """Test offset-based chunking."""
+
+    def test_chunk_offsets_match_chunk_text(self, strategy):
+        """Test offsets slice out the same chunks as chunk_text."""
+        text = "This is a test sentence. " * 20
+
+        offsets = strategy.chunk_offsets(text)
+        assert [text[start:end] for start, end in offsets] == strategy.chunk_text(text)
+
+    def test_chunk_offsets_with_fallback_splitter(self):
+        """Test offsets are recovered when the LangChain fallback is used."""
+        strategy = ChunkingStrategy(
+            chunk_size=50, chunk_overlap=10, separators=["\n\n", "\n"]
+        )
+        text = "Line of text\n" * 20
+
+        offsets = strategy.chunk_offsets(text)
+        assert [text[start:end] for start, end in offsets] == strategy.chunk_text(text)
+
+    def test_chunk_offsets_empty_raises_error(self):
+        """Test offsets for empty text raise error."""
+        strategy = ChunkingStrategy()
+        with pytest.raises(ValueError, match="Text cannot be empty"):
+            strategy.chunk_offsets("   ")
+
+    def test_chunk_text_with_metadata_includes_offsets(self, strategy):
+        """Test chunks with metadata carry their source offsets."""
+        text = "This is a test. " * 20
+
+        for chunk in strategy.chunk_text_with_metadata(text):
+            assert text[chunk["start"]:chunk["end"]] == chunk["content"]
@@ -7,6 +7,10 @@ This module tests configuration management properties using hypothesis:
 - Property 20: Sensitive Information Protection - System does not output sensitive info in logs
 """
 
+import importlib
+import logging
+from contextlib import contextmanager
+
 import pytest
 from hypothesis import given, strategies as st, settings, HealthCheck, Phase
 from typing import Dict, Any
@@ -24,6 +28,61 @@ from core.reranker_provider import RerankerProviderFactory, SiliconFlowRerankerP
 from logger import mask_sensitive_info
 
 
+# Any non-blank API key of up to 50 characters, built around one character
+# that is never whitespace so no example has to be filtered out
+API_KEYS = st.tuples(
+    st.text(max_size=24),
+    st.characters(blacklist_categories=("Zs", "Zl", "Zp", "Cc")),
+    st.text(max_size=25),
+).map("".join)
+
+# Settings are read from the environment once; examples copy this instance
+# with their fields overridden instead of re-running pydantic validation
+_BASE_SETTINGS = Settings()
+
+
+def _settings_with(**fields) -> Settings:
+    """Copy the base settings with fields replaced, skipping validation."""
+    return _BASE_SETTINGS.model_copy(update=fields)
+
+
+class _MessageSink(logging.Handler):
+    """Collects the formatted messages of the records it handles."""
+
+    def __init__(self):
+        super().__init__(level=logging.INFO)
+        self.messages = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@contextmanager
+def _logged_messages(module: str):
+    """Capture INFO-and-above messages logged to a module's logger."""
+    target = importlib.import_module(module).logger
+    sink = _MessageSink()
+    level = target.level
+    target.addHandler(sink)
+    target.setLevel(logging.INFO)
+    try:
+        yield sink.messages
+    finally:
+        target.removeHandler(sink)
+        target.setLevel(level)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _no_http_clients():
+    """Stub out the HTTP client every provider builds on construction.
+
+    Nothing here sends requests, and building a real httpx.AsyncClient loads
+    the TLS trust store, which dominates each example's runtime.
+    """
+    with patch("httpx.AsyncClient"):
+        yield
+
+
 # ============================================================================
 # Property 7: Configuration Validity Tests
 # ============================================================================
@@ -32,10 +91,15 @@ class TestConfigurationValidity:
     """Test configuration validity validation."""
 
     @given(
-        api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""),
+        api_key=API_KEYS,
         provider_type=st.sampled_from(["siliconflow", "SiliconFlow", "SILICONFLOW"])
     )
-    @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @settings(
+        max_examples=20,
+        phases=(Phase.explicit, Phase.reuse, Phase.generate),
+        deadline=None,
+        suppress_health_check=[HealthCheck.too_slow],
+    )
     def test_valid_llm_provider_creation(self, api_key: str, provider_type: str):
         """
         Property: For any valid API key and provider type, LLM provider creation should succeed.
@@ -62,7 +126,7 @@ class TestConfigurationValidity:
             LLMProviderFactory.create_provider(provider_type, api_key)
 
     @given(
-        api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""),
+        api_key=API_KEYS,
         provider_type=st.text(min_size=1, max_size=20).filter(lambda x: x.lower() not in ["siliconflow"])
     )
     @settings(max_examples=50, deadline=None, suppress_health_check=[HealthCheck.too_slow])
@@ -76,10 +140,15 @@ class TestConfigurationValidity:
             LLMProviderFactory.create_provider(provider_type, api_key)
 
     @given(
-        api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""),
+        api_key=API_KEYS,
         model=st.sampled_from(["BAAI/bge-large-zh-v1.5", "BAAI/bge-base-zh-v1.5", "BAAI/bge-small-zh-v1.5"])
     )
-    @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @settings(
+        max_examples=20,
+        phases=(Phase.explicit, Phase.reuse, Phase.generate),
+        deadline=None,
+        suppress_health_check=[HealthCheck.too_slow],
+    )
     def test_valid_embedding_provider_creation(self, api_key: str, model: str):
         """
         Property: For any valid API key and embedding model, provider creation should succeed.
@@ -107,7 +176,7 @@ class TestConfigurationValidity:
             EmbeddingProviderFactory.create_provider("siliconflow", api_key, model=model)
 
     @given(
-        api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""),
+        api_key=API_KEYS,
         model=st.text(min_size=1, max_size=30).filter(lambda x: x not in [
             "BAAI/bge-large-zh-v1.5", "BAAI/bge-base-zh-v1.5", "BAAI/bge-small-zh-v1.5"
         ])
@@ -123,10 +192,15 @@ class TestConfigurationValidity:
             EmbeddingProviderFactory.create_provider("siliconflow", api_key, model=model)
 
     @given(
-        api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""),
+        api_key=API_KEYS,
         model=st.sampled_from(["BAAI/bge-reranker-large", "BAAI/bge-reranker-base"])
     )
-    @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @settings(
+        max_examples=20,
+        phases=(Phase.explicit, Phase.reuse, Phase.generate),
+        deadline=None,
+        suppress_health_check=[HealthCheck.too_slow],
+    )
     def test_valid_reranker_provider_creation(self, api_key: str, model: str):
         """
         Property: For any valid API key and reranker model, provider creation should succeed.
@@ -167,7 +241,7 @@ class TestConfigurationValidity:
         
         **Validates: Requirements 14.1, 14.2**
         """
-        settings_obj = Settings(
+        settings_obj = _settings_with(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
             retrieval_top_k=retrieval_top_k,
@@ -177,51 +251,51 @@ class TestConfigurationValidity:
         assert settings_obj.chunk_size == chunk_size
         assert settings_obj.chunk_overlap == chunk_overlap
 
-    @given(chunk_size=st.integers(max_value=0))
-    @settings(max_examples=50, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(chunk_size=st.integers(min_value=-1000, max_value=0))
+    @settings(max_examples=20, deadline=None, suppress_health_check=[HealthCheck.too_slow])
     def test_invalid_chunk_size_rejected(self, chunk_size: int):
         """
         Property: For any invalid chunk size (<=0), validation should fail.
         
         **Validates: Requirements 14.2**
         """
-        settings_obj = Settings(chunk_size=chunk_size)
+        settings_obj = _settings_with(chunk_size=chunk_size)
         with pytest.raises(ValueError, match="CHUNK_SIZE must be greater than 0"):
             settings_obj.validate_config()
 
-    @given(chunk_overlap=st.integers(max_value=-1))
-    @settings(max_examples=50, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(chunk_overlap=st.integers(min_value=-1000, max_value=-1))
+    @settings(max_examples=20, deadline=None, suppress_health_check=[HealthCheck.too_slow])
     def test_invalid_chunk_overlap_rejected(self, chunk_overlap: int):
         """
         Property: For any invalid chunk overlap (<0), validation should fail.
         
         **Validates: Requirements 14.2**
         """
-        settings_obj = Settings(chunk_overlap=chunk_overlap)
+        settings_obj = _settings_with(chunk_overlap=chunk_overlap)
         with pytest.raises(ValueError, match="CHUNK_OVERLAP must be non-negative"):
             settings_obj.validate_config()
 
-    @given(retrieval_top_k=st.integers(max_value=0))
-    @settings(max_examples=50, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(retrieval_top_k=st.integers(min_value=-1000, max_value=0))
+    @settings(max_examples=20, deadline=None, suppress_health_check=[HealthCheck.too_slow])
     def test_invalid_retrieval_top_k_rejected(self, retrieval_top_k: int):
         """
         Property: For any invalid retrieval_top_k (<=0), validation should fail.
         
         **Validates: Requirements 14.2**
         """
-        settings_obj = Settings(retrieval_top_k=retrieval_top_k)
+        settings_obj = _settings_with(retrieval_top_k=retrieval_top_k)
         with pytest.raises(ValueError, match="RETRIEVAL_TOP_K must be greater than 0"):
             settings_obj.validate_config()
 
-    @given(reranking_top_k=st.integers(max_value=0))
-    @settings(max_examples=50, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(reranking_top_k=st.integers(min_value=-1000, max_value=0))
+    @settings(max_examples=20, deadline=None, suppress_health_check=[HealthCheck.too_slow])
     def test_invalid_reranking_top_k_rejected(self, reranking_top_k: int):
         """
         Property: For any invalid reranking_top_k (<=0), validation should fail.
         
         **Validates: Requirements 14.2**
         """
-        settings_obj = Settings(reranking_top_k=reranking_top_k)
+        settings_obj = _settings_with(reranking_top_k=reranking_top_k)
         with pytest.raises(ValueError, match="RERANKING_TOP_K must be greater than 0"):
             settings_obj.validate_config()
 
@@ -255,7 +329,7 @@ class TestSensitiveInformationProtection:
             assert "sk-" not in masked or "***" in masked
             assert "ghp_" not in masked or "***" in masked
 
-    @given(api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""))
+    @given(api_key=API_KEYS)
     @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
     def test_api_key_not_logged_in_provider_creation(self, api_key: str):
         """
@@ -264,16 +338,14 @@ class TestSensitiveInformationProtection:
         
         **Validates: Requirements 14.3**
         """
-        with patch("core.llm_provider.logger") as mock_logger:
+        with _logged_messages("core.llm_provider") as messages:
             provider = LLMProviderFactory.create_provider("siliconflow", api_key)
-            for call in mock_logger.method_calls:
-                if call[0] in ["error", "warning", "info"]:
-                    message = str(call[1])
-                    if api_key in message:
-                        assert "***" in message or api_key.startswith("***")
+        for message in messages:
+            if api_key in message:
+                assert "***" in message or api_key.startswith("***")
 
     @given(
-        api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""),
+        api_key=API_KEYS,
         model=st.sampled_from(["BAAI/bge-large-zh-v1.5", "BAAI/bge-base-zh-v1.5"])
     )
     @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
@@ -284,16 +356,14 @@ class TestSensitiveInformationProtection:
         
         **Validates: Requirements 14.3**
         """
-        with patch("core.embedding_provider.logger") as mock_logger:
+        with _logged_messages("core.embedding_provider") as messages:
             provider = EmbeddingProviderFactory.create_provider("siliconflow", api_key, model=model)
-            for call in mock_logger.method_calls:
-                if call[0] in ["error", "warning", "info"]:
-                    message = str(call[1])
-                    if api_key in message:
-                        assert "***" in message or api_key.startswith("***")
+        for message in messages:
+            if api_key in message:
+                assert "***" in message or api_key.startswith("***")
 
     @given(
-        api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""),
+        api_key=API_KEYS,
         model=st.sampled_from(["BAAI/bge-reranker-large", "BAAI/bge-reranker-base"])
     )
     @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
@@ -304,13 +374,11 @@ class TestSensitiveInformationProtection:
         
         **Validates: Requirements 14.3**
         """
-        with patch("core.reranker_provider.logger") as mock_logger:
+        with _logged_messages("core.reranker_provider") as messages:
             provider = RerankerProviderFactory.create_provider("siliconflow", api_key, model=model)
-            for call in mock_logger.method_calls:
-                if call[0] in ["error", "warning", "info"]:
-                    message = str(call[1])
-                    if api_key in message:
-                        assert "***" in message or api_key.startswith("***")
+        for message in messages:
+            if api_key in message:
+                assert "***" in message or api_key.startswith("***")
 
     @given(message=st.text(min_size=1, max_size=200))
     @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
@@ -326,7 +394,7 @@ class TestSensitiveInformationProtection:
         masked = mask_sensitive_info(message)
         assert masked == message
 
-    @given(api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""))
+    @given(api_key=API_KEYS)
     @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
     def test_configuration_with_api_key_validation(self, api_key: str):
         """
@@ -335,7 +403,7 @@ class TestSensitiveInformationProtection:
         
         **Validates: Requirements 7.1, 7.2, 8.1, 8.2, 9.1, 9.2, 14.1, 14.2, 14.3**
         """
-        settings_obj = Settings(
+        settings_obj = _settings_with(
             llm_api_key=api_key,
             embedding_api_key=api_key,
             reranker_api_key=api_key,
@@ -357,14 +425,14 @@ class TestConfigurationChangesValidation:
         old_chunk_size=st.integers(min_value=1, max_value=5000),
         new_chunk_size=st.integers(min_value=1, max_value=5000),
     )
-    @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @settings(max_examples=25)
     def test_chunk_size_change_validation(self, old_chunk_size: int, new_chunk_size: int):
         """
         Property: For any valid chunk size changes, validation should succeed.
         
         **Validates: Requirements 14.2**
         """
-        settings_obj = Settings(chunk_size=old_chunk_size)
+        settings_obj = _settings_with(chunk_size=old_chunk_size)
         settings_obj.validate_config()
         settings_obj.chunk_size = new_chunk_size
         settings_obj.validate_config()
@@ -374,24 +442,23 @@ class TestConfigurationChangesValidation:
         old_overlap=st.integers(min_value=0, max_value=2000),
         new_overlap=st.integers(min_value=0, max_value=2000),
     )
-    @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @settings(max_examples=25)
     def test_chunk_overlap_change_validation(self, old_overlap: int, new_overlap: int):
         """
         Property: For any valid chunk overlap changes, validation should succeed.
         
         **Validates: Requirements 14.2**
         """
-        settings_obj = Settings(chunk_overlap=old_overlap)
+        settings_obj = _settings_with(chunk_overlap=old_overlap)
         settings_obj.validate_config()
         settings_obj.chunk_overlap = new_overlap
         settings_obj.validate_config()
         assert settings_obj.chunk_overlap == new_overlap
 
     @given(
-        api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""),
+        api_key=API_KEYS,
         model=st.sampled_from(["BAAI/bge-large-zh-v1.5", "BAAI/bge-base-zh-v1.5"])
     )
-    @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
     def test_embedding_model_change_validation(self, api_key: str, model: str):
         """
         Property: For any valid embedding model changes, provider should be recreated successfully.
@@ -406,10 +473,9 @@ class TestConfigurationChangesValidation:
         assert provider1.model != provider2.model
 
     @given(
-        api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""),
+        api_key=API_KEYS,
         model=st.sampled_from(["BAAI/bge-reranker-large", "BAAI/bge-reranker-base"])
     )
-    @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
     def test_reranker_model_change_validation(self, api_key: str, model: str):
         """
         Property: For any valid reranker model changes, provider should be recreated successfully.
@@ -423,8 +489,7 @@ class TestConfigurationChangesValidation:
         assert provider2.model == new_model
         assert provider1.model != provider2.model
 
-    @given(api_key=st.text(min_size=1, max_size=50).filter(lambda x: x.strip() != ""))
-    @settings(max_examples=100, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+    @given(api_key=API_KEYS)
     def test_llm_provider_change_validation(self, api_key: str):
         """
         Property: For any valid LLM provider changes, provider should be recreated successfully.
@@ -1,14 +1,19 @@
 """Tests for database configuration."""
 import pytest
-from sqlalchemy import text
-from database import engine, SessionLocal, init_db, Base
+from sqlalchemy import inspect, text
+from database import SessionLocal, init_db, Base, to_async_url
+import models.orm  # noqa: F401  # registers the ORM tables on Base
 
 
-def test_database_connection():
+def test_database_connection(db_conn):
     """Test that database connection works."""
-    with engine.connect() as connection:
-        result = connection.execute(text("SELECT 1"))
-        assert result.fetchone()[0] == 1
+    result = db_conn.execute(text("SELECT 1"))
+    assert result.fetchone()[0] == 1
+
+
+def test_db_engine_is_session_engine(db_engine):
+    """Test the engine fixture is the one SessionLocal binds to."""
+    assert SessionLocal.kw["bind"] is db_engine
 
 
 def test_database_session():
@@ -22,16 +27,13 @@ def test_database_session():
         session.close()
 
 
-def test_init_db():
+def test_init_db(db_engine):
     """Test database initialization."""
     # This should not raise any exceptions
     init_db()
-    
+
     # Verify that tables are created
-    with engine.connect() as connection:
-        # Check if we can query the database
-        result = connection.execute(text("SELECT 1"))
-        assert result.fetchone()[0] == 1
+    assert set(Base.metadata.tables) <= set(inspect(db_engine).get_table_names())
 
 
 def test_database_isolation():
@@ -45,3 +47,48 @@ def test_database_isolation():
     finally:
         session1.close()
         session2.close()
+
+
+def test_to_async_url():
+    """Test sync database URLs are mapped to async drivers."""
+    assert to_async_url("sqlite:///./ragdocman.db") == "sqlite+aiosqlite:///./ragdocman.db"
+    assert to_async_url("postgresql://u:p@host/db") == "postgresql+asyncpg://u:p@host/db"
+    assert to_async_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_timestamps_filled_on_legacy_schema():
+    """Test inserts work on tables created before the server defaults existed."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from models.orm import KnowledgeBase, Document, Chunk
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE knowledge_bases (id VARCHAR PRIMARY KEY, name VARCHAR NOT NULL UNIQUE, "
+            "description VARCHAR, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL, "
+            "document_count INTEGER NOT NULL DEFAULT 0, total_size BIGINT NOT NULL DEFAULT 0)"
+        ))
+        connection.execute(text(
+            "CREATE TABLE documents (id VARCHAR PRIMARY KEY, kb_id VARCHAR NOT NULL, name VARCHAR NOT NULL, "
+            "file_path VARCHAR NOT NULL, file_size INTEGER NOT NULL, file_type VARCHAR NOT NULL, "
+            "chunk_count INTEGER NOT NULL, created_at DATETIME NOT NULL)"
+        ))
+        connection.execute(text(
+            "CREATE TABLE chunks (id VARCHAR PRIMARY KEY, doc_id VARCHAR NOT NULL, kb_id VARCHAR NOT NULL, "
+            "content TEXT NOT NULL, chunk_index INTEGER NOT NULL, created_at DATETIME NOT NULL)"
+        ))
+
+    with Session(engine) as session:
+        session.add(KnowledgeBase(id="kb", name="kb"))
+        session.add(Document(id="doc", kb_id="kb", name="a.txt", file_path="a.txt", file_size=1, file_type="txt"))
+        session.flush()
+        Chunk.bulk_insert(session, [
+            {"id": "c0", "doc_id": "doc", "kb_id": "kb", "content": "x", "chunk_index": 0},
+            {"id": "c1", "doc_id": "doc", "kb_id": "kb", "content": "y", "chunk_index": 1},
+        ])
+        session.commit()
+
+        assert session.get(KnowledgeBase, "kb").created_at is not None
+        assert session.get(Document, "doc").created_at is not None
+        assert all(chunk.created_at is not None for chunk in session.query(Chunk).all())
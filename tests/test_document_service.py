@@ -0,0 +1,90 @@
+"""Tests for DocumentService."""
+import pytest
+from models.orm import KnowledgeBase, Chunk
+from services import search_service
+from services.document_service import DocumentService
+from database import Base, engine, SessionLocal
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session."""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+    search_service._INDEX_CACHE.clear()
+
+
+class FakeVectorStore:
+    """In-memory stand-in with the VectorStore collection API."""
+
+    def __init__(self):
+        self.collections = {}
+
+    def get_collection(self, kb_id):
+        return self.collections.get(kb_id)
+
+    def create_collection(self, kb_id, name):
+        self.collections[kb_id] = {"name": name, "records": {}}
+        return self.collections[kb_id]
+
+    def add_documents(self, kb_id, ids, documents, embeddings=None, metadatas=None):
+        collection = self.get_collection(kb_id)
+        if not collection:
+            raise ValueError(f"Collection not found for KB {kb_id}")
+        for record in zip(ids, documents, embeddings, metadatas):
+            collection["records"][record[0]] = record[1:]
+
+
+class FakeEmbeddingProvider:
+    """Embeds each text as its length."""
+
+    model = "fake-embedding"
+
+    async def embed_texts(self, texts):
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def embed_text(self, text):
+        return [float(len(text)), 1.0]
+
+
+class TestDocumentService:
+    """Tests for DocumentService."""
+
+    @pytest.mark.asyncio
+    async def test_upload_stores_chunk_vectors(self, db_session, tmp_path):
+        """Test every stored chunk gets its vector in the knowledge base's collection."""
+        db_session.add(KnowledgeBase(id="kb_1", name="KB"))
+        db_session.commit()
+        path = tmp_path / "notes.txt"
+        path.write_text("\n\n".join(f"Paragraph {i} " * 40 for i in range(10)))
+
+        vector_store = FakeVectorStore()
+        service = DocumentService(
+            db_session,
+            vector_store,
+            embedding_provider=FakeEmbeddingProvider(),
+            upload_dir=str(tmp_path / "uploads"),
+        )
+        response = await service.upload_document("kb_1", str(path), "notes.txt")
+
+        chunks = (
+            db_session.query(Chunk)
+            .filter(Chunk.doc_id == response.id)
+            .order_by(Chunk.chunk_index)
+            .all()
+        )
+        records = vector_store.collections["kb_1"]["records"]
+        assert response.chunk_count == len(chunks) > 1
+        assert set(records) == {chunk.id for chunk in chunks}
+        for chunk in chunks:
+            content, embedding, metadata = records[chunk.id]
+            assert content == chunk.content
+            assert embedding == [float(len(chunk.content)), 1.0]
+            assert metadata == {
+                "doc_id": response.id,
+                "doc_name": "notes.txt",
+                "chunk_index": chunk.chunk_index,
+            }
@@ -61,11 +61,13 @@ class TestSiliconFlowEmbeddingProvider:
         with pytest.raises(ValueError, match="Unsupported model"):
             SiliconFlowEmbeddingProvider("test-api-key", model="unsupported-model")
 
-    def test_init_with_supported_models(self):
+    @pytest.mark.parametrize(
+        "model", list(SiliconFlowEmbeddingProvider.EMBEDDING_DIMENSIONS)
+    )
+    def test_init_with_supported_models(self, model):
         """Test initialization with supported models."""
-        for model in SiliconFlowEmbeddingProvider.EMBEDDING_DIMENSIONS.keys():
-            provider = SiliconFlowEmbeddingProvider("test-api-key", model=model)
-            assert provider.model == model
+        provider = SiliconFlowEmbeddingProvider("test-api-key", model=model)
+        assert provider.model == model
 
     def test_get_embedding_dimension(self):
         """Test getting embedding dimension."""
@@ -73,16 +75,18 @@ class TestSiliconFlowEmbeddingProvider:
         dim = provider.get_embedding_dimension()
         assert dim == 1024  # Default model dimension
 
-    def test_get_embedding_dimension_for_different_models(self):
+    @pytest.mark.parametrize(
+        "model, expected_dim",
+        [
+            ("BAAI/bge-large-zh-v1.5", 1024),
+            ("BAAI/bge-base-zh-v1.5", 768),
+            ("BAAI/bge-small-zh-v1.5", 512),
+        ],
+    )
+    def test_get_embedding_dimension_for_different_models(self, model, expected_dim):
         """Test getting embedding dimension for different models."""
-        dimensions = {
-            "BAAI/bge-large-zh-v1.5": 1024,
-            "BAAI/bge-base-zh-v1.5": 768,
-            "BAAI/bge-small-zh-v1.5": 512,
-        }
-        for model, expected_dim in dimensions.items():
-            provider = SiliconFlowEmbeddingProvider("test-api-key", model=model)
-            assert provider.get_embedding_dimension() == expected_dim
+        provider = SiliconFlowEmbeddingProvider("test-api-key", model=model)
+        assert provider.get_embedding_dimension() == expected_dim
 
 
 class TestSiliconFlowEmbeddingProviderValidation:
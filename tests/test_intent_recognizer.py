@@ -1,6 +1,7 @@
 """Tests for intent recognizer."""
 
 import pytest
+from unittest.mock import AsyncMock
 from RagDocMan.rag.intent_recognizer import IntentRecognizer, IntentResult
 
 
@@ -48,3 +49,95 @@ class TestIntentRecognizer:
         assert "manage" in IntentRecognizer.VALID_INTENTS
         assert "update" in IntentRecognizer.VALID_INTENTS
         assert "delete" in IntentRecognizer.VALID_INTENTS
+
+    @pytest.mark.asyncio
+    async def test_recognize_intent_uses_single_llm_call(self):
+        """Test intent and entities come from one LLM call."""
+        llm = AsyncMock()
+        llm.generate.return_value = (
+            '{"intent": "delete", "entities": {"kb_name": "docs", "doc_name": "a.pdf"}}'
+        )
+        recognizer = IntentRecognizer(llm_provider=llm)
+
+        result = await recognizer.recognize_intent("delete a.pdf from docs")
+
+        assert llm.generate.await_count == 1
+        assert result.intent == "delete"
+        assert result.entities == {"kb_name": "docs", "doc_name": "a.pdf"}
+
+    @pytest.mark.asyncio
+    async def test_recognize_intent_with_bare_category_response(self):
+        """Test a bare category answer is accepted as the intent."""
+        llm = AsyncMock()
+        llm.generate.return_value = "manage"
+        recognizer = IntentRecognizer(llm_provider=llm)
+
+        result = await recognizer.recognize_intent("create a knowledge base")
+
+        assert result.intent == "manage"
+        assert result.entities == {"kb_name": ""}
+
+    @pytest.mark.asyncio
+    async def test_recognize_intent_with_invalid_intent(self):
+        """Test unknown intents default to query."""
+        llm = AsyncMock()
+        llm.generate.return_value = '{"intent": "dance", "entities": {}}'
+        recognizer = IntentRecognizer(llm_provider=llm)
+
+        result = await recognizer.recognize_intent("do something")
+
+        assert result.intent == "query"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("response, expected", [
+        ('{"intent": "update", "entities": {"doc_name": "a.md"}}',
+         ("update", {"doc_name": "a.md"})),
+        ('{"intent": "manage", "entities": ["docs"]}', ("manage", {})),
+        ('["delete"]', ("query", {})),
+        ("not json", ("query", {})),
+        ("", ("query", {})),
+    ])
+    async def test_classify_and_extract(self, response, expected):
+        """Test classification tolerates malformed LLM responses."""
+        llm = AsyncMock()
+        llm.generate.return_value = response
+        recognizer = IntentRecognizer(llm_provider=llm)
+
+        assert await recognizer._classify_and_extract("some input") == expected
+
+    @pytest.mark.asyncio
+    async def test_plain_question_skips_llm(self):
+        """Test unambiguous questions are classified without an LLM call."""
+        llm = AsyncMock()
+        recognizer = IntentRecognizer(llm_provider=llm)
+
+        result = await recognizer.recognize_intent("What is hybrid search?")
+
+        llm.generate.assert_not_awaited()
+        assert result.intent == "query"
+        assert result.entities == {"query_text": "What is hybrid search?"}
+
+    def test_match_intent_keywords(self):
+        """Test keyword matching only resolves a single category."""
+        assert IntentRecognizer._match_intent_keywords("how does rerank work") == "query"
+        assert IntentRecognizer._match_intent_keywords("删除知识库") == "delete"
+        assert IntentRecognizer._match_intent_keywords("show me how it works") is None
+        assert IntentRecognizer._match_intent_keywords("address lookup") is None
+
+    @pytest.mark.asyncio
+    async def test_repeated_input_uses_cached_classification(self):
+        """Test repeated inputs reuse the cached LLM classification across recognizers."""
+        llm = AsyncMock()
+        llm.model = "cached-intent-model"
+        llm.generate.return_value = '{"intent": "delete", "entities": {"kb_name": "docs"}}'
+
+        first = await IntentRecognizer(llm_provider=llm).recognize_intent(
+            "Delete the docs knowledge base"
+        )
+        second = await IntentRecognizer(llm_provider=llm).recognize_intent(
+            "  delete the docs knowledge base "
+        )
+
+        assert llm.generate.await_count == 1
+        assert first.intent == second.intent == "delete"
+        assert second.entities["kb_name"] == "docs"
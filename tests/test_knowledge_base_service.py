@@ -1,5 +1,6 @@
 """Tests for KnowledgeBaseService."""
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from models.orm import KnowledgeBase, Document
 from models.schemas import KnowledgeBaseCreate, KnowledgeBaseUpdate
@@ -82,6 +83,11 @@ class TestKnowledgeBaseService:
         responses2, total2 = await KnowledgeBaseService.get_knowledge_bases(db_session, skip=2, limit=2)
         assert len(responses2) == 2
         assert total2 == 5
+        
+        # A page past the end still reports the total
+        responses3, total3 = await KnowledgeBaseService.get_knowledge_bases(db_session, skip=10, limit=2)
+        assert responses3 == []
+        assert total3 == 5
     
     @pytest.mark.asyncio
     async def test_get_knowledge_base(self, db_session: Session):
@@ -205,3 +211,71 @@ class TestKnowledgeBaseService:
         response = await KnowledgeBaseService.get_knowledge_base(db_session, kb.id)
         assert response.document_count == 3
         assert response.total_size == 1024 + 2048 + 3072
+        
+        # Deleting a document updates the stored counters
+        db_session.delete(db_session.get(Document, "doc_001"))
+        db_session.commit()
+        response = await KnowledgeBaseService.get_knowledge_base(db_session, kb.id)
+        assert response.document_count == 2
+        assert response.total_size == 1024 + 3072
+    
+    @pytest.mark.asyncio
+    async def test_get_knowledge_bases_query_count_is_constant(self, db_session: Session):
+        """Test listing knowledge bases does not issue a query per knowledge base."""
+        for i in range(5):
+            kb = await KnowledgeBaseService.create_knowledge_base(
+                db_session, KnowledgeBaseCreate(name=f"KB {i}")
+            )
+            db_session.add(Document(
+                id=f"doc_{i:03d}",
+                kb_id=kb.id,
+                name=f"Doc {i}",
+                file_path=f"/path/to/file_{i}.pdf",
+                file_size=1024,
+                file_type="pdf"
+            ))
+        db_session.commit()
+        db_session.expunge_all()
+        
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            responses, total = await KnowledgeBaseService.get_knowledge_bases(db_session)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        
+        assert total == 5
+        assert all(r.document_count == 1 for r in responses)
+        # knowledge bases with a window count; document stats live on the KB rows
+        assert len(statements) == 1
+    
+    @pytest.mark.asyncio
+    async def test_create_and_update_skip_reload(self, db_session: Session):
+        """Test create and update build responses without reloading the row."""
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            created = await KnowledgeBaseService.create_knowledge_base(
+                db_session, KnowledgeBaseCreate(name="KB", description="Original")
+            )
+            # insert only; the unique index catches duplicate names
+            assert len(statements) == 1
+            
+            statements.clear()
+            updated = await KnowledgeBaseService.update_knowledge_base(
+                db_session, created.id, KnowledgeBaseUpdate(description="Updated")
+            )
+            # lookup + update
+            assert len(statements) == 2
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        
+        assert created.document_count == 0
+        assert updated.description == "Updated"
+        assert updated.created_at == created.created_at
+        assert updated.updated_at >= created.updated_at
+        
+        stored = await KnowledgeBaseService.get_knowledge_base(db_session, created.id)
+        assert stored == updated
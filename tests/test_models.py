@@ -1,6 +1,7 @@
 """Tests for ORM models."""
 import pytest
 from datetime import datetime
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 from models.orm import KnowledgeBase, Document, Chunk
 from database import Base, engine, SessionLocal
@@ -246,6 +247,45 @@ class TestChunk:
         retrieved_chunk = db_session.query(Chunk).filter_by(id="chunk_001").first()
         assert retrieved_chunk.document.name == "Test Doc"
         assert retrieved_chunk.knowledge_base.name == "Test KB"
+    
+    def test_chunk_composite_index(self, db_session: Session):
+        """Test chunks are indexed by (kb_id, doc_id, chunk_index)."""
+        indexes = {
+            index["name"]: index["column_names"]
+            for index in inspect(db_session.get_bind()).get_indexes("chunks")
+        }
+        assert indexes["ix_chunks_kb_doc_idx"] == ["kb_id", "doc_id", "chunk_index"]
+    
+    def test_chunk_bulk_insert(self, db_session: Session):
+        """Test inserting many chunks in one statement."""
+        kb = KnowledgeBase(id="kb_001", name="Test KB")
+        doc = Document(
+            id="doc_001",
+            kb_id="kb_001",
+            name="Test Doc",
+            file_path="/path/to/file.pdf",
+            file_size=1024,
+            file_type="pdf"
+        )
+        db_session.add(kb)
+        db_session.add(doc)
+        db_session.commit()
+        
+        Chunk.bulk_insert(db_session, [
+            {
+                "id": f"chunk_{i:03d}",
+                "doc_id": "doc_001",
+                "kb_id": "kb_001",
+                "content": f"Content {i}",
+                "chunk_index": i,
+            }
+            for i in range(5)
+        ])
+        db_session.commit()
+        
+        chunks = db_session.query(Chunk).order_by(Chunk.chunk_index).all()
+        assert [c.content for c in chunks] == [f"Content {i}" for i in range(5)]
+        assert all(isinstance(c.created_at, datetime) for c in chunks)
 
 
 class TestCascadeDelete:
@@ -15,7 +15,7 @@ from unittest.mock import Mock, AsyncMock, patch
 from typing import List, Dict, Any
 import statistics
 
-from rag.agent_cache import CacheManager, ToolResultCache, SearchResultCache
+from rag.agent_cache import CacheManager, ToolResultCache, SearchResultCache, AsyncTTLCache
 from rag.parallel_tool_executor import (
     ParallelToolExecutor,
     ToolExecutionTask,
@@ -709,4 +709,31 @@ class TestCacheHitRateAndValidity:
         # kb_2 entries should still exist
         for i in range(10):
             result = await cache.get(f"search_kb_2_{i}")
-            assert result == f"value_{i}"
\ No newline at end of file
+            assert result == f"value_{i}"
+
+    @pytest.mark.anyio
+    async def test_async_ttl_cache_loads_each_key_once(self):
+        """Test concurrent misses for one key share a single load.
+        
+        Verifies that AsyncTTLCache suppresses duplicate loader calls and
+        evicts the least recently used entry when full.
+        """
+        cache = AsyncTTLCache(maxsize=2, ttl=60)
+        calls = []
+        
+        async def load(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key.upper()
+        
+        results = await asyncio.gather(*[
+            cache.get_or_load("a", lambda: load("a")) for _ in range(5)
+        ])
+        assert results == ["A"] * 5
+        assert calls == ["a"]
+        
+        await cache.get_or_load("b", lambda: load("b"))
+        await cache.get_or_load("a", lambda: load("a"))  # refresh "a"
+        await cache.get_or_load("c", lambda: load("c"))  # evicts "b"
+        await cache.get_or_load("b", lambda: load("b"))
+        assert calls == ["a", "b", "c", "b"]
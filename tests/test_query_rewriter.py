@@ -1,6 +1,8 @@
 """Tests for query rewriter."""
 
+import asyncio
 import pytest
+from unittest.mock import AsyncMock
 from RagDocMan.rag.query_rewriter import QueryRewriter, QueryRewriteResult
 
 
@@ -43,3 +45,98 @@ class TestQueryRewriter:
         assert isinstance(result, QueryRewriteResult)
         assert result.original_query == "test query"
         assert "test query" in result.rewritten_queries
+
+    @pytest.mark.asyncio
+    async def test_rewrite_query_runs_llm_calls_concurrently(self):
+        """Test HyDE and expansion calls are in flight at the same time."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def generate(prompt, max_tokens=None):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if "alternative phrasings" in prompt:
+                return "related query one\nrelated query two"
+            return "hypothetical document"
+
+        llm = AsyncMock()
+        llm.generate.side_effect = generate
+        rewriter = QueryRewriter(llm_provider=llm)
+
+        result = await rewriter.rewrite_query("test query")
+
+        assert max_in_flight == 2
+        assert result.hypothetical_docs == ["hypothetical document"]
+        assert result.rewritten_queries == [
+            "test query", "related query one", "related query two"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rewrite_query_keeps_expansion_when_hyde_fails(self):
+        """Test one failed LLM call does not discard the other's result."""
+        async def generate(prompt, max_tokens=None):
+            if "alternative phrasings" in prompt:
+                return "related query"
+            raise RuntimeError("LLM unavailable")
+
+        llm = AsyncMock()
+        llm.generate.side_effect = generate
+        rewriter = QueryRewriter(llm_provider=llm)
+
+        result = await rewriter.rewrite_query("test query")
+
+        assert result.hypothetical_docs == []
+        assert result.rewritten_queries == ["test query", "related query"]
+
+    @pytest.mark.asyncio
+    async def test_rewrite_query_deduplicates_queries(self):
+        """Test expansions that restate the query are dropped."""
+        async def generate(prompt, max_tokens=None):
+            if "alternative phrasings" in prompt:
+                return "Test Query\n  test query  \nrelated query\nRelated Query"
+            return "hypothetical document"
+
+        llm = AsyncMock()
+        llm.generate.side_effect = generate
+        rewriter = QueryRewriter(llm_provider=llm)
+
+        result = await rewriter.rewrite_query("test query")
+
+        assert result.rewritten_queries == ["test query", "related query"]
+
+    @pytest.mark.asyncio
+    async def test_rewrite_query_caches_successful_llm_results(self):
+        """Test repeated queries reuse results across rewriters but retry failed calls."""
+        hyde_calls = 0
+
+        async def generate(prompt, max_tokens=None):
+            nonlocal hyde_calls
+            if "alternative phrasings" in prompt:
+                return "related query"
+            hyde_calls += 1
+            if hyde_calls == 1:
+                raise RuntimeError("LLM unavailable")
+            return "hypothetical document"
+
+        llm = AsyncMock()
+        llm.model = "cached-rewrite-model"
+        llm.generate.side_effect = generate
+
+        # Services build a new rewriter per request
+        first = await QueryRewriter(llm_provider=llm).rewrite_query("test query")
+        second = await QueryRewriter(llm_provider=llm).rewrite_query("Test Query")
+        third = await QueryRewriter(llm_provider=llm).rewrite_query("test query")
+
+        # expansion once, HyDE failed once then succeeded once
+        assert llm.generate.await_count == 3
+        assert first.hypothetical_docs == []
+        assert second.hypothetical_docs == third.hypothetical_docs == ["hypothetical document"]
+        assert third.rewritten_queries == ["test query", "related query"]
+
+        # Another model does not reuse these results
+        llm.model = "other-rewrite-model"
+        await QueryRewriter(llm_provider=llm).rewrite_query("test query")
+        assert llm.generate.await_count == 5
@@ -1,8 +1,10 @@
 """Tests for reranker."""
 
 import pytest
+from unittest.mock import AsyncMock
 from RagDocMan.rag.reranker import Reranker
 from RagDocMan.rag.retriever import RetrievalResult
+from RagDocMan.rag.scorer_cache import ScorerCache
 
 
 class TestReranker:
@@ -67,3 +69,132 @@ class TestReranker:
         ]
         results = await reranker.rerank_with_fallback("query", candidates)
         assert len(results) == 1
+
+    @pytest.mark.asyncio
+    async def test_rerank_uses_score_cache(self):
+        """Test cached scores are not requested from the provider again."""
+        provider = AsyncMock()
+        provider.rerank.return_value = [(1, 0.8), (0, 0.3)]
+        reranker = Reranker(provider, cache=ScorerCache())
+        candidates = [
+            RetrievalResult(
+                chunk_id=str(i),
+                doc_id="doc1",
+                content=f"test {i}",
+                score=0.5,
+                doc_name="Doc1",
+            )
+            for i in range(2)
+        ]
+
+        first = await reranker.rerank("query", candidates, top_k=2)
+        second = await reranker.rerank("query", candidates, top_k=2)
+
+        assert provider.rerank.await_count == 1
+        assert [r.chunk_id for r in first] == ["1", "0"]
+        assert [(r.chunk_id, r.score) for r in second] == [
+            (r.chunk_id, r.score) for r in first
+        ]
+
+        # Only the new candidate is sent to the provider
+        provider.rerank.return_value = [(0, 0.9)]
+        candidates.append(
+            RetrievalResult(
+                chunk_id="2", doc_id="doc1", content="test 2", score=0.5, doc_name="Doc1"
+            )
+        )
+        third = await reranker.rerank("query", candidates, top_k=2)
+        assert provider.rerank.await_args.args[1] == ["test 2"]
+        assert [r.chunk_id for r in third] == ["2", "1"]
+
+        # Scores of another model are not reused
+        provider.model = "other-model"
+        provider.rerank.return_value = [(2, 0.7), (1, 0.6), (0, 0.5)]
+        await reranker.rerank("query", candidates, top_k=2)
+        assert provider.rerank.await_args.args[1] == ["test 0", "test 1", "test 2"]
+
+    @pytest.mark.asyncio
+    async def test_rerank_unscored_candidates_rank_last(self):
+        """Test candidates the provider did not score follow every scored one at 0.0."""
+
+        class PartialProvider:
+            def __init__(self):
+                self.requests = []
+
+            async def rerank(self, query, documents, top_k):
+                self.requests.append(list(documents))
+                # The chunk holding "test 0" and "test 1" failed
+                return [(3, 0.2), (2, 0.1)]
+
+        provider = PartialProvider()
+        reranker = Reranker(provider)
+        candidates = [
+            RetrievalResult(
+                chunk_id=str(i),
+                doc_id="doc1",
+                content=f"test {i}",
+                score=0.9 - i / 10,
+                doc_name="Doc1",
+            )
+            for i in range(4)
+        ]
+
+        results = await reranker.rerank("query", candidates, top_k=4)
+
+        assert provider.requests == [["test 0", "test 1", "test 2", "test 3"]]
+        assert [(r.chunk_id, r.score) for r in results] == [
+            ("3", 0.2), ("2", 0.1), ("0", 0.0), ("1", 0.0)
+        ]
+        # The candidates passed in keep their retrieval scores
+        assert [c.score for c in candidates] == pytest.approx([0.9, 0.8, 0.7, 0.6])
+        assert not any(r is c for r in results for c in candidates)
+
+
+class TestScorerCache:
+    """Test ScorerCache expiry, eviction and deletion."""
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        """Test expired scores are neither returned nor kept."""
+        now = [1000.0]
+        monkeypatch.setattr("RagDocMan.rag.scorer_cache.time.time", lambda: now[0])
+        cache = ScorerCache(ttl=60)
+        cache.put_many("model", "query", {"a": 0.1})
+
+        now[0] += 30
+        assert cache.get_many("model", "query", ["a"]) == {"a": 0.1}
+
+        now[0] += 60
+        assert cache.get_many("model", "query", ["a"]) == {}
+        cache.put_many("model", "query", {"b": 0.2})
+        (count,) = cache._conn.execute("SELECT COUNT(*) FROM rerank_scores").fetchone()
+        assert count == 1
+
+    def test_oldest_entries_evicted_above_max_entries(self, monkeypatch):
+        """Test the cache is trimmed to max_entries, oldest first."""
+        now = [1000.0]
+        monkeypatch.setattr("RagDocMan.rag.scorer_cache.time.time", lambda: now[0])
+        cache = ScorerCache(max_entries=2)
+        for chunk_id in ("a", "b", "c"):
+            cache.put_many("model", "query", {chunk_id: 0.5})
+            now[0] += 1
+
+        assert cache.get_many("model", "query", ["a", "b", "c"]) == {"b": 0.5, "c": 0.5}
+
+    def test_delete_chunks(self):
+        """Test deleting chunks drops their scores for every model and query."""
+        cache = ScorerCache()
+        cache.put_many("m1", "q1", {"a": 0.1, "b": 0.2})
+        cache.put_many("m2", "q2", {"a": 0.3})
+
+        cache.delete_chunks(["a"])
+
+        assert cache.get_many("m1", "q1", ["a", "b"]) == {"b": 0.2}
+        assert cache.get_many("m2", "q2", ["a"]) == {}
+
+    def test_get_many_batches_large_lookups(self):
+        """Test lookups above SQLite's variable limit are split into batches."""
+        cache = ScorerCache()
+        scores = {f"chunk_{i}": i / 10000 for i in range(40000)}
+        cache.put_many("model", "query", scores)
+
+        assert cache.get_many("model", "query", list(scores)) == scores
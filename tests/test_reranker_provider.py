@@ -1,7 +1,15 @@
 """Tests for reranker provider factory."""
 
+import asyncio
+import math
+from types import SimpleNamespace
+
+import httpx
+import orjson
 import pytest
+from unittest.mock import AsyncMock
 from RagDocMan.core.reranker_provider import (
+    ONNXRerankerProvider,
     RerankerProviderFactory,
     SiliconFlowRerankerProvider,
 )
@@ -56,6 +64,12 @@ class TestSiliconFlowRerankerProvider:
         with pytest.raises(ValueError, match="API key cannot be empty"):
             SiliconFlowRerankerProvider("")
 
+    @pytest.mark.parametrize("api_key", ["ключ-api", "\ud800"])
+    def test_init_with_non_ascii_api_key(self, api_key):
+        """Test keys that are not ASCII or hold lone surrogates still build a client."""
+        provider = SiliconFlowRerankerProvider(api_key)
+        assert provider.api_key == api_key
+
     def test_init_with_custom_parameters(self):
         """Test initialization with custom parameters."""
         provider = SiliconFlowRerankerProvider(
@@ -147,3 +161,191 @@ class TestSiliconFlowRerankerProviderValidation:
         await provider.close()
         # Should not raise any error
         assert True
+
+
+class TestSiliconFlowRerankerProviderLiteralQueries:
+    """Test literal-lookup short-circuit in Silicon Flow reranker provider."""
+
+    @pytest.mark.asyncio
+    async def test_rerank_filename_query_skips_api(self):
+        """Test filename query returns identity order without an API call."""
+        provider = SiliconFlowRerankerProvider("test-api-key")
+        try:
+            results = await provider.rerank(
+                "report_2024.pdf", ["candidate 1", "candidate 2", "candidate 3"], top_k=2
+            )
+            assert results == [(0, 1.0), (1, 1.0)]
+        finally:
+            await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_rerank_quoted_phrase_query_skips_api(self):
+        """Test fully quoted query returns identity order without an API call."""
+        provider = SiliconFlowRerankerProvider("test-api-key")
+        try:
+            results = await provider.rerank(
+                '"exact phrase"', ["candidate 1", "candidate 2"], top_k=5
+            )
+            assert results == [(0, 1.0), (1, 1.0)]
+        finally:
+            await provider.close()
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query", ["numpy.ndarray", "3.14", "v1.2"])
+    async def test_rerank_dotted_token_query_is_reranked(self, query):
+        """Test dotted tokens that are not filenames still go to the API."""
+        provider = SiliconFlowRerankerProvider("test-api-key")
+        provider.client.post = AsyncMock(
+            return_value=httpx.Response(
+                200,
+                json={"results": [{"index": 1, "score": 0.9}, {"index": 0, "score": 0.2}]},
+            )
+        )
+        try:
+            results = await provider.rerank(query, ["candidate 1", "candidate 2"])
+            assert provider.client.post.await_count == 1
+            assert results == [(1, 0.9), (0, 0.2)]
+        finally:
+            await provider.close()
+
+
+class TestSiliconFlowRerankerProviderFanOut:
+    """Test chunked fan-out of large candidate lists."""
+
+    @pytest.mark.asyncio
+    async def test_rerank_large_candidate_list_is_chunked(self):
+        """Test large candidate lists are split and merged by score."""
+        provider = SiliconFlowRerankerProvider("test-api-key", batch_size=2)
+
+        async def fake_post(url, content=None):
+            documents = orjson.loads(content)["documents"]
+            # Score each candidate by its numeric suffix
+            results = sorted(
+                (
+                    {"index": i, "score": float(doc.split()[-1])}
+                    for i, doc in enumerate(documents)
+                ),
+                key=lambda r: r["score"],
+                reverse=True,
+            )
+            return httpx.Response(200, json={"results": results})
+
+        provider.client.post = AsyncMock(side_effect=fake_post)
+        try:
+            candidates = [f"candidate {n}" for n in (3, 9, 1, 7, 5)]
+            results = await provider.rerank("query", candidates, top_k=3)
+
+            assert provider.client.post.await_count == 3
+            assert results == [(1, 9.0), (3, 7.0), (4, 5.0)]
+        finally:
+            await provider.close()
+
+    def test_rerank_works_across_event_loops(self):
+        """Test a provider built outside any loop serves requests from several loops."""
+        provider = SiliconFlowRerankerProvider("test-api-key")
+        provider.client.post = AsyncMock(
+            return_value=httpx.Response(200, json={"results": [{"index": 0, "score": 0.5}]})
+        )
+
+        for _ in range(2):
+            assert asyncio.run(provider.rerank("query", ["candidate"])) == [(0, 0.5)]
+        asyncio.run(provider.close())
+
+    @pytest.mark.asyncio
+    async def test_rerank_drops_failed_batches(self, caplog):
+        """Test candidates of a failed batch are left out and all-failed batches raise."""
+        provider = SiliconFlowRerankerProvider("test-api-key", batch_size=2)
+        failing = {"candidate 1"}
+
+        async def fake_post(url, content=None):
+            documents = orjson.loads(content)["documents"]
+            if failing & set(documents):
+                return httpx.Response(500, json={"error": "unavailable"})
+            results = [
+                {"index": i, "score": float(doc.split()[-1])}
+                for i, doc in enumerate(documents)
+            ]
+            return httpx.Response(200, json={"results": results})
+
+        provider.client.post = AsyncMock(side_effect=fake_post)
+        try:
+            candidates = [f"candidate {n}" for n in (3, 9, 1, 7)]
+            results = await provider.rerank("query", candidates, top_k=4)
+            assert results == [(1, 9.0), (0, 3.0)]
+            assert "leaving 2 of 4 candidates unscored" in caplog.text
+
+            failing.add("candidate 3")
+            with pytest.raises(Exception):
+                await provider.rerank("query", candidates, top_k=4)
+        finally:
+            await provider.close()
+
+    @pytest.mark.asyncio
+    async def test_rerank_returns_original_indices_after_filtering(self):
+        """Test indices refer to the caller's list when empty candidates are dropped."""
+        provider = SiliconFlowRerankerProvider("test-api-key")
+
+        async def fake_post(url, content=None):
+            documents = orjson.loads(content)["documents"]
+            assert documents == ["first", "second"]
+            return httpx.Response(
+                200,
+                json={"results": [{"index": 1, "score": 0.9}, {"index": 0, "score": 0.1}]},
+            )
+
+        provider.client.post = AsyncMock(side_effect=fake_post)
+        try:
+            results = await provider.rerank("query", ["", "first", "  ", "second"])
+            assert results == [(3, 0.9), (1, 0.1)]
+        finally:
+            await provider.close()
+
+
+class FakeTokenizer:
+    """Encodes each pair as its document length."""
+
+    def __call__(self, queries, texts, **kwargs):
+        lengths = [[len(text)] for text in texts]
+        return {"input_ids": lengths, "attention_mask": [[1]] * len(texts)}
+
+
+class FakeSession:
+    """Returns one logit per pair equal to its encoded length."""
+
+    def __init__(self):
+        self.batches = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids")]
+
+    def run(self, outputs, feed):
+        self.batches.append(feed["input_ids"][:, 0].tolist())
+        return [feed["input_ids"].astype("float32") - 3]
+
+
+class TestONNXRerankerProvider:
+    """Test ONNX reranker provider."""
+
+    def test_factory_creates_without_api_key(self):
+        """Test the ONNX provider needs no API key."""
+        provider = RerankerProviderFactory.create_provider(
+            "onnx", "", session=FakeSession(), tokenizer=FakeTokenizer()
+        )
+        assert isinstance(provider, ONNXRerankerProvider)
+
+    @pytest.mark.asyncio
+    async def test_rerank_batches_by_length(self):
+        """Test pairs are scored in length-sorted batches, in input order."""
+        session = FakeSession()
+        provider = ONNXRerankerProvider(
+            session=session, tokenizer=FakeTokenizer(), batch_size=2
+        )
+
+        results = await provider.rerank(
+            "query", ["aaaa", "", "a", "aaaaa", "aa"], top_k=2
+        )
+
+        assert session.batches == [[1, 2], [4, 5]]
+        assert [i for i, _ in results] == [3, 0]
+        assert results[0][1] == pytest.approx(1 / (1 + math.exp(-2)))
@@ -1,7 +1,9 @@
 """Tests for retriever components."""
 
+import numpy as np
 import pytest
 from RagDocMan.rag.retriever import (
+    BM25Index,
     BM25Retriever,
     VectorRetriever,
     ResultFuser,
@@ -99,6 +101,94 @@ class TestBM25Retriever:
         results = retriever.retrieve("test", top_k=2)
         assert len(results) <= 2
 
+    def test_retrieve_skips_empty_chunks(self):
+        """Test empty chunks do not shift results onto the wrong chunk."""
+        retriever = BM25Retriever()
+        chunks = [
+            {"id": "empty", "content": "   ", "doc_id": "doc0", "doc_name": "Empty"},
+            {"id": "1", "content": "python guide", "doc_id": "doc1", "doc_name": "A"},
+            {"id": "2", "content": "java guide", "doc_id": "doc2", "doc_name": "B"},
+            {"id": "3", "content": "rust guide", "doc_id": "doc3", "doc_name": "C"},
+        ]
+        retriever.build_index(chunks)
+        results = retriever.retrieve("java", top_k=1)
+        assert results[0].chunk_id == "2"
+
+    def test_retrieve_caches_repeated_queries(self):
+        """Test repeated queries are served from the cache until rebuild."""
+        retriever = BM25Retriever()
+        chunks = [
+            {"id": "1", "content": "python guide", "doc_id": "doc1", "doc_name": "A"},
+            {"id": "2", "content": "java guide", "doc_id": "doc2", "doc_name": "B"},
+            {"id": "3", "content": "rust guide", "doc_id": "doc3", "doc_name": "C"},
+        ]
+        retriever.build_index(chunks)
+        first = retriever.retrieve("Java", top_k=1)
+        second = retriever.retrieve("java", top_k=1)
+        assert retriever._search.cache_info().hits == 1
+        assert first == second
+
+        retriever.build_index(chunks[:1] + chunks[2:] + [
+            {"id": "4", "content": "java book", "doc_id": "doc4", "doc_name": "D"},
+        ])
+        assert retriever.retrieve("java", top_k=1)[0].chunk_id == "4"
+
+    def test_build_index_reuses_saved_index(self, tmp_path, monkeypatch):
+        """Test a saved index is loaded for the same chunks in any order."""
+        path = str(tmp_path / "bm25" / "kb.npz")
+        chunks = [
+            {"id": "1", "content": "python guide", "doc_id": "doc1", "doc_name": "A"},
+            {"id": "2", "content": "...", "doc_id": "doc2", "doc_name": "B"},
+            {"id": "3", "content": "java guide", "doc_id": "doc3", "doc_name": "C"},
+            {"id": "4", "content": "rust book", "doc_id": "doc4", "doc_name": "D"},
+        ]
+        built = BM25Retriever()
+        built.build_index(chunks, cache_path=path)
+        expected = built.retrieve("java guide", top_k=3)
+
+        # Loading must not tokenize the corpus again
+        monkeypatch.setattr(
+            "RagDocMan.rag.retriever.BM25Index.__init__",
+            lambda *args, **kwargs: pytest.fail("index was rebuilt"),
+        )
+        loaded = BM25Retriever()
+        loaded.build_index(chunks[::-1], cache_path=path)
+        assert loaded.retrieve("java guide", top_k=3) == expected
+
+        # Different chunks invalidate the saved index
+        monkeypatch.undo()
+        changed = BM25Retriever()
+        changed.build_index(chunks[:3], cache_path=path)
+        assert changed.chunk_ids == ["1", "3"]
+        assert "rust" not in changed.bm25.vocab
+
+    def test_retrieve_ignores_punctuation(self):
+        """Test tokens match regardless of case and surrounding punctuation."""
+        retriever = BM25Retriever()
+        chunks = [
+            {"id": "1", "content": "Guide: Python, basics.", "doc_id": "doc1", "doc_name": "A"},
+            {"id": "2", "content": "java guide", "doc_id": "doc2", "doc_name": "B"},
+            {"id": "3", "content": "rust guide", "doc_id": "doc3", "doc_name": "C"},
+        ]
+        retriever.build_index(chunks)
+        results = retriever.retrieve("python?", top_k=1)
+        assert results[0].chunk_id == "1"
+
+    def test_index_scores(self):
+        """Test BM25 scores against the Okapi formula."""
+        import math
+
+        index = BM25Index([["a", "b"], ["b", "c", "c"], ["d"]])
+        scores = index.get_scores(["c", "unknown"])
+
+        # "c" appears twice in the only document containing it
+        idf = math.log(3 - 1 + 0.5) - math.log(1 + 0.5)
+        length_norm = 1 - 0.75 + 0.75 * 3 / 2
+        expected = idf * 2 * 2.5 / (2 + 1.5 * length_norm)
+        assert scores[0] == 0
+        assert scores[1] == pytest.approx(expected)
+        assert scores[2] == 0
+
 
 class TestResultFuser:
     """Test result fuser."""
@@ -176,6 +266,246 @@ class TestResultFuser:
         fused = ResultFuser.fuse_results([], vector_results)
         assert len(fused) == 1
 
+    def test_fuse_results_top_k(self):
+        """Test top_k keeps the highest fused results in order."""
+        results = [
+            RetrievalResult(
+                chunk_id=str(i),
+                doc_id=f"doc{i}",
+                content="test",
+                score=0.9,
+                doc_name=f"Doc{i}",
+            )
+            for i in range(4)
+        ]
+        full = ResultFuser.fuse_results(results, results[::-1][1:])
+        fused = ResultFuser.fuse_results(results, results[::-1][1:], top_k=2)
+        assert [r.chunk_id for r in fused] == [r.chunk_id for r in full[:2]]
+        assert [r.score for r in fused] == [r.score for r in full[:2]]
+
+
+class FakeEmbeddingProvider:
+    """Embeds text as fixed vectors looked up by content."""
+
+    VECTORS = {
+        "python": [1.0, 0.0, 0.0],
+        "java": [0.0, 1.0, 0.0],
+        "rust": [0.6, 0.0, 0.8],
+    }
+
+    async def embed_text(self, text):
+        return self.VECTORS[text.lower()]
+
+    async def embed_texts(self, texts):
+        return [self.VECTORS[t.lower()] for t in texts]
+
+
+class TestVectorRetriever:
+    """Test vector retriever."""
+
+    @pytest.mark.asyncio
+    async def test_retrieve_ranks_by_cosine_similarity(self):
+        """Test results are ordered by cosine similarity to the query."""
+        retriever = VectorRetriever(FakeEmbeddingProvider())
+        chunks = [
+            {"id": str(i), "content": name, "doc_id": f"doc{i}", "doc_name": name}
+            for i, name in enumerate(["java", "rust", "python"])
+        ]
+        await retriever.build_index(chunks, batch_size=3)
+
+        results = await retriever.retrieve("python", top_k=2)
+
+        assert [r.chunk_id for r in results] == ["2", "1"]
+        assert results[0].score == pytest.approx(1.0, abs=1e-6)
+        assert results[1].score == pytest.approx(0.6, abs=1e-6)
+
+    @pytest.mark.asyncio
+    async def test_retrieve_top_k_larger_than_index(self):
+        """Test top_k beyond the index size returns every chunk."""
+        retriever = VectorRetriever(FakeEmbeddingProvider())
+        chunks = [
+            {"id": str(i), "content": name, "doc_id": f"doc{i}", "doc_name": name}
+            for i, name in enumerate(["java", "python"])
+        ]
+        await retriever.build_index(chunks, batch_size=2)
+
+        results = await retriever.retrieve("java", top_k=10)
+
+        assert [r.chunk_id for r in results] == ["0", "1"]
+
+    @pytest.mark.asyncio
+    async def test_build_index_stores_one_contiguous_matrix(self):
+        """Test embeddings are kept only as a row-normalized float matrix."""
+        retriever = VectorRetriever(FakeEmbeddingProvider())
+        chunks = [
+            {"id": str(i), "content": name, "doc_id": f"doc{i}", "doc_name": name}
+            for i, name in enumerate(["java", "rust", "python"])
+        ]
+        await retriever.build_index(chunks, batch_size=2)
+
+        matrix = retriever._emb_matrix
+        assert matrix.shape == (3, 3)
+        assert matrix.flags["C_CONTIGUOUS"]
+        assert np.allclose(np.linalg.norm(matrix.astype(np.float32), axis=1), 1.0, atol=1e-3)
+        assert not hasattr(retriever, "embeddings")
+
+    @pytest.mark.asyncio
+    async def test_retrieve_batch_matches_single_queries(self):
+        """Test batched retrieval embeds once and matches per-query results."""
+        provider = FakeEmbeddingProvider()
+        retriever = VectorRetriever(provider)
+        chunks = [
+            {"id": str(i), "content": name, "doc_id": f"doc{i}", "doc_name": name}
+            for i, name in enumerate(["java", "rust", "python"])
+        ]
+        await retriever.build_index(chunks, batch_size=3)
+
+        calls = []
+        embed_texts = provider.embed_texts
+
+        async def counting_embed_texts(texts):
+            calls.append(texts)
+            return await embed_texts(texts)
+
+        provider.embed_texts = counting_embed_texts
+        batches = await retriever.retrieve_batch(["python", "java"], top_k=2)
+
+        assert calls == [["python", "java"]]
+        for query, results in zip(["python", "java"], batches):
+            expected = await retriever.retrieve(query, top_k=2)
+            assert [r.chunk_id for r in results] == [r.chunk_id for r in expected]
+            assert [r.score for r in results] == pytest.approx(
+                [r.score for r in expected]
+            )
+
+
+    def test_quantize_rows_preserves_cosine(self):
+        """Test int8 quantization keeps cosine similarity close."""
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((8, 64)).astype(np.float32)
+        quantized = VectorRetriever._quantize_rows(matrix)
+
+        assert quantized.dtype == np.int8
+        assert np.abs(quantized).max() == 127
+
+        def cosine(a, b):
+            a = a.astype(np.float64)
+            b = b.astype(np.float64)
+            return a @ b / (np.linalg.norm(a) * np.linalg.norm(b))
+
+        for i in range(1, 8):
+            assert cosine(quantized[0], quantized[i]) == pytest.approx(
+                cosine(matrix[0], matrix[i]), abs=0.01
+            )
+
+    def test_rescore_quantized_uses_exact_cosine(self):
+        """Test the int8 shortlist is rescored against the float query."""
+        rng = np.random.default_rng(0)
+        matrix = rng.standard_normal((50, 16)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        retriever = VectorRetriever()
+        retriever._emb_matrix = retriever._quantize_rows(matrix)
+        query = matrix[7] + 0.1 * rng.standard_normal(16).astype(np.float32)
+        query /= np.linalg.norm(query)
+
+        # Coarse scores from the quantized query, as SimSIMD would produce
+        quantized_query = retriever._quantize_rows(query[None, :])[0]
+        rows = retriever._emb_matrix.astype(np.float32)
+        coarse = rows @ quantized_query / (
+            np.linalg.norm(rows, axis=1) * np.linalg.norm(quantized_query)
+        )
+
+        scores = retriever._rescore_quantized(coarse, query, top_k=2)
+
+        assert np.isfinite(scores).sum() == 8
+        assert int(np.argmax(scores)) == 7
+        assert scores[7] == pytest.approx(float(matrix[7] @ query), abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_large_index_searches_ann(self, monkeypatch):
+        """Test indexes above ANN_MIN_ROWS are scored through the HNSW index."""
+        from RagDocMan.rag import retriever as retriever_module
+
+        class FakeIndex:
+            """Exact stand-in for hnswlib.Index with the "ip" space."""
+
+            def __init__(self, space, dim):
+                assert space == "ip"
+                self.rows = np.empty((0, dim), dtype=np.float32)
+
+            def init_index(self, max_elements, ef_construction, M):
+                pass
+
+            def add_items(self, data, ids):
+                self.rows = np.asarray(data, dtype=np.float32)
+
+            def get_current_count(self):
+                return len(self.rows)
+
+            def set_ef(self, ef):
+                pass
+
+            def knn_query(self, data, k):
+                dist = 1.0 - np.asarray(data) @ self.rows.T
+                labels = np.argsort(dist, axis=1)[:, :k]
+                return labels, np.take_along_axis(dist, labels, axis=1)
+
+        monkeypatch.setattr(retriever_module, "HNSWLIB_AVAILABLE", True)
+        monkeypatch.setattr(
+            retriever_module, "hnswlib", type("hnswlib", (), {"Index": FakeIndex}),
+            raising=False,
+        )
+        monkeypatch.setattr(VectorRetriever, "ANN_MIN_ROWS", 2)
+        retriever = VectorRetriever(FakeEmbeddingProvider())
+        chunks = [
+            {"id": str(i), "content": name, "doc_id": f"doc{i}", "doc_name": name}
+            for i, name in enumerate(["java", "rust", "python"])
+        ]
+        await retriever.build_index(chunks, batch_size=3)
+
+        assert isinstance(retriever._ann, FakeIndex)
+        results = await retriever.retrieve("python", top_k=2)
+        assert [r.chunk_id for r in results] == ["2", "1"]
+        assert results[1].score == pytest.approx(0.6, abs=1e-6)
+
+    def test_half_precision_opt_out_keeps_float32(self, monkeypatch):
+        """Test HALF_PRECISION = False stores float32 rows even with SimSIMD."""
+        from RagDocMan.rag import retriever as retriever_module
+
+        monkeypatch.setattr(retriever_module, "SIMSIMD_AVAILABLE", True)
+        retriever = VectorRetriever()
+        assert retriever._build_matrix([[1.0, 2.0]]).dtype.name == "float16"
+
+        monkeypatch.setattr(VectorRetriever, "HALF_PRECISION", False)
+        assert retriever._build_matrix([[1.0, 2.0]]).dtype.name == "float32"
+
+    def test_pruned_scores_match_exact_top_k(self, monkeypatch):
+        """Test bound pruning returns the same top-k as full scoring."""
+        import numpy as np
+        from RagDocMan.rag import retriever as retriever_module
+
+        monkeypatch.setattr(retriever_module, "SIMSIMD_AVAILABLE", False)
+        monkeypatch.setattr(VectorRetriever, "PRUNE_MIN_ROWS", 100)
+        monkeypatch.setattr(VectorRetriever, "PRUNE_PREFIX_DIMS", 16)
+
+        rng = np.random.default_rng(0)
+        retriever = VectorRetriever()
+        retriever._emb_matrix = retriever._build_matrix(
+            rng.standard_normal((500, 128))
+        )
+        assert retriever._tail_norms is not None
+
+        query = rng.standard_normal(128).astype(np.float32)
+        query /= np.linalg.norm(query)
+        exact = retriever._emb_matrix @ query
+        pruned = retriever._pruned_scores(query, 5)
+
+        top = retriever_module._top_k_indices(exact, 5)
+        assert list(retriever_module._top_k_indices(pruned, 5)) == list(top)
+        assert np.allclose(pruned[top], exact[top])
+
 
 class TestHybridRetriever:
     """Test hybrid retriever."""
@@ -263,3 +593,73 @@ class TestHybridRetriever:
         await retriever.build_index(chunks)
         results = await retriever.retrieve("test", top_k=2, use_vector=False)
         assert len(results) <= 2
+
+    @pytest.mark.asyncio
+    async def test_retrieve_falls_back_to_bm25(self):
+        """Test a failing vector search leaves the BM25 results."""
+        retriever = HybridRetriever(FakeEmbeddingProvider())
+        chunks = [
+            {"id": str(i), "content": name, "doc_id": f"doc{i}", "doc_name": name}
+            for i, name in enumerate(["java", "rust", "python"])
+        ]
+        await retriever.build_index(chunks)
+
+        # The fake provider has no vector for this query
+        results = await retriever.retrieve("python code", top_k=1)
+        assert [r.chunk_id for r in results] == ["2"]
+
+    @pytest.mark.asyncio
+    async def test_retrieve_query_without_tokens_uses_vector_results(self):
+        """Test a query BM25 cannot tokenize is answered by vector search."""
+
+        class PunctuationProvider(FakeEmbeddingProvider):
+            VECTORS = {**FakeEmbeddingProvider.VECTORS, "?!": [0.0, 0.0, 1.0]}
+
+        retriever = HybridRetriever(PunctuationProvider())
+        chunks = [
+            {"id": str(i), "content": name, "doc_id": f"doc{i}", "doc_name": name}
+            for i, name in enumerate(["java", "rust", "python"])
+        ]
+        await retriever.build_index(chunks)
+
+        results = await retriever.retrieve("?!", top_k=1)
+        assert [r.chunk_id for r in results] == ["1"]
+
+    @pytest.mark.asyncio
+    async def test_build_index_keyword_only(self):
+        """Test build_vectors=False skips embedding the chunks."""
+
+        class CountingProvider(FakeEmbeddingProvider):
+            calls = 0
+
+            async def embed_texts(self, texts):
+                CountingProvider.calls += 1
+                return await super().embed_texts(texts)
+
+        retriever = HybridRetriever(CountingProvider())
+        chunks = [
+            {"id": str(i), "content": name, "doc_id": f"doc{i}", "doc_name": name}
+            for i, name in enumerate(["java", "rust", "python"])
+        ]
+        await retriever.build_index(chunks, build_vectors=False)
+
+        assert CountingProvider.calls == 0
+        assert retriever.vector_retriever.chunks == []
+        results = await retriever.retrieve("python", top_k=1, use_vector=False)
+        assert [r.chunk_id for r in results] == ["2"]
+
+    @pytest.mark.asyncio
+    async def test_retrieve_batch_per_query(self):
+        """Test batched retrieval returns one result list per query."""
+        retriever = HybridRetriever(FakeEmbeddingProvider())
+        chunks = [
+            {"id": str(i), "content": name, "doc_id": f"doc{i}", "doc_name": name}
+            for i, name in enumerate(["java", "rust", "python"])
+        ]
+        await retriever.build_index(chunks)
+
+        batches = await retriever.retrieve_batch(["python", "java"], top_k=1)
+
+        assert [[r.chunk_id for r in results] for results in batches] == [
+            ["2"], ["0"]
+        ]
@@ -0,0 +1,369 @@
+"""Tests for SearchService."""
+import asyncio
+import pytest
+from sqlalchemy import event
+from models.orm import KnowledgeBase, Document, Chunk
+from services import search_service
+from services.search_service import SearchService
+from database import Base, engine, SessionLocal
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session."""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+    search_service._INDEX_CACHE.clear()
+    search_service._SEMANTIC_CACHE.clear()
+    search_service._QUERY_EMBEDDING_CACHE.clear()
+
+
+class TestSearchService:
+    """Tests for SearchService."""
+
+    def test_load_chunk_dicts_single_query(self, db_session):
+        """Test chunks and their document names load in one query."""
+        db_session.add(KnowledgeBase(id="kb_1", name="KB"))
+        for i in range(3):
+            db_session.add(Document(
+                id=f"doc_{i}",
+                kb_id="kb_1",
+                name=f"Doc {i}",
+                file_path=f"/path/to/file_{i}.txt",
+                file_size=10,
+                file_type="txt"
+            ))
+            db_session.add(Chunk(
+                id=f"chunk_{i}",
+                doc_id=f"doc_{i}",
+                kb_id="kb_1",
+                content=f"content {i}",
+                chunk_index=0
+            ))
+        db_session.commit()
+        db_session.expunge_all()
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            chunk_dicts = SearchService(db_session)._load_chunk_dicts("kb_1")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 1
+        assert sorted(chunk_dicts, key=lambda c: c["id"]) == [
+            {
+                "id": f"chunk_{i}",
+                "content": f"content {i}",
+                "doc_id": f"doc_{i}",
+                "doc_name": f"Doc {i}",
+            }
+            for i in range(3)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_reuses_index_until_chunks_change(self, db_session):
+        """Test the built index is cached per knowledge base."""
+        db_session.add(KnowledgeBase(id="kb_1", name="KB"))
+        db_session.add(Document(
+            id="doc_1",
+            kb_id="kb_1",
+            name="Doc",
+            file_path="/path/to/file.txt",
+            file_size=10,
+            file_type="txt"
+        ))
+        db_session.add(Chunk(
+            id="chunk_0", doc_id="doc_1", kb_id="kb_1",
+            content="python retrieval", chunk_index=0
+        ))
+        db_session.commit()
+
+        service = SearchService(db_session)
+        first = await service._get_retriever("kb_1")
+        reused = await SearchService(db_session)._get_retriever("kb_1")
+        assert reused.bm25_retriever is first.bm25_retriever
+
+        db_session.add(Chunk(
+            id="chunk_1", doc_id="doc_1", kb_id="kb_1",
+            content="python ranking", chunk_index=1
+        ))
+        db_session.commit()
+        rebuilt = await service._get_retriever("kb_1")
+        assert rebuilt.bm25_retriever is not first.bm25_retriever
+
+        search_service.invalidate_index("kb_1")
+        again = await service._get_retriever("kb_1")
+        assert again.bm25_retriever is not rebuilt.bm25_retriever
+
+    @pytest.mark.asyncio
+    async def test_index_cache_is_keyed_by_provider_and_bounded(self, db_session, monkeypatch):
+        """Test cached indexes are per provider, not mutated, and evicted LRU first."""
+
+        class FakeEmbeddingProvider:
+            def __init__(self, model):
+                self.model = model
+
+            async def embed_texts(self, texts):
+                return [[1.0, float(len(text))] for text in texts]
+
+        for kb in range(2):
+            db_session.add(KnowledgeBase(id=f"kb_{kb}", name=f"KB {kb}"))
+            db_session.add(Document(
+                id=f"doc_{kb}", kb_id=f"kb_{kb}", name="Doc",
+                file_path="/path/to/file.txt", file_size=10, file_type="txt"
+            ))
+            db_session.add(Chunk(
+                id=f"chunk_{kb}", doc_id=f"doc_{kb}", kb_id=f"kb_{kb}",
+                content="python retrieval", chunk_index=0
+            ))
+        db_session.commit()
+        monkeypatch.setattr(search_service.settings, "index_cache_size", 2)
+
+        provider_a = FakeEmbeddingProvider("model-a")
+        provider_b = FakeEmbeddingProvider("model-b")
+        first = await SearchService(db_session, provider_a)._get_retriever("kb_0")
+        other_model = await SearchService(db_session, provider_b)._get_retriever("kb_0")
+        assert other_model.bm25_retriever is not first.bm25_retriever
+
+        # A new provider of the same model reuses the index without changing
+        # the retriever other requests hold
+        request_provider = FakeEmbeddingProvider("model-a")
+        reused = await SearchService(db_session, request_provider)._get_retriever("kb_0")
+        assert reused.vector_retriever._emb_matrix is first.vector_retriever._emb_matrix
+        assert reused.embedding_provider is request_provider
+        assert first.embedding_provider is provider_a
+        assert first.vector_retriever.embedding_provider is provider_a
+
+        # kb_0 with model-b is the least recently used entry
+        await SearchService(db_session, provider_a)._get_retriever("kb_1")
+        assert list(search_service._INDEX_CACHE) == [
+            ("kb_0", "FakeEmbeddingProvider", "model-a"),
+            ("kb_1", "FakeEmbeddingProvider", "model-a"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_searches_build_index_once(self, db_session):
+        """Test concurrent searches of one knowledge base share a single index build."""
+
+        class CountingEmbeddingProvider:
+            model = "counting"
+            calls = 0
+
+            async def embed_texts(self, texts):
+                CountingEmbeddingProvider.calls += 1
+                await asyncio.sleep(0.01)
+                return [[1.0, float(len(text))] for text in texts]
+
+        db_session.add(KnowledgeBase(id="kb_1", name="KB"))
+        db_session.add(Document(
+            id="doc_1", kb_id="kb_1", name="Doc",
+            file_path="/path/to/file.txt", file_size=10, file_type="txt"
+        ))
+        db_session.add(Chunk(
+            id="chunk_0", doc_id="doc_1", kb_id="kb_1",
+            content="python retrieval", chunk_index=0
+        ))
+        db_session.commit()
+
+        retrievers = await asyncio.gather(*(
+            SearchService(db_session, CountingEmbeddingProvider())._get_retriever("kb_1")
+            for _ in range(5)
+        ))
+
+        assert CountingEmbeddingProvider.calls == 1
+        assert len({id(r.vector_retriever._emb_matrix) for r in retrievers}) == 1
+        assert search_service._INDEX_LOCKS == {}
+
+    @pytest.mark.asyncio
+    async def test_search_returns_cached_response_for_similar_query(self, db_session, monkeypatch):
+        """Test a near-duplicate query is served from the semantic cache without fetching the index."""
+        monkeypatch.setattr(search_service.settings, "semantic_cache_size", 1024)
+        monkeypatch.setattr(search_service._SEMANTIC_CACHE, "max_size", 1024)
+
+        class FakeEmbeddingProvider:
+            model = "fake"
+            calls = 0
+
+            async def embed_text(self, text):
+                FakeEmbeddingProvider.calls += 1
+                return [1.0, 0.0] if "python" in text.lower() else [0.0, 1.0]
+
+            async def embed_texts(self, texts):
+                return [await self.embed_text(t) for t in texts]
+
+        db_session.add(KnowledgeBase(id="kb_1", name="KB"))
+        db_session.add(Document(
+            id="doc_1",
+            kb_id="kb_1",
+            name="Doc",
+            file_path="/path/to/file.txt",
+            file_size=10,
+            file_type="txt"
+        ))
+        db_session.add(Chunk(
+            id="chunk_0", doc_id="doc_1", kb_id="kb_1",
+            content="python retrieval", chunk_index=0
+        ))
+        db_session.commit()
+
+        service = SearchService(db_session, FakeEmbeddingProvider())
+        first = await service.search("kb_1", "python retrieval", top_k=1)
+        calls = FakeEmbeddingProvider.calls
+
+        async def no_retriever(kb_id):
+            raise AssertionError("index fetched on a semantic cache hit")
+
+        monkeypatch.setattr(service, "_get_retriever", no_retriever)
+        second = await service.search("kb_1", "Python retrieval?", top_k=1)
+
+        assert FakeEmbeddingProvider.calls == calls + 1
+        assert second.query == "Python retrieval?"
+        assert [r.chunk_id for r in second.results] == [
+            r.chunk_id for r in first.results
+        ]
+
+        search_service.invalidate_index("kb_1")
+        assert len(search_service._SEMANTIC_CACHE) == 0
+
+    @pytest.mark.asyncio
+    async def test_semantic_cache_is_off_by_default(self, db_session):
+        """Test search responses are not cached unless SEMANTIC_CACHE_SIZE is set."""
+
+        class FakeEmbeddingProvider:
+            model = "fake"
+
+            async def embed_text(self, text):
+                return [1.0, 0.0]
+
+            async def embed_texts(self, texts):
+                return [[1.0, 0.0] for _ in texts]
+
+        db_session.add(KnowledgeBase(id="kb_1", name="KB"))
+        db_session.add(Document(
+            id="doc_1", kb_id="kb_1", name="Doc",
+            file_path="/path/to/file.txt", file_size=10, file_type="txt"
+        ))
+        db_session.add(Chunk(
+            id="chunk_0", doc_id="doc_1", kb_id="kb_1",
+            content="python retrieval", chunk_index=0
+        ))
+        db_session.commit()
+
+        await SearchService(db_session, FakeEmbeddingProvider()).search(
+            "kb_1", "python retrieval", top_k=1
+        )
+
+        assert search_service.settings.semantic_cache_size == 0
+        assert len(search_service._SEMANTIC_CACHE) == 0
+
+    @pytest.mark.asyncio
+    async def test_embed_queries_reuses_stripped_queries(self, db_session):
+        """Test repeated query strings are embedded once per provider model, keeping case."""
+
+        class FakeEmbeddingProvider:
+            model = "fake"
+
+            def __init__(self):
+                self.batches = []
+
+            async def embed_text(self, text):
+                self.batches.append([text])
+                return [float(len(text)), 1.0]
+
+            async def embed_texts(self, texts):
+                self.batches.append(list(texts))
+                return [[float(len(t)), 1.0] for t in texts]
+
+        provider = FakeEmbeddingProvider()
+        service = SearchService(db_session, provider)
+
+        first = await service._embed_queries(["Python", "rust"])
+        other_provider = FakeEmbeddingProvider()
+        second = await SearchService(
+            db_session, other_provider
+        )._embed_queries(["  Python ", "java", "RUST"])
+
+        assert provider.batches == [["Python", "rust"]]
+        assert other_provider.batches == [["java", "RUST"]]
+        assert second == [first[0], [4.0, 1.0], [4.0, 1.0]]
+
+    @pytest.mark.asyncio
+    async def test_search_with_rewrite_returns_ranked_results(self, db_session):
+        """Test rewrite search runs end to end with BM25 only."""
+        db_session.add(KnowledgeBase(id="kb_1", name="KB"))
+        db_session.add(Document(
+            id="doc_1",
+            kb_id="kb_1",
+            name="Doc",
+            file_path="/path/to/file.txt",
+            file_size=10,
+            file_type="txt"
+        ))
+        for i, content in enumerate(["python code", "java code", "rust code"]):
+            db_session.add(Chunk(
+                id=f"chunk_{i}", doc_id="doc_1", kb_id="kb_1",
+                content=content, chunk_index=i
+            ))
+        db_session.commit()
+
+        response = await SearchService(db_session).search_with_rewrite(
+            "kb_1", "rust", top_k=1
+        )
+
+        assert response.rewritten_query == "rust"
+        assert [r.chunk_id for r in response.results] == ["chunk_2"]
+        assert response.results[0].doc_name == "Doc"
+
+    @pytest.mark.asyncio
+    async def test_search_with_rewrite_keeps_best_duplicate(self, db_session, monkeypatch):
+        """Test duplicates across rewrites keep their highest score."""
+        from rag.query_rewriter import QueryRewriteResult
+        from rag.retriever import HybridRetriever, RetrievalResult
+
+        def result(chunk_id, score):
+            return RetrievalResult(
+                chunk_id=chunk_id, doc_id="doc_1", content=chunk_id,
+                score=score, doc_name="Doc"
+            )
+
+        async def retrieve_batch(self, queries, **kwargs):
+            return [
+                [result("a", 0.4), result("b", 0.3)],
+                [result("b", 0.9), result("c", 0.1)],
+            ]
+
+        async def rewrite(query):
+            return QueryRewriteResult(
+                original_query=query,
+                rewritten_queries=[query, "expanded"],
+                hypothetical_docs=[],
+            )
+
+        db_session.add(KnowledgeBase(id="kb_1", name="KB"))
+        db_session.add(Document(
+            id="doc_1",
+            kb_id="kb_1",
+            name="Doc",
+            file_path="/path/to/file.txt",
+            file_size=10,
+            file_type="txt"
+        ))
+        db_session.add(Chunk(
+            id="chunk_0", doc_id="doc_1", kb_id="kb_1",
+            content="python code", chunk_index=0
+        ))
+        db_session.commit()
+        monkeypatch.setattr(HybridRetriever, "retrieve_batch", retrieve_batch)
+
+        service = SearchService(db_session)
+        monkeypatch.setattr(service.query_rewriter, "rewrite_with_fallback", rewrite)
+        response = await service.search_with_rewrite("kb_1", "query", top_k=3)
+
+        assert [(r.chunk_id, r.score) for r in response.results] == [
+            ("b", 0.9), ("a", 0.4), ("c", 0.1)
+        ]
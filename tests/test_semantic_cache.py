@@ -0,0 +1,59 @@
+"""Tests for the semantic search cache."""
+import pytest
+
+from rag.semantic_cache import SemanticCache
+
+
+class TestSemanticCache:
+    """Test semantic cache."""
+
+    def test_near_duplicate_hits(self):
+        """Test a query within the threshold returns the stored value."""
+        cache = SemanticCache(threshold=0.95)
+        cache.put("kb_1", [1.0, 0.0], "response")
+
+        assert cache.get("kb_1", [2.0, 0.1]) == "response"
+        assert cache.get("kb_1", [1.0, 1.0]) is None
+
+    def test_partitions_are_separate(self):
+        """Test lookups only match entries of their own partition."""
+        cache = SemanticCache()
+        cache.put("kb_1", [1.0, 0.0], "response")
+
+        assert cache.get("kb_2", [1.0, 0.0]) is None
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted at max_size."""
+        cache = SemanticCache(max_size=2)
+        cache.put("kb_1", [1.0, 0.0], "a")
+        cache.put("kb_1", [0.0, 1.0], "b")
+        assert cache.get("kb_1", [1.0, 0.0]) == "a"
+
+        cache.put("kb_2", [1.0, 0.0], "c")
+
+        assert len(cache) == 2
+        assert cache.get("kb_1", [1.0, 0.0]) == "a"
+        assert cache.get("kb_1", [0.0, 1.0]) is None
+
+    def test_entries_expire(self, monkeypatch):
+        """Test entries are dropped after their TTL."""
+        now = [100.0]
+        monkeypatch.setattr("rag.semantic_cache.time.monotonic", lambda: now[0])
+        cache = SemanticCache(ttl=10)
+        cache.put("kb_1", [1.0, 0.0], "response")
+
+        now[0] = 111.0
+
+        assert cache.get("kb_1", [1.0, 0.0]) is None
+        assert len(cache) == 0
+
+    def test_invalidate_by_partition(self):
+        """Test invalidate drops only the matching partitions."""
+        cache = SemanticCache()
+        cache.put(("kb_1", 5), [1.0, 0.0], "a")
+        cache.put(("kb_1", 10), [1.0, 0.0], "b")
+        cache.put(("kb_2", 5), [1.0, 0.0], "c")
+
+        assert cache.invalidate(lambda partition: partition[0] == "kb_1") == 2
+        assert cache.get(("kb_2", 5), [1.0, 0.0]) == "c"
+        assert cache.get(("kb_1", 5), [1.0, 0.0]) is None